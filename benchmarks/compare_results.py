@@ -0,0 +1,63 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#   Stop motion OBJ: A Mesh sequence importer for Blender
+#   Copyright (C) 2016-2024  Justin Jensen
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Compare two result files from run_benchmarks.py. Exits with 1 if anything got slower than the threshold allows
+#
+#   python compare_results.py baseline.json candidate.json --threshold 0.10
+
+import argparse
+import json
+import sys
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Compare two Stop Motion OBJ benchmark results")
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--metric', default='median', choices=['median', 'mean', 'p95', 'total'])
+    parser.add_argument('--threshold', type=float, default=0.10, help="Allowed slowdown as a fraction (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    if baseline['parameters'] != candidate['parameters']:
+        print("Warning: the two runs used different parameters")
+
+    regressions = []
+    print("%-22s %12s %12s %8s" % ("benchmark", "baseline", "candidate", "change"))
+    for name in sorted(set(baseline['results']) & set(candidate['results'])):
+        before = baseline['results'][name][args.metric]
+        after = candidate['results'][name][args.metric]
+        change = (after - before) / before if before > 0 else 0.0
+        print("%-22s %11.2fms %11.2fms %+7.1f%%" % (name, before * 1000, after * 1000, change * 100))
+        if change > args.threshold:
+            regressions.append(name)
+
+    if len(regressions) > 0:
+        print("Slower than allowed: " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,121 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#   Stop motion OBJ: A Mesh sequence importer for Blender
+#   Copyright (C) 2016-2024  Justin Jensen
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Writes synthetic mesh sequences for benchmarking. Plain Python; doesn't need Blender.
+#
+#   python generate_sequence.py /tmp/bench_seq --vertices 10000 --frames 100 --format obj --topology stable
+#
+# Each frame is a grid with a travelling wave across it. With --topology varying, the number of grid rows
+# changes from frame to frame, so the vertex and face counts change too. The output only depends on the arguments
+
+import argparse
+import math
+import os
+import struct
+import sys
+
+FILE_PREFIX = 'bench_'
+
+
+def gridFrame(numVertices, frameIdx, numFrames, topology):
+    cols = max(2, int(math.sqrt(numVertices)))
+    rows = max(2, numVertices // cols)
+    if topology == 'varying':
+        rows += frameIdx % 3
+
+    phase = 2.0 * math.pi * frameIdx / max(numFrames, 1)
+    positions = []
+    for r in range(rows):
+        y = r / (rows - 1)
+        for c in range(cols):
+            x = c / (cols - 1)
+            positions.append((x, y, 0.1 * math.sin(2.0 * math.pi * x + phase) * math.cos(math.pi * y)))
+
+    faces = []
+    for r in range(rows - 1):
+        for c in range(cols - 1):
+            v = r * cols + c
+            faces.append((v, v + 1, v + cols + 1, v + cols))
+
+    return positions, faces
+
+
+def writeOBJ(filePath, positions, faces):
+    with open(filePath, 'w') as f:
+        f.write("o bench\n")
+        f.writelines("v %.6f %.6f %.6f\n" % p for p in positions)
+        f.writelines("f %d %d %d %d\n" % (a + 1, b + 1, c + 1, d + 1) for a, b, c, d in faces)
+
+
+def writeSTL(filePath, positions, faces):
+    # binary STL only stores triangles, so split every quad in two
+    triangles = []
+    for a, b, c, d in faces:
+        triangles.append((a, b, c))
+        triangles.append((a, c, d))
+
+    with open(filePath, 'wb') as f:
+        f.write(b'bench'.ljust(80, b'\0'))
+        f.write(struct.pack('<I', len(triangles)))
+        for a, b, c in triangles:
+            f.write(struct.pack('<12fH', 0.0, 0.0, 1.0, *positions[a], *positions[b], *positions[c], 0))
+
+
+def writePLY(filePath, positions, faces):
+    header = ("ply\nformat binary_little_endian 1.0\n"
+              "element vertex %d\nproperty float x\nproperty float y\nproperty float z\n"
+              "element face %d\nproperty list uchar int vertex_indices\nend_header\n") % (len(positions), len(faces))
+    with open(filePath, 'wb') as f:
+        f.write(header.encode('ascii'))
+        f.write(b''.join(struct.pack('<3f', *p) for p in positions))
+        f.write(b''.join(struct.pack('<B4i', 4, *face) for face in faces))
+
+
+writers = {'obj': writeOBJ, 'stl': writeSTL, 'ply': writePLY}
+
+
+def generateSequence(outputDir, numVertices, numFrames, fileFormat='obj', topology='stable'):
+    os.makedirs(outputDir, exist_ok=True)
+    filePaths = []
+    digits = len(str(numFrames))
+    for frameIdx in range(numFrames):
+        positions, faces = gridFrame(numVertices, frameIdx, numFrames, topology)
+        filePath = os.path.join(outputDir, "%s%0*d.%s" % (FILE_PREFIX, digits, frameIdx + 1, fileFormat))
+        writers[fileFormat](filePath, positions, faces)
+        filePaths.append(filePath)
+    return filePaths
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Generate a synthetic mesh sequence for benchmarking")
+    parser.add_argument('outputDir')
+    parser.add_argument('--vertices', type=int, default=10000, help="Approximate number of vertices per frame")
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--format', default='obj', choices=sorted(writers.keys()))
+    parser.add_argument('--topology', default='stable', choices=['stable', 'varying'])
+    args = parser.parse_args(argv)
+
+    filePaths = generateSequence(args.outputDir, args.vertices, args.frames, args.format, args.topology)
+    print("Wrote %d frames to %s" % (len(filePaths), args.outputDir))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,168 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#   Stop motion OBJ: A Mesh sequence importer for Blender
+#   Copyright (C) 2016-2024  Justin Jensen
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Benchmarks for the add-on's hot paths. Runs inside Blender:
+#
+#   blender --background --factory-startup --python benchmarks/run_benchmarks.py -- --vertices 10000 --frames 100 --output results.json
+#
+# The add-on is loaded from this checkout's src folder, a synthetic sequence is generated into a temporary folder,
+# and the timings are written as JSON. Use compare_results.py to compare the JSON from two commits
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import bpy
+
+benchmarksDir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, benchmarksDir)
+sys.path.insert(0, os.path.join(benchmarksDir, '..', 'src'))
+
+import batch_convert
+import generate_sequence
+
+
+def summarize(durations):
+    ordered = sorted(durations)
+    return {
+        'calls': len(ordered),
+        'total': sum(ordered),
+        'mean': statistics.mean(ordered) if ordered else 0.0,
+        'median': statistics.median(ordered) if ordered else 0.0,
+        'p95': ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] if ordered else 0.0,
+        'min': ordered[0] if ordered else 0.0,
+        'max': ordered[-1] if ordered else 0.0
+    }
+
+
+def timeEach(func, items):
+    durations = []
+    for item in items:
+        startTime = time.perf_counter()
+        func(item)
+        durations.append(time.perf_counter() - startTime)
+    return durations
+
+
+def newSequence(smo, directory, fileFormat, cacheMode, useFrameCache=False):
+    seqObj = smo.newMeshSequence()
+    mss = seqObj.mesh_sequence_settings
+    mss.dirPath = directory
+    mss.fileName = generate_sequence.FILE_PREFIX
+    mss.cacheMode = cacheMode
+    mss.fileFormat = fileFormat
+    mss.useFrameCache = useFrameCache
+    mss.isImported = True
+    return seqObj
+
+
+def benchmarkCached(smo, directory, fileFormat, results, useFrameCache=False):
+    seqObj = newSequence(smo, directory, fileFormat, 'cached', useFrameCache)
+    mss = seqObj.mesh_sequence_settings
+
+    # time each frame of the cached import by timestamping the progress callback
+    frameTimes = [time.perf_counter()]
+    smo.loadSequenceFromMeshFiles(seqObj, directory, generate_sequence.FILE_PREFIX, lambda *args: frameTimes.append(time.perf_counter()))
+    results['cachedImport'] = summarize([b - a for a, b in zip(frameTimes, frameTimes[1:])])
+
+    scn = bpy.context.scene
+    frames = list(range(scn.frame_start, scn.frame_end + 1))
+    results['setFrameNumber'] = summarize(timeEach(smo.setFrameNumber, frames))
+
+    meshes = [smo.getMeshFromIndex(seqObj, idx) for idx in range(1, mss.numMeshes)]
+    results['getMeshSignature'] = summarize(timeEach(smo.getMeshSignature, meshes))
+
+    # baking deletes the sequence object, so it has to go last
+    results['bakeSequence'] = summarize(timeEach(smo.bakeSequence, [seqObj]))
+
+
+def benchmarkStreaming(smo, directory, fileFormat, results, useFrameCache=False):
+    seqObj = newSequence(smo, directory, fileFormat, 'streaming', useFrameCache)
+    mss = seqObj.mesh_sequence_settings
+    smo.loadStreamingSequenceFromMeshFiles(seqObj, directory, generate_sequence.FILE_PREFIX)
+
+    idxsToLoad = [idx for idx in range(1, mss.numMeshes) if mss.meshNameArray[idx].inMemory is False]
+    results['importStreamedFile'] = summarize(timeEach(lambda idx: smo.importStreamedFile(seqObj, idx), idxsToLoad))
+
+    idxsToEvict = [idx for idx in range(1, mss.numMeshes) if mss.meshNameArray[idx].inMemory is True and mss.meshNameArray[idx].key != seqObj.data.name]
+    results['removeMeshFromCache'] = summarize(timeEach(lambda idx: smo.removeMeshFromCache(seqObj, idx), idxsToEvict))
+
+
+def gitCommit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=benchmarksDir, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark Stop Motion OBJ inside Blender")
+    parser.add_argument('--vertices', type=int, default=10000)
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--format', default='obj', choices=['obj', 'stl', 'ply'])
+    parser.add_argument('--topology', default='stable', choices=['stable', 'varying'])
+    parser.add_argument('--frame-cache', action='store_true', help="Convert the sequence to frame caches and load from them (Use Frame Cache) while benchmarking")
+    parser.add_argument('--output', default=None, help="Write the JSON results here instead of to stdout")
+    args = parser.parse_args(argv)
+
+    # start from an empty scene so that results don't depend on the startup file
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    smo = batch_convert.loadAddon()
+
+    scn = bpy.context.scene
+    scn.frame_start = 1
+    scn.frame_end = args.frames
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='smo_bench_') as directory:
+        generate_sequence.generateSequence(directory, args.vertices, args.frames, args.format, args.topology)
+        if args.frame_cache:
+            batch_convert.convertSequence(directory, generate_sequence.FILE_PREFIX, args.format)
+
+        benchmarkCached(smo, directory, args.format, results, args.frame_cache)
+        benchmarkStreaming(smo, directory, args.format, results, args.frame_cache)
+
+    report = {
+        'commit': gitCommit(),
+        'blenderVersion': bpy.app.version_string,
+        'platform': platform.platform(),
+        'parameters': vars(args),
+        'results': results
+    }
+    reportStr = json.dumps(report, indent=2, sort_keys=True)
+    if args.output is None:
+        print(reportStr)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(reportStr + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    scriptArgs = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    exitCode = main(scriptArgs)
+    if exitCode != 0:
+        sys.exit(exitCode)
@@ -42,24 +42,51 @@ def register():
 
     bpy.types.Mesh.inMeshSequence = bpy.props.BoolProperty()
     bpy.types.Mesh.meshHash = bpy.props.StringProperty()
+    bpy.types.Mesh.proxyMesh = bpy.props.PointerProperty(type=bpy.types.Mesh)
+    bpy.types.Mesh.proxyResolution = bpy.props.IntProperty()
+    bpy.types.Material.materialHash = bpy.props.StringProperty()
+    bpy.types.WindowManager.smoTimingEnabled = bpy.props.BoolProperty(
+        name="Record Timings",
+        description="Record how long Stop Motion OBJ spends in each step of loading and switching meshes",
+        default=False,
+        update=handleTimingEnabledChange)
+    bpy.types.WindowManager.smoAccessTraceEnabled = bpy.props.BoolProperty(
+        name="Record Access Trace",
+        description="Record which mesh every frame change of a Streaming sequence shows, whether it was already loaded, and how long loading took",
+        default=False,
+        update=handleAccessTraceEnabledChange)
     bpy.utils.register_class(SequenceVersion)
     bpy.utils.register_class(MeshImporter)
     bpy.utils.register_class(MeshNameProp)
     bpy.utils.register_class(MeshSequenceSettings)
     bpy.types.Object.mesh_sequence_settings = bpy.props.PointerProperty(type=MeshSequenceSettings)
     bpy.app.handlers.load_post.append(initializeSequences)
+    bpy.app.handlers.load_post.append(syncRecordingSettings)
+    bpy.app.handlers.load_post.append(resubscribeToModeChanges)
+    subscribeToModeChanges()
     bpy.app.handlers.frame_change_pre.append(updateFrame)
     
     # note: Blender tends to crash in Rendered viewport mode if we set the depsgraph_update_post instead of depsgraph_update_pre
     bpy.app.handlers.depsgraph_update_pre.append(updateFrame)
+    bpy.app.handlers.depsgraph_update_post.append(handleActionUpdates)
     bpy.utils.register_class(ReloadMeshSequence)
     bpy.utils.register_class(BatchShadeSmooth)
     bpy.utils.register_class(BatchShadeFlat)
     bpy.utils.register_class(BakeMeshSequence)
+    bpy.utils.register_class(BakePointCache)
     bpy.utils.register_class(DeepDeleteSequence)
     bpy.utils.register_class(MergeDuplicateMaterials)
     bpy.utils.register_class(ConvertToMeshSequence)
     bpy.utils.register_class(DuplicateMeshFrame)
+    bpy.utils.register_class(GenerateProxies)
+    bpy.utils.register_class(AddSequenceInstance)
+    bpy.utils.register_class(ImportSequenceFrames)
+    bpy.utils.register_class(ResumeImport)
+    bpy.utils.register_class(DumpTimingTrace)
+    bpy.utils.register_class(ClearTimingTrace)
+    bpy.utils.register_class(DumpAccessTrace)
+    bpy.utils.register_class(RefreshSharedCacheUsage)
+    bpy.utils.register_class(ClearAccessTrace)
     bpy.utils.register_class(SMO_PT_MeshSequencePanel)
     # note: the order of the next few panels is the order they appear in the UI
     bpy.utils.register_class(SMO_PT_MeshSequencePlaybackPanel)
@@ -69,6 +96,10 @@ def register():
     bpy.app.handlers.render_init.append(renderInitHandler)
     bpy.app.handlers.render_complete.append(renderCompleteHandler)
     bpy.app.handlers.render_cancel.append(renderCancelHandler)
+    bpy.app.handlers.undo_post.append(clearMeshReferenceIndexes)
+    bpy.app.handlers.redo_post.append(clearMeshReferenceIndexes)
+    bpy.app.handlers.undo_pre.append(countUndoSteps)
+    bpy.app.handlers.redo_pre.append(countUndoSteps)
 
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import_sequence)
     bpy.types.VIEW3D_MT_object.append(menu_func_convert_to_sequence)
@@ -96,19 +127,37 @@ def unregister():
     bpy.app.handlers.frame_change_post.remove(checkMeshChangesFrameChangePost)
 
     bpy.app.handlers.load_post.remove(initializeSequences)
+    bpy.app.handlers.load_post.remove(syncRecordingSettings)
+    bpy.app.handlers.load_post.remove(resubscribeToModeChanges)
+    bpy.msgbus.clear_by_owner(modeChangeOwner)
     bpy.app.handlers.frame_change_pre.remove(updateFrame)
     bpy.app.handlers.depsgraph_update_pre.remove(updateFrame)
+    bpy.app.handlers.depsgraph_update_post.remove(handleActionUpdates)
     bpy.app.handlers.render_init.remove(renderInitHandler)
     bpy.app.handlers.render_complete.remove(renderCompleteHandler)
     bpy.app.handlers.render_cancel.remove(renderCancelHandler)
+    bpy.app.handlers.undo_post.remove(clearMeshReferenceIndexes)
+    bpy.app.handlers.redo_post.remove(clearMeshReferenceIndexes)
+    bpy.app.handlers.undo_pre.remove(countUndoSteps)
+    bpy.app.handlers.redo_pre.remove(countUndoSteps)
     bpy.utils.unregister_class(ReloadMeshSequence)
     bpy.utils.unregister_class(BatchShadeSmooth)
     bpy.utils.unregister_class(BatchShadeFlat)
     bpy.utils.unregister_class(BakeMeshSequence)
+    bpy.utils.unregister_class(BakePointCache)
     bpy.utils.unregister_class(DeepDeleteSequence)
     bpy.utils.unregister_class(MergeDuplicateMaterials)
     bpy.utils.unregister_class(ConvertToMeshSequence)
     bpy.utils.unregister_class(DuplicateMeshFrame)
+    bpy.utils.unregister_class(ResumeImport)
+    bpy.utils.unregister_class(ImportSequenceFrames)
+    bpy.utils.unregister_class(AddSequenceInstance)
+    bpy.utils.unregister_class(GenerateProxies)
+    bpy.utils.unregister_class(DumpTimingTrace)
+    bpy.utils.unregister_class(ClearTimingTrace)
+    bpy.utils.unregister_class(DumpAccessTrace)
+    bpy.utils.unregister_class(RefreshSharedCacheUsage)
+    bpy.utils.unregister_class(ClearAccessTrace)
     bpy.utils.unregister_class(SMO_PT_MeshSequencePanel)
     bpy.utils.unregister_class(SMO_PT_MeshSequencePlaybackPanel)
     bpy.utils.unregister_class(SMO_PT_MeshSequenceStreamingPanel)
@@ -0,0 +1,181 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#   Stop motion OBJ: A Mesh sequence importer for Blender
+#   Copyright (C) 2016-2024  Justin Jensen
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Headless batch converter for mesh sequences. None of this needs Blender's UI.
+#
+# Convert every frame of a sequence into a frame cache (plain Python, one worker process per core):
+#   python batch_convert.py /path/to/frames --prefix frame_ --format obj --jobs 8
+#
+# Pre-bake a .blend file containing a Cached sequence (runs inside Blender):
+#   blender --background --python batch_convert.py -- /path/to/frames --prefix frame_ --format obj --blend shot.blend
+#
+# Sequences with Use Frame Caches enabled load up-to-date frame caches instead of running the importer. Frame caches only hold
+#   positions and faces, so pre-baking from them (--use-frame-cache) is faster but drops UVs, normals, and per-face materials
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+if __package__:
+    from . import mesh_ops
+    from . import mesh_readers
+    from .sequence_files import listSequenceFiles
+else:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import mesh_ops
+    import mesh_readers
+    from sequence_files import listSequenceFiles
+
+
+def convertFile(sourcePath, fileFormat, force=False, mergeDistance=0.0):
+    startTime = time.perf_counter()
+    cachePath = mesh_readers.frameCachePath(sourcePath)
+    if force is False and mesh_readers.isFrameCacheFresh(sourcePath, cachePath):
+        # -1 vertices means the frame cache was already up to date
+        return -1, 0.0
+
+    meshData = mesh_readers.readMeshFile(sourcePath, fileFormat)
+    if mergeDistance > 0.0:
+        meshData = mesh_ops.weldVertices(meshData, mergeDistance)
+    mesh_readers.writeFrameCache(cachePath, meshData)
+    return meshData.numVertices, time.perf_counter() - startTime
+
+
+def printProgress(numDone, numTotal, sourcePath, message):
+    width = len(str(numTotal))
+    print("[%*d/%d] %s: %s" % (width, numDone, numTotal, os.path.basename(sourcePath), message), flush=True)
+
+
+def convertSequence(directory, filePrefix, fileFormat, jobs=None, force=False, mergeDistance=0.0):
+    sourcePaths = listSequenceFiles(directory, filePrefix, fileFormat)
+    if len(sourcePaths) == 0:
+        print("No matching files found in " + directory)
+        return 1
+
+    numFailed = 0
+    numDone = 0
+    startTime = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(convertFile, sourcePath, fileFormat, force, mergeDistance): sourcePath for sourcePath in sourcePaths}
+        for future in as_completed(futures):
+            sourcePath = futures[future]
+            numDone += 1
+            try:
+                numVertices, seconds = future.result()
+            except Exception as e:
+                numFailed += 1
+                printProgress(numDone, len(sourcePaths), sourcePath, "FAILED (" + str(e) + ")")
+                continue
+
+            if numVertices < 0:
+                printProgress(numDone, len(sourcePaths), sourcePath, "up to date")
+            else:
+                printProgress(numDone, len(sourcePaths), sourcePath, "%d vertices in %.2fs" % (numVertices, seconds))
+
+    print("Converted %d files (%d failed) in %.1fs" % (len(sourcePaths) - numFailed, numFailed, time.perf_counter() - startTime))
+    return 1 if numFailed > 0 else 0
+
+
+# make sure the add-on is registered in this Blender session and return its stop_motion_obj module
+def loadAddon():
+    import bpy
+    addonDir = os.path.dirname(os.path.abspath(__file__))
+    packageName = os.path.basename(addonDir)
+    sys.path.insert(0, os.path.dirname(addonDir))
+    package = importlib.import_module(packageName)
+
+    # if the add-on is already enabled in the user's preferences, it has already registered its properties
+    if hasattr(bpy.types.Object, 'mesh_sequence_settings') is False:
+        package.register()
+
+    return importlib.import_module(packageName + '.stop_motion_obj')
+
+
+def prebakeBlend(directory, filePrefix, fileFormat, blendPath, perFrameMaterial=False, useFrameCache=False):
+    import bpy
+    from bpy_extras.io_utils import axis_conversion
+    smo = loadAddon()
+
+    absDirectory = os.path.abspath(directory)
+    absBlendPath = os.path.abspath(blendPath)
+
+    seqObj = smo.newMeshSequence()
+    seqObj.matrix_world = axis_conversion(from_forward='-Z', from_up='Y').to_4x4()
+    mss = seqObj.mesh_sequence_settings
+    mss.dirPath = absDirectory
+    mss.fileName = filePrefix
+    mss.cacheMode = 'cached'
+    mss.fileFormat = fileFormat
+    mss.perFrameMaterial = perFrameMaterial
+    mss.useFrameCache = useFrameCache
+    mss.isImported = True
+
+    startTime = time.perf_counter()
+
+    def onFrameLoaded(numLoaded, numTotal, filePath):
+        printProgress(numLoaded, numTotal, filePath, "loaded")
+
+    meshCount = smo.loadSequenceFromMeshFiles(seqObj, absDirectory, filePrefix, onFrameLoaded)
+    if meshCount == 0:
+        print("No matching files found in " + absDirectory)
+        return 1
+
+    firstMeshName = os.path.splitext(mss.meshNameArray[1].basename)[0].rstrip('._0123456789')
+    seqObj.name = smo.createUniqueName(firstMeshName + '_sequence', bpy.data.objects)
+
+    # store the folder relative to the new .blend so the file still works when it's moved along with its meshes
+    mss.dirPath = bpy.path.relpath(absDirectory, start=os.path.dirname(absBlendPath))
+    mss.dirPathIsRelative = True
+    mss.dirPathNeedsRelativizing = False
+
+    bpy.ops.wm.save_as_mainfile(filepath=absBlendPath)
+    print("Saved %d meshes to %s in %.1fs" % (meshCount, absBlendPath, time.perf_counter() - startTime))
+    return 0
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Convert or pre-bake a Stop Motion OBJ mesh sequence without the UI")
+    parser.add_argument('directory', help="Folder containing the mesh files")
+    parser.add_argument('--prefix', default='', help="Only use files whose names start with this prefix")
+    parser.add_argument('--format', default='obj', choices=mesh_readers.SUPPORTED_FORMATS, help="File format of the sequence")
+    parser.add_argument('--jobs', type=int, default=None, help="Number of worker processes (default: one per core)")
+    parser.add_argument('--force', action='store_true', help="Rewrite frame caches even if they are up to date")
+    parser.add_argument('--merge', action='store_true', help="Merge vertices by distance before writing each frame cache (like the PLY importer's Merge Vertices)")
+    parser.add_argument('--blend', default=None, help="Instead of converting, pre-bake a Cached sequence into this .blend file (requires Blender)")
+    parser.add_argument('--per-frame-material', action='store_true', help="Keep each frame's materials when pre-baking")
+    parser.add_argument('--use-frame-cache', action='store_true', help="Pre-bake from the frame caches written by an earlier conversion (geometry only)")
+    args = parser.parse_args(argv)
+
+    if args.blend is not None:
+        return prebakeBlend(args.directory, args.prefix, args.format, args.blend, args.per_frame_material, args.use_frame_cache)
+
+    mergeDistance = mesh_ops.MERGE_DISTANCE if args.merge else 0.0
+    return convertSequence(args.directory, args.prefix, args.format, args.jobs, args.force, mergeDistance)
+
+
+if __name__ == '__main__':
+    # when running inside Blender, our arguments come after '--'
+    scriptArgs = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:]
+    exitCode = main(scriptArgs)
+    if exitCode != 0:
+        sys.exit(exitCode)
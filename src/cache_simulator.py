@@ -0,0 +1,176 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#   Stop motion OBJ: A Mesh sequence importer for Blender
+#   Copyright (C) 2016-2024  Justin Jensen
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Replay a streaming access trace (Advanced > Record Access Trace) against other cache sizes and eviction policies,
+#   to pick a Cache Size for a shot from real playback data. Nothing in here depends on bpy:
+#   python cache_simulator.py trace.csv --sizes 4 8 16 32 0 --policies smo lru fifo belady
+#
+# Policies:
+#   smo     what Stop Motion OBJ does: remove the loaded mesh with the highest index (see nextCachedMeshToDelete)
+#   lru     remove the least recently shown mesh
+#   fifo    remove the mesh that was loaded first
+#   belady  remove the mesh whose next use is furthest away. Needs to know the future, so it's the best any policy can do
+
+import argparse
+import csv
+import math
+import os
+import sys
+from collections import OrderedDict
+
+if __package__:
+    from .profiling import ACCESS_TRACE_FIELDS
+else:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from profiling import ACCESS_TRACE_FIELDS
+
+POLICIES = ('smo', 'lru', 'fifo', 'belady')
+
+
+def readAccessTrace(filePath):
+    trace = []
+    with open(filePath, newline='') as f:
+        reader = csv.DictReader(f)
+        missingFields = [field for field in ACCESS_TRACE_FIELDS if field not in (reader.fieldnames or [])]
+        if len(missingFields) > 0:
+            raise ValueError("Not an access trace, missing columns: " + ", ".join(missingFields))
+        for row in reader:
+            trace.append({
+                'object': row['object'],
+                'frame': int(row['frame']),
+                'meshIdx': int(row['meshIdx']),
+                'hit': row['hit'] == '1',
+                'loadSeconds': float(row['loadSeconds']),
+                'meshBytes': int(row['meshBytes'])
+            })
+    return trace
+
+
+# every sequence has its own cache, so each one's accesses are simulated separately
+def splitTraceByObject(trace):
+    traces = OrderedDict()
+    for record in trace:
+        traces.setdefault(record['object'], []).append(record)
+    return traces
+
+
+# The measured cost of loading each mesh: its average load time over the misses in the trace.
+# Meshes that were never loaded during the trace cost the average of all the loads
+def meshLoadCosts(trace):
+    totals = {}
+    for record in trace:
+        if record['hit'] is False and record['loadSeconds'] > 0.0:
+            total, count = totals.get(record['meshIdx'], (0.0, 0))
+            totals[record['meshIdx']] = (total + record['loadSeconds'], count + 1)
+
+    costs = {meshIdx: total / count for meshIdx, (total, count) in totals.items()}
+    defaultCost = sum(costs.values()) / len(costs) if len(costs) > 0 else 0.0
+    return costs, defaultCost
+
+
+def chooseVictim(policy, resident, currentIdx, nextUse):
+    candidates = (meshIdx for meshIdx in resident if meshIdx != currentIdx)
+    if policy == 'smo':
+        return max(candidates)
+    if policy == 'belady':
+        return max(candidates, key=lambda meshIdx: nextUse[meshIdx])
+    # resident is kept in load order for fifo and in order of use for lru, so the oldest comes first
+    return next(candidates)
+
+
+# Replay a single sequence's accesses with the given cache size (0 keeps every mesh) and eviction policy.
+# Returns a dict with the number of accesses, hits, the hit rate, and the total time spent loading misses
+def simulate(trace, cacheSize, policy):
+    if policy not in POLICIES:
+        raise ValueError("Unknown eviction policy: " + policy)
+
+    # mesh 0 is the empty mesh, which is always loaded
+    meshIdxs = [record['meshIdx'] for record in trace if record['meshIdx'] > 0]
+    costs, defaultCost = meshLoadCosts(trace)
+
+    # for each access, when the same mesh is next needed (for belady)
+    nextUseAfter = [math.inf] * len(meshIdxs)
+    lastSeen = {}
+    for position in range(len(meshIdxs) - 1, -1, -1):
+        nextUseAfter[position] = lastSeen.get(meshIdxs[position], math.inf)
+        lastSeen[meshIdxs[position]] = position
+
+    resident = OrderedDict()
+    nextUse = {}
+    hits = 0
+    stallSeconds = 0.0
+    for position, meshIdx in enumerate(meshIdxs):
+        nextUse[meshIdx] = nextUseAfter[position]
+        if meshIdx in resident:
+            hits += 1
+            if policy == 'lru':
+                resident.move_to_end(meshIdx)
+            continue
+
+        stallSeconds += costs.get(meshIdx, defaultCost)
+        resident[meshIdx] = True
+        while cacheSize > 0 and len(resident) > cacheSize:
+            del resident[chooseVictim(policy, resident, meshIdx, nextUse)]
+
+    numAccesses = len(meshIdxs)
+    return {
+        'policy': policy,
+        'cacheSize': cacheSize,
+        'accesses': numAccesses,
+        'hits': hits,
+        'hitRate': hits / numAccesses if numAccesses > 0 else 1.0,
+        'stallSeconds': stallSeconds
+    }
+
+
+def compareSettings(trace, cacheSizes, policies=POLICIES):
+    return [simulate(trace, cacheSize, policy) for cacheSize in cacheSizes for policy in policies]
+
+
+# the largest mesh in the trace, to estimate how much memory a cache size takes
+def largestMeshBytes(trace):
+    return max((record['meshBytes'] for record in trace), default=0)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Replay a Stop Motion OBJ access trace against other cache sizes and eviction policies")
+    parser.add_argument('trace', help="Access trace saved from Blender (.csv)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2, 4, 8, 16, 32, 0], help="Cache sizes to try (0 keeps every mesh)")
+    parser.add_argument('--policies', nargs='+', choices=POLICIES, default=list(POLICIES), help="Eviction policies to try")
+    args = parser.parse_args(argv)
+
+    trace = readAccessTrace(args.trace)
+    for objectName, objectTrace in splitTraceByObject(trace).items():
+        meshBytes = largestMeshBytes(objectTrace)
+        print("%s: %d accesses, largest mesh %.1f MB" % (objectName, len(objectTrace), meshBytes / 1e6))
+        print("  %-8s %6s %9s %9s %10s" % ('policy', 'size', 'hit rate', 'stall s', 'memory MB'))
+        for result in compareSettings(objectTrace, args.sizes, args.policies):
+            memoryBytes = result['cacheSize'] * meshBytes
+            print("  %-8s %6s %8.1f%% %9.2f %10s" % (
+                result['policy'],
+                result['cacheSize'] if result['cacheSize'] > 0 else 'all',
+                100.0 * result['hitRate'],
+                result['stallSeconds'],
+                '%.0f' % (memoryBytes / 1e6) if result['cacheSize'] > 0 else '-'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
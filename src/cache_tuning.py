@@ -0,0 +1,130 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#   Stop motion OBJ: A Mesh sequence importer for Blender
+#   Copyright (C) 2016-2024  Justin Jensen
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Choosing a Streaming sequence's cache size while it plays (Streaming > Auto Cache Size). Nothing in here depends on bpy.
+# A load that takes longer than a frame holds up playback. When too many recent frame changes were held up, the cache
+#   grows; when far fewer were, it shrinks again. It never holds more meshes than a share of the available memory
+
+import collections
+import os
+
+# how many recent frame changes the stall rate is measured over
+STALL_WINDOW_SIZE = 96
+
+# how many frame changes to measure before changing the size again
+ADJUST_INTERVAL = 24
+
+# the current mesh and at least one other
+MIN_CACHE_SIZE = 2
+
+
+# The memory the system can give to new allocations without swapping, in bytes, or None if it can't be found out
+def readAvailableMemory(meminfoPath='/proc/meminfo'):
+    try:
+        with open(meminfoPath) as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    # reported in kB
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    # without MemAvailable (older Linux kernels, other Unix systems), count the free pages instead.
+    # This leaves out the file cache, so it's lower than what's really available
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class CacheTuner:
+    """Recent frame changes of one Streaming sequence, and the cache size they call for"""
+
+    def __init__(self, cacheSize):
+        self.cacheSize = max(cacheSize, MIN_CACHE_SIZE)
+        self.stalls = collections.deque(maxlen=STALL_WINDOW_SIZE)
+        self.numLoads = 0
+        self.meanLoadSeconds = 0.0
+        self.numMeasuredMeshes = 0
+        self.meanMeshBytes = 0.0
+        self.numAccessesSinceAdjust = 0
+
+    # hit: whether the mesh was already loaded. meshBytes: the size of a newly loaded mesh, or 0 if it isn't known
+    def recordAccess(self, hit, loadSeconds, frameSeconds, meshBytes):
+        # a miss only holds up playback if loading takes longer than a frame
+        self.recordFrameChange(hit is False and loadSeconds > frameSeconds)
+        if hit is False:
+            self.recordLoad(loadSeconds, meshBytes)
+
+    # Drop Frames playback shows a nearby mesh instead of waiting for a miss. That's still a stall;
+    #   the missing mesh is loaded later, and its load is passed to recordLoad then
+    def recordDroppedFrame(self):
+        self.recordFrameChange(True)
+
+    def recordFrameChange(self, stalled):
+        self.stalls.append(stalled)
+        self.numAccessesSinceAdjust += 1
+
+    def recordLoad(self, loadSeconds, meshBytes):
+        self.numLoads += 1
+        self.meanLoadSeconds += (loadSeconds - self.meanLoadSeconds) / self.numLoads
+        if meshBytes > 0:
+            self.numMeasuredMeshes += 1
+            self.meanMeshBytes += (meshBytes - self.meanMeshBytes) / self.numMeasuredMeshes
+
+    def stallRate(self):
+        if len(self.stalls) == 0:
+            return 0.0
+        return sum(self.stalls) / len(self.stalls)
+
+    # the most meshes that fit in memoryFraction of the available memory, or None if that isn't known yet.
+    # The sequence's own meshes count towards it, since removing them would make their memory available again
+    def memoryLimit(self, availableBytes, numMeshesInMemory, memoryFraction):
+        if availableBytes is None or self.meanMeshBytes <= 0.0:
+            return None
+        budget = memoryFraction * (availableBytes + numMeshesInMemory * self.meanMeshBytes)
+        return max(MIN_CACHE_SIZE, int(budget // self.meanMeshBytes))
+
+    def shouldAdjust(self):
+        return self.numAccessesSinceAdjust >= ADJUST_INTERVAL
+
+    # pick the next cache size from the stalls since the last adjustment. numMeshes is the length of the sequence,
+    #   which is as large as the cache ever needs to be
+    def adjust(self, targetStallRate, availableBytes, numMeshesInMemory, memoryFraction, numMeshes):
+        stallRate = self.stallRate()
+        cacheSize = self.cacheSize
+        if stallRate > targetStallRate:
+            # grow quickly, since every stall shows
+            cacheSize += max(1, cacheSize // 2)
+        elif stallRate < targetStallRate / 2:
+            cacheSize -= 1
+
+        upperLimit = max(numMeshes, MIN_CACHE_SIZE)
+        memoryLimit = self.memoryLimit(availableBytes, numMeshesInMemory, memoryFraction)
+        if memoryLimit is not None:
+            upperLimit = min(upperLimit, memoryLimit)
+        cacheSize = max(MIN_CACHE_SIZE, min(cacheSize, upperLimit))
+
+        # the stalls so far were measured with the old size
+        if cacheSize != self.cacheSize:
+            self.stalls.clear()
+        self.cacheSize = cacheSize
+        self.numAccessesSinceAdjust = 0
+        return cacheSize
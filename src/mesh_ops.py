@@ -0,0 +1,220 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#   Stop motion OBJ: A Mesh sequence importer for Blender
+#   Copyright (C) 2016-2024  Justin Jensen
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Geometry operations on MeshData (see mesh_readers.py). Nothing in here depends on bpy.
+# numpy is used when it's available (Blender always ships it); otherwise the plain Python versions run
+
+import array
+
+if __package__:
+    from .mesh_readers import MeshData, uniqueRowsInOrder
+else:
+    from mesh_readers import MeshData, uniqueRowsInOrder
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the distance Blender's own importers merge vertices by
+MERGE_DISTANCE = 0.0001
+
+
+# the clustering grid: cell size and origin, from the number of cells along the longest side of the bounding box
+def clusterGrid(meshData, resolution):
+    bboxMin, bboxMax = meshData.boundingBox()
+    longestSide = max(bboxMax[i] - bboxMin[i] for i in range(3))
+    if longestSide <= 0.0 or resolution < 1:
+        return bboxMin, 0.0
+    return bboxMin, longestSide / resolution
+
+
+# Decimate a mesh by vertex clustering: every vertex in the same grid cell becomes one vertex at the cells' average position.
+# Faces that collapse to fewer than three distinct vertices are dropped
+def clusterMeshData(meshData, resolution, name=None):
+    name = meshData.name if name is None else name
+    origin, cellSize = clusterGrid(meshData, resolution)
+    if cellSize == 0.0 or meshData.numVertices == 0:
+        clustered = MeshData(name)
+        clustered.positions = array.array('f', meshData.positions)
+        clustered.faceSizes = array.array('i', meshData.faceSizes)
+        clustered.faceVertices = array.array('i', meshData.faceVertices)
+        return clustered
+
+    if numpy is not None:
+        return clusterMeshDataNumpy(meshData, origin, cellSize, name)
+    return clusterMeshDataPython(meshData, origin, cellSize, name)
+
+
+def clusterMeshDataPython(meshData, origin, cellSize, name):
+    clustered = MeshData(name)
+    positions = meshData.positions
+    ox, oy, oz = origin
+
+    cellIds = {}
+    sums = []
+    counts = []
+    vertexCluster = array.array('i', bytes(4 * meshData.numVertices))
+    for v in range(meshData.numVertices):
+        x, y, z = positions[3 * v], positions[3 * v + 1], positions[3 * v + 2]
+        cell = (int((x - ox) / cellSize), int((y - oy) / cellSize), int((z - oz) / cellSize))
+        clusterIdx = cellIds.get(cell)
+        if clusterIdx is None:
+            clusterIdx = len(sums)
+            cellIds[cell] = clusterIdx
+            sums.append([0.0, 0.0, 0.0])
+            counts.append(0)
+        vertexCluster[v] = clusterIdx
+        clusterSum = sums[clusterIdx]
+        clusterSum[0] += x
+        clusterSum[1] += y
+        clusterSum[2] += z
+        counts[clusterIdx] += 1
+
+    for clusterSum, count in zip(sums, counts):
+        clustered.positions.extend((clusterSum[0] / count, clusterSum[1] / count, clusterSum[2] / count))
+
+    collapseFacesPython(meshData, vertexCluster, clustered)
+    return clustered
+
+
+# copy meshData's faces into target, with each vertex v replaced by vertexMap[v].
+# Faces that collapse to fewer than three distinct vertices are dropped
+def collapseFacesPython(meshData, vertexMap, target):
+    loopStart = 0
+    for faceSize in meshData.faceSizes:
+        face = [vertexMap[v] for v in meshData.faceVertices[loopStart:loopStart + faceSize]]
+        loopStart += faceSize
+
+        # drop repeated neighbours (including the last vertex repeating the first)
+        face = [v for i, v in enumerate(face) if v != face[(i + 1) % len(face)]]
+        if len(face) < 3 or len(set(face)) != len(face):
+            continue
+        target.faceSizes.append(len(face))
+        target.faceVertices.extend(face)
+
+
+def clusterMeshDataNumpy(meshData, origin, cellSize, name):
+    clustered = MeshData(name)
+    positions = numpy.frombuffer(meshData.positions, dtype=numpy.float32).reshape(-1, 3)
+
+    cells = numpy.floor((positions - numpy.asarray(origin, dtype=numpy.float32)) / cellSize).astype(numpy.int64)
+    uniqueCells, vertexCluster = numpy.unique(cells, axis=0, return_inverse=True)
+    vertexCluster = vertexCluster.reshape(-1)
+    numClusters = len(uniqueCells)
+
+    counts = numpy.bincount(vertexCluster, minlength=numClusters).astype(numpy.float64)
+    clusterPositions = numpy.empty((numClusters, 3), dtype=numpy.float32)
+    for axis in range(3):
+        clusterPositions[:, axis] = numpy.bincount(vertexCluster, weights=positions[:, axis], minlength=numClusters) / counts
+    clustered.positions = array.array('f', clusterPositions.tobytes())
+
+    collapseFacesNumpy(meshData, vertexCluster, clustered)
+    return clustered
+
+
+def collapseFacesNumpy(meshData, vertexMap, target):
+    if meshData.numFaces == 0:
+        return
+
+    faceSizes = numpy.frombuffer(meshData.faceSizes, dtype=numpy.int32)
+    loopStarts = numpy.frombuffer(meshData.loopStarts(), dtype=numpy.int32)
+    loops = vertexMap[numpy.frombuffer(meshData.faceVertices, dtype=numpy.int32)]
+    loopFaces = numpy.repeat(numpy.arange(len(faceSizes)), faceSizes)
+
+    # each loop's next loop in the same face (the last one wraps around to the first)
+    nextLoops = numpy.arange(1, len(loops) + 1)
+    nextLoops[loopStarts + faceSizes - 1] = loopStarts
+
+    # drop repeated neighbours
+    keep = loops != loops[nextLoops]
+    loops = loops[keep]
+    loopFaces = loopFaces[keep]
+    newFaceSizes = numpy.bincount(loopFaces, minlength=len(faceSizes))
+
+    # drop faces with fewer than three vertices, or with the same vertex twice
+    badFaces = newFaceSizes < 3
+    order = numpy.lexsort((loops, loopFaces))
+    repeats = (loopFaces[order][1:] == loopFaces[order][:-1]) & (loops[order][1:] == loops[order][:-1])
+    badFaces[loopFaces[order][1:][repeats]] = True
+
+    keepLoops = ~badFaces[loopFaces]
+    target.faceSizes = array.array('i', newFaceSizes[~badFaces].astype(numpy.int32).tobytes())
+    target.faceVertices = array.array('i', loops[keepLoops].astype(numpy.int32).tobytes())
+
+
+# Merge by distance: vertices that round to the same point of a grid of the given size become one vertex.
+# Each merged vertex keeps the position of the first vertex in its cell, and faces that collapse are dropped
+def weldVertices(meshData, distance=MERGE_DISTANCE, name=None):
+    name = meshData.name if name is None else name
+    welded = MeshData(name)
+    if meshData.numVertices == 0 or distance <= 0.0:
+        welded.positions = array.array('f', meshData.positions)
+        welded.faceSizes = array.array('i', meshData.faceSizes)
+        welded.faceVertices = array.array('i', meshData.faceVertices)
+        return welded
+
+    if numpy is not None:
+        positions = numpy.frombuffer(meshData.positions, dtype=numpy.float32).reshape(-1, 3)
+        cells = numpy.round(positions / distance).astype(numpy.int64)
+        firstIdxs, vertexMap = uniqueRowsInOrder(cells)
+        welded.positions = array.array('f', positions[firstIdxs].tobytes())
+        collapseFacesNumpy(meshData, vertexMap, welded)
+        return welded
+
+    positions = meshData.positions
+    cellIds = {}
+    vertexMap = array.array('i', bytes(4 * meshData.numVertices))
+    for v in range(meshData.numVertices):
+        x, y, z = positions[3 * v], positions[3 * v + 1], positions[3 * v + 2]
+        cell = (round(x / distance), round(y / distance), round(z / distance))
+        weldedIdx = cellIds.get(cell)
+        if weldedIdx is None:
+            weldedIdx = len(cellIds)
+            cellIds[cell] = weldedIdx
+            welded.positions.extend((x, y, z))
+        vertexMap[v] = weldedIdx
+
+    collapseFacesPython(meshData, vertexMap, welded)
+    return welded
+
+
+# Move every vertex by an affine transform, given as the top three rows of a 4x4 matrix (like Blender's mesh.transform()).
+# Faces and point attributes are shared with meshData, not copied
+def transformPositions(meshData, matrix, name=None):
+    name = meshData.name if name is None else name
+    transformed = MeshData(name)
+    transformed.faceSizes = meshData.faceSizes
+    transformed.faceVertices = meshData.faceVertices
+    transformed.pointAttributes = meshData.pointAttributes
+    rows = [tuple(float(value) for value in matrix[i][:4]) for i in range(3)]
+
+    if numpy is not None:
+        positions = numpy.frombuffer(meshData.positions, dtype=numpy.float32).reshape(-1, 3).astype(numpy.float64)
+        rowsArray = numpy.asarray(rows, dtype=numpy.float64)
+        moved = positions @ rowsArray[:, :3].T + rowsArray[:, 3]
+        transformed.positions = array.array('f', moved.astype(numpy.float32).tobytes())
+        return transformed
+
+    positions = meshData.positions
+    for v in range(meshData.numVertices):
+        x, y, z = positions[3 * v], positions[3 * v + 1], positions[3 * v + 2]
+        transformed.positions.extend(row[0] * x + row[1] * y + row[2] * z + row[3] for row in rows)
+    return transformed
@@ -0,0 +1,602 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#   Stop motion OBJ: A Mesh sequence importer for Blender
+#   Copyright (C) 2016-2024  Justin Jensen
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Stop Motion OBJ's own mesh readers and its binary frame cache format.
+# Nothing in here depends on bpy, so these can run outside of Blender (e.g. in the batch converter's worker processes)
+# Every reader returns a MeshData whose arrays can be handed straight to foreach_set()
+
+import array
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from itertools import accumulate, chain
+
+if __package__:
+    from .sequence_files import openSequenceFile, sequenceFileStem
+else:
+    from sequence_files import openSequenceFile, sequenceFileStem
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SUPPORTED_FORMATS = ('obj', 'stl', 'ply')
+POINT_CLOUD_FORMATS = ('obj', 'ply')
+
+# per-point attributes read in point cloud mode: attribute name -> (Blender attribute type, the PLY properties that hold it)
+POINT_ATTRIBUTES = (
+    ('color', 'FLOAT_COLOR', (('red', 'green', 'blue', 'alpha'), ('r', 'g', 'b', 'a'), ('diffuse_red', 'diffuse_green', 'diffuse_blue', 'diffuse_alpha'))),
+    ('radius', 'FLOAT', (('radius',), ('scale',))),
+    ('velocity', 'FLOAT_VECTOR', (('vx', 'vy', 'vz'), ('velocity_x', 'velocity_y', 'velocity_z'))),
+)
+
+# integer colors are scaled into 0..1 by the largest value their type can hold
+plyColorScales = {'b': 127.0, 'B': 255.0, 'h': 32767.0, 'H': 65535.0, 'i': 2147483647.0, 'I': 4294967295.0}
+
+# the frame cache is a small header followed by the raw arrays from MeshData
+FRAME_CACHE_MAGIC = b'SMOF'
+FRAME_CACHE_VERSION = 1
+FRAME_CACHE_EXTENSION = '.smof'
+FRAME_CACHE_DIRNAME = '.smo_cache'
+
+# magic, version, numVertices, numFaces, numLoops, flags, bounding box min xyz, bounding box max xyz
+frameCacheHeader = struct.Struct('<4sIIIII6f')
+
+plyTypes = {
+    'char': 'b', 'int8': 'b',
+    'uchar': 'B', 'uint8': 'B',
+    'short': 'h', 'int16': 'h',
+    'ushort': 'H', 'uint16': 'H',
+    'int': 'i', 'int32': 'i',
+    'uint': 'I', 'uint32': 'I',
+    'float': 'f', 'float32': 'f',
+    'double': 'd', 'float64': 'd'
+}
+
+
+class MeshData:
+    """Vertex positions and polygons for a single mesh, stored as flat arrays"""
+
+    def __init__(self, name=''):
+        self.name = name
+        # x, y, z for every vertex
+        self.positions = array.array('f')
+        # the number of vertices in each face
+        self.faceSizes = array.array('i')
+        # the vertex indices of every face, one face after another
+        self.faceVertices = array.array('i')
+        # point clouds only: attribute name -> (Blender attribute type, flat array of values for every vertex)
+        self.pointAttributes = {}
+
+    @property
+    def numVertices(self):
+        return len(self.positions) // 3
+
+    @property
+    def numFaces(self):
+        return len(self.faceSizes)
+
+    @property
+    def numLoops(self):
+        return len(self.faceVertices)
+
+    def loopStarts(self):
+        return array.array('i', accumulate(chain([0], self.faceSizes[:-1]))) if self.numFaces > 0 else array.array('i')
+
+    def boundingBox(self):
+        if self.numVertices == 0:
+            return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+
+        xs = self.positions[0::3]
+        ys = self.positions[1::3]
+        zs = self.positions[2::3]
+        return (min(xs), min(ys), min(zs)), (max(xs), max(ys), max(zs))
+
+
+def readOBJ(f, name=''):
+    meshData = MeshData(name)
+    positions = meshData.positions
+    faceSizes = meshData.faceSizes
+    faceVertices = meshData.faceVertices
+    for line in f:
+        if line.startswith(b'v '):
+            parts = line.split()
+            positions.extend((float(parts[1]), float(parts[2]), float(parts[3])))
+        elif line.startswith(b'f '):
+            numVerts = len(positions) // 3
+            # faces look like "f 1 2 3", "f 1/1 2/2 3/3", or "f 1/1/1 2/2/2 3/3/3" and may use negative (relative) indices
+            vIdxs = [int(part.split(b'/', 1)[0]) for part in line.split()[1:]]
+            faceSizes.append(len(vIdxs))
+            faceVertices.extend([vIdx - 1 if vIdx > 0 else numVerts + vIdx for vIdx in vIdxs])
+
+    return meshData
+
+
+# Number the distinct rows of a 2D numpy array in the order they first appear.
+# Returns (the index of each distinct row's first appearance, which distinct row each row is)
+def uniqueRowsInOrder(rows):
+    uniqueRows, firstIdxs, inverse = numpy.unique(rows, axis=0, return_index=True, return_inverse=True)
+    # numpy.unique sorts the rows, so renumber them by first appearance
+    order = numpy.argsort(firstIdxs, kind='stable')
+    rank = numpy.empty(len(order), dtype=numpy.int32)
+    rank[order] = numpy.arange(len(order), dtype=numpy.int32)
+    return firstIdxs[order], rank[inverse.reshape(-1)]
+
+
+# weld identical corners into shared vertices. corners is an (n, 3) float32 array, three corners per triangle
+def triangleMeshFromCorners(name, corners):
+    meshData = MeshData(name)
+    if len(corners) == 0:
+        return meshData
+
+    # adding zero turns -0.0 into 0.0, so the two weld together the way they compare equal
+    corners = corners + numpy.float32(0.0)
+    firstIdxs, cornerVertices = uniqueRowsInOrder(corners)
+    meshData.positions = array.array('f', corners[firstIdxs].tobytes())
+    meshData.faceVertices = array.array('i', cornerVertices.astype(numpy.int32).tobytes())
+    meshData.faceSizes = array.array('i', [3]) * (len(corners) // 3)
+    return meshData
+
+
+def readSTL(f, name=''):
+    data = f.read()
+
+    numTriangles = struct.unpack_from('<I', data, 80)[0] if len(data) >= 84 else -1
+    isBinary = numTriangles >= 0 and len(data) == 84 + 50 * numTriangles
+    if isBinary and numpy is not None:
+        # binary STL rows are fixed-size, so read every corner at once and weld them in bulk
+        triangleType = numpy.dtype([('normal', '<f4', (3,)), ('corners', '<f4', (3, 3)), ('attributes', '<u2')])
+        triangles = numpy.frombuffer(data, dtype=triangleType, count=numTriangles, offset=84)
+        return triangleMeshFromCorners(name, triangles['corners'].reshape(-1, 3).astype(numpy.float32))
+
+    meshData = MeshData(name)
+
+    # STL stores every triangle separately, so weld identical corners together like Blender's importer does
+    vertexIndices = {}
+
+    def addCorner(corner):
+        vIdx = vertexIndices.get(corner)
+        if vIdx is None:
+            vIdx = len(vertexIndices)
+            vertexIndices[corner] = vIdx
+            meshData.positions.extend(corner)
+        meshData.faceVertices.append(vIdx)
+
+    if isBinary:
+        # binary STL: normal, three corners, and an attribute count for each triangle
+        for triangle in struct.iter_unpack('<12fH', data[84:]):
+            addCorner(triangle[3:6])
+            addCorner(triangle[6:9])
+            addCorner(triangle[9:12])
+    else:
+        # ASCII STL: every "vertex x y z" line is one corner
+        for line in data.splitlines():
+            parts = line.split()
+            if len(parts) == 4 and parts[0] == b'vertex':
+                # round-trip through float32 so ASCII and binary files weld the same way
+                addCorner(tuple(array.array('f', (float(parts[1]), float(parts[2]), float(parts[3])))))
+
+    numTriangles = len(meshData.faceVertices) // 3
+    meshData.faceSizes = array.array('i', [3]) * numTriangles
+    return meshData
+
+
+def readPLYHeader(f):
+    line = f.readline().strip()
+    if line != b'ply':
+        raise ValueError("Not a PLY file")
+
+    fileFormat = 'ascii'
+    elements = []
+    while True:
+        line = f.readline()
+        if line == b'':
+            raise ValueError("PLY header has no end_header")
+        parts = line.decode('ascii', errors='replace').split()
+        if len(parts) == 0:
+            continue
+        if parts[0] == 'format':
+            fileFormat = parts[1]
+        elif parts[0] == 'element':
+            elements.append({'name': parts[1], 'count': int(parts[2]), 'properties': []})
+        elif parts[0] == 'property':
+            if parts[1] == 'list':
+                elements[-1]['properties'].append({'name': parts[4], 'type': plyTypes[parts[3]], 'countType': plyTypes[parts[2]]})
+            else:
+                elements[-1]['properties'].append({'name': parts[2], 'type': plyTypes[parts[1]], 'countType': None})
+        elif parts[0] == 'end_header':
+            return fileFormat, elements
+
+
+def readPLYElementASCII(lines, lineIdx, element):
+    rows = []
+    for rowIdx in range(element['count']):
+        values = lines[lineIdx + rowIdx].split()
+        row = []
+        pos = 0
+        for prop in element['properties']:
+            if prop['countType'] is None:
+                row.append(float(values[pos]) if prop['type'] in 'fd' else int(values[pos]))
+                pos += 1
+            else:
+                count = int(values[pos])
+                row.append([int(v) for v in values[pos + 1:pos + 1 + count]])
+                pos += 1 + count
+        rows.append(row)
+    return rows, lineIdx + element['count']
+
+
+def readPLYElementBinary(data, offset, element, endian):
+    properties = element['properties']
+    if all(prop['countType'] is None for prop in properties):
+        # fixed-size rows can all be unpacked in one go
+        rowStruct = struct.Struct(endian + ''.join(prop['type'] for prop in properties))
+        end = offset + rowStruct.size * element['count']
+        return list(rowStruct.iter_unpack(data[offset:end])), end
+
+    rows = []
+    for rowIdx in range(element['count']):
+        row = []
+        for prop in properties:
+            if prop['countType'] is None:
+                value = struct.unpack_from(endian + prop['type'], data, offset)[0]
+                offset += struct.calcsize(prop['type'])
+                row.append(value)
+            else:
+                count = struct.unpack_from(endian + prop['countType'], data, offset)[0]
+                offset += struct.calcsize(prop['countType'])
+                itemFormat = endian + str(count) + prop['type']
+                row.append(list(struct.unpack_from(itemFormat, data, offset)))
+                offset += struct.calcsize(itemFormat)
+        rows.append(row)
+    return rows, offset
+
+
+def readPLY(f, name=''):
+    fileFormat, elements = readPLYHeader(f)
+    data = f.read()
+    meshData = MeshData(name)
+
+    lines = data.splitlines() if fileFormat == 'ascii' else None
+    endian = '>' if fileFormat == 'binary_big_endian' else '<'
+    position = 0
+    for element in elements:
+        if fileFormat == 'ascii':
+            rows, position = readPLYElementASCII(lines, position, element)
+        else:
+            rows, position = readPLYElementBinary(data, position, element, endian)
+
+        propNames = [prop['name'] for prop in element['properties']]
+        if element['name'] == 'vertex':
+            xIdx, yIdx, zIdx = propNames.index('x'), propNames.index('y'), propNames.index('z')
+            positions = meshData.positions
+            for row in rows:
+                positions.extend((row[xIdx], row[yIdx], row[zIdx]))
+        elif element['name'] == 'face':
+            listName = 'vertex_indices' if 'vertex_indices' in propNames else 'vertex_index'
+            listIdx = propNames.index(listName)
+            for row in rows:
+                meshData.faceSizes.append(len(row[listIdx]))
+                meshData.faceVertices.extend(row[listIdx])
+
+    return meshData
+
+
+# The arrays go straight into foreach_set(), which doesn't check them, so a broken file would make a broken Blender mesh.
+# Raises ValueError for faces with fewer than three vertices or vertex indices that are out of range
+def validateMeshData(meshData):
+    numVertices = meshData.numVertices
+    if meshData.numFaces == 0:
+        return
+    if sum(meshData.faceSizes) != meshData.numLoops:
+        raise ValueError("Face sizes don't match the number of face vertices")
+
+    if numpy is not None:
+        faceSizes = numpy.frombuffer(meshData.faceSizes, dtype=numpy.int32)
+        faceVertices = numpy.frombuffer(meshData.faceVertices, dtype=numpy.int32)
+        badFaceSizes = bool((faceSizes < 3).any())
+        badIndices = bool(((faceVertices < 0) | (faceVertices >= numVertices)).any())
+    else:
+        badFaceSizes = min(meshData.faceSizes) < 3
+        badIndices = min(meshData.faceVertices) < 0 or max(meshData.faceVertices) >= numVertices
+
+    if badFaceSizes:
+        raise ValueError("Face with fewer than 3 vertices")
+    if badIndices:
+        raise ValueError("Face vertex index out of range")
+
+
+def readMeshFile(filePath, fileFormat):
+    if fileFormat not in SUPPORTED_FORMATS:
+        raise ValueError("Unsupported file format: " + fileFormat)
+
+    name = sequenceFileStem(filePath)
+    with openSequenceFile(filePath) as f:
+        if fileFormat == 'obj':
+            meshData = readOBJ(f, name)
+        elif fileFormat == 'stl':
+            meshData = readSTL(f, name)
+        elif fileFormat == 'ply':
+            meshData = readPLY(f, name)
+
+    validateMeshData(meshData)
+    return meshData
+
+
+# Point cloud mode: read only the vertices and their per-point attributes. Faces, normals, and materials are ignored
+def readPointCloudFile(filePath, fileFormat):
+    if fileFormat not in POINT_CLOUD_FORMATS:
+        raise ValueError("Point clouds can't be read from " + fileFormat + " files")
+
+    name = sequenceFileStem(filePath)
+    with openSequenceFile(filePath) as f:
+        if fileFormat == 'obj':
+            return readOBJPoints(f, name)
+        elif fileFormat == 'ply':
+            return readPLYPoints(f, name)
+
+
+# OBJ has no standard point attributes, but many exporters write a vertex color after the position ("v x y z r g b")
+def readOBJPoints(f, name=''):
+    meshData = MeshData(name)
+    positions = meshData.positions
+    colors = array.array('f')
+    for line in f:
+        if line.startswith(b'v '):
+            parts = line.split()
+            positions.extend((float(parts[1]), float(parts[2]), float(parts[3])))
+            if len(parts) >= 7:
+                colors.extend((float(parts[4]), float(parts[5]), float(parts[6]), 1.0))
+
+    # only keep the colors if every point had one
+    if len(colors) > 0 and len(colors) // 4 == meshData.numVertices:
+        meshData.pointAttributes['color'] = ('FLOAT_COLOR', colors)
+    return meshData
+
+
+def readPLYPoints(f, name=''):
+    fileFormat, elements = readPLYHeader(f)
+    data = f.read()
+    lines = data.splitlines() if fileFormat == 'ascii' else None
+    endian = '>' if fileFormat == 'binary_big_endian' else '<'
+    position = 0
+    for element in elements:
+        if element['name'] == 'vertex':
+            propTypes = {prop['name']: prop['type'] for prop in element['properties']}
+            return pointCloudFromPLYColumns(name, readPLYColumns(data, lines, position, element, endian), propTypes)
+
+        # skip over anything that comes before the vertices
+        if fileFormat == 'ascii':
+            rows, position = readPLYElementASCII(lines, position, element)
+        else:
+            rows, position = readPLYElementBinary(data, position, element, endian)
+
+    return MeshData(name)
+
+
+# read every property of a PLY element as a column: property name -> sequence of values
+def readPLYColumns(data, lines, offset, element, endian):
+    properties = element['properties']
+    if lines is None and numpy is not None and all(prop['countType'] is None for prop in properties):
+        # fixed-size binary rows map straight onto a numpy record array, without unpacking each row
+        rowType = numpy.dtype([(prop['name'], endian + prop['type']) for prop in properties])
+        records = numpy.frombuffer(data, dtype=rowType, count=element['count'], offset=offset)
+        return {prop['name']: records[prop['name']] for prop in properties}
+
+    if lines is None:
+        rows, offset = readPLYElementBinary(data, offset, element, endian)
+    else:
+        rows, offset = readPLYElementASCII(lines, offset, element)
+    columns = list(zip(*rows)) if len(rows) > 0 else [() for prop in properties]
+    return {prop['name']: column for prop, column in zip(properties, columns)}
+
+
+# interleave columns (x, y, z, ...) into one flat float array, scaling each column by 1 / its scale
+def interleaveColumns(columns, scales=None):
+    if scales is None:
+        scales = [1.0] * len(columns)
+    if numpy is not None:
+        interleaved = numpy.empty((len(columns[0]), len(columns)), dtype=numpy.float32)
+        for columnIdx, (column, scale) in enumerate(zip(columns, scales)):
+            interleaved[:, columnIdx] = column
+            if scale != 1.0:
+                interleaved[:, columnIdx] /= scale
+        return array.array('f', interleaved.tobytes())
+
+    if any(scale != 1.0 for scale in scales):
+        columns = [[value / scale for value in column] if scale != 1.0 else column for column, scale in zip(columns, scales)]
+    return array.array('f', chain.from_iterable(zip(*columns)))
+
+
+def pointCloudFromPLYColumns(name, columns, propTypes):
+    meshData = MeshData(name)
+    if len(columns) == 0:
+        return meshData
+    meshData.positions = interleaveColumns([columns['x'], columns['y'], columns['z']])
+    numPoints = meshData.numVertices
+
+    for attrName, attrType, propNameOptions in POINT_ATTRIBUTES:
+        for propNames in propNameOptions:
+            present = [propName for propName in propNames if propName in columns]
+            # colors may leave out alpha, but every other component has to be there
+            if attrType == 'FLOAT_COLOR' and present == list(propNames[:3]):
+                present.append(None)
+            elif len(present) != len(propNames):
+                continue
+
+            attrColumns = [columns[propName] if propName is not None else array.array('f', [1.0]) * numPoints for propName in present]
+            scales = None
+            if attrType == 'FLOAT_COLOR':
+                scales = [plyColorScales.get(propTypes.get(propName), 1.0) for propName in present]
+            meshData.pointAttributes[attrName] = (attrType, interleaveColumns(attrColumns, scales))
+            break
+
+    return meshData
+
+
+# Find the .mtl files an OBJ file refers to. Exporters write "mtllib" before any geometry,
+#   so we stop reading as soon as the geometry starts instead of scanning the whole file
+def readOBJMaterialLibraries(objPath):
+    mtlPaths = []
+    objDir = os.path.dirname(objPath)
+    with open(objPath, 'rb') as f:
+        for line in f:
+            if line.startswith(b'mtllib'):
+                mtlName = line[len(b'mtllib'):].strip().decode('utf-8', errors='replace')
+                mtlPaths.append(os.path.join(objDir, mtlName))
+            elif line.startswith((b'v ', b'vt ', b'vn ', b'f ')):
+                break
+    return mtlPaths
+
+
+# Digest each material definition in an .mtl file. Returns {material name: digest}
+# Two materials with the same settings and the same texture files get the same digest, whatever they're called
+def readMTLDigests(mtlPath):
+    mtlDir = os.path.dirname(mtlPath)
+    definitions = {}
+    currentLines = None
+    with open(mtlPath, 'rb') as f:
+        for rawLine in f:
+            parts = rawLine.decode('utf-8', errors='replace').split()
+            if len(parts) == 0 or parts[0].startswith('#'):
+                continue
+            if parts[0] == 'newmtl':
+                currentLines = []
+                definitions[' '.join(parts[1:])] = currentLines
+            elif currentLines is not None:
+                if parts[0].lower().startswith(('map_', 'bump', 'disp', 'decal', 'refl')) and len(parts) > 1:
+                    # texture paths are relative to the .mtl file, so compare them as absolute paths
+                    parts[-1] = os.path.normcase(os.path.abspath(os.path.join(mtlDir, parts[-1])))
+                currentLines.append(' '.join(parts))
+
+    return {name: hashlib.sha1('\n'.join(lines).encode('utf-8')).hexdigest() for name, lines in definitions.items()}
+
+
+# the frame cache for a mesh file lives in a hidden folder next to it
+def frameCachePath(sourcePath, cacheDir=None, extension=FRAME_CACHE_EXTENSION):
+    if cacheDir is None:
+        cacheDir = os.path.join(os.path.dirname(sourcePath), FRAME_CACHE_DIRNAME)
+    return os.path.join(cacheDir, os.path.basename(sourcePath) + extension)
+
+
+# viewport proxies use the frame cache format too, with the clustering resolution in the name
+def proxyCacheExtension(resolution):
+    return '.proxy%d' % resolution + FRAME_CACHE_EXTENSION
+
+
+# a frame cache is only usable if it was written after the source file was last modified
+def isFrameCacheFresh(sourcePath, cachePath):
+    try:
+        return os.stat(cachePath).st_mtime >= os.stat(sourcePath).st_mtime
+    except OSError:
+        return False
+
+
+def writeFrameCache(cachePath, meshData):
+    bboxMin, bboxMax = meshData.boundingBox()
+    header = frameCacheHeader.pack(
+        FRAME_CACHE_MAGIC,
+        FRAME_CACHE_VERSION,
+        meshData.numVertices,
+        meshData.numFaces,
+        meshData.numLoops,
+        0,
+        *bboxMin,
+        *bboxMax)
+
+    blocks = [meshData.positions, meshData.faceSizes, meshData.faceVertices]
+    if sys.byteorder == 'big':
+        blocks = [array.array(block.typecode, block) for block in blocks]
+        for block in blocks:
+            block.byteswap()
+
+    # write to a temporary file first so that a reader never sees a half-written cache
+    os.makedirs(os.path.dirname(cachePath), exist_ok=True)
+    tmpPath = cachePath + '.tmp' + str(os.getpid())
+    with open(tmpPath, 'wb') as f:
+        f.write(header)
+        for block in blocks:
+            block.tofile(f)
+    os.replace(tmpPath, cachePath)
+
+
+def readFrameCacheHeader(data):
+    magic, version, numVertices, numFaces, numLoops, flags, *bbox = frameCacheHeader.unpack_from(data, 0)
+    if magic != FRAME_CACHE_MAGIC or version != FRAME_CACHE_VERSION:
+        raise ValueError("Not a Stop Motion OBJ frame cache (or an incompatible version)")
+    return {
+        'numVertices': numVertices,
+        'numFaces': numFaces,
+        'numLoops': numLoops,
+        'flags': flags,
+        'bboxMin': tuple(bbox[0:3]),
+        'bboxMax': tuple(bbox[3:6])
+    }
+
+
+# read just the bounding box of a frame cache, without loading the mesh
+def readFrameCacheBounds(cachePath):
+    with open(cachePath, 'rb') as f:
+        header = readFrameCacheHeader(f.read(frameCacheHeader.size))
+    return header['bboxMin'], header['bboxMax']
+
+
+# Map a frame cache into memory instead of reading it: the MeshData's arrays are views straight into the file's pages,
+#   so every process that maps the same cache shares one copy. The views keep the mapping open for as long as they're used
+def mapFrameCache(cachePath, name=''):
+    if sys.byteorder == 'big':
+        return readFrameCache(cachePath, name)
+
+    with open(cachePath, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    header = readFrameCacheHeader(mapped)
+    meshData = MeshData(name)
+    view = memoryview(mapped)
+    offset = frameCacheHeader.size
+    for attrName, typecode, count in (('positions', 'f', header['numVertices'] * 3), ('faceSizes', 'i', header['numFaces']), ('faceVertices', 'i', header['numLoops'])):
+        end = offset + count * 4
+        if end > len(mapped):
+            raise ValueError("Frame cache is truncated")
+        setattr(meshData, attrName, view[offset:end].cast(typecode))
+        offset = end
+
+    return meshData
+
+
+def readFrameCache(cachePath, name=''):
+    with open(cachePath, 'rb') as f:
+        data = f.read()
+
+    header = readFrameCacheHeader(data)
+    meshData = MeshData(name)
+    offset = frameCacheHeader.size
+    for attrName, count in (('positions', header['numVertices'] * 3), ('faceSizes', header['numFaces']), ('faceVertices', header['numLoops'])):
+        block = getattr(meshData, attrName)
+        end = offset + count * block.itemsize
+        block.frombytes(data[offset:end])
+        if sys.byteorder == 'big':
+            block.byteswap()
+        offset = end
+
+    return meshData
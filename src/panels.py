@@ -25,6 +25,9 @@ from bpy_extras.io_utils import (
     axis_conversion)
 
 from .stop_motion_obj import *
+from . import profiling
+from . import read_ahead
+from . import shared_cache
 
 # The properties panel added to the Object Properties Panel list
 class SMO_PT_MeshSequencePanel(bpy.types.Panel):
@@ -75,6 +78,15 @@ class SMO_PT_MeshSequencePlaybackPanel(bpy.types.Panel):
                 col.prop(objSettings, "startFrame")
                 col.prop(objSettings, "speed")
 
+            # instances use the proxy settings of the sequence they show
+            if objSettings.instanceOf is None:
+                col.prop(objSettings, "useProxies")
+            if objSettings.instanceOf is None and objSettings.useProxies is True:
+                col.prop(objSettings, "proxyResolution")
+                row = col.row()
+                row.enabled = context.mode == 'OBJECT'
+                row.operator("ms.generate_proxies")
+
 
 class SMO_PT_MeshSequenceStreamingPanel(bpy.types.Panel):
     bl_label = 'Streaming'
@@ -85,7 +97,7 @@ class SMO_PT_MeshSequenceStreamingPanel(bpy.types.Panel):
     @classmethod
     def poll(cls, context):
         mss = context.object.mesh_sequence_settings
-        return mss.initialized == True and mss.cacheMode == 'streaming'
+        return mss.initialized == True and mss.cacheMode == 'streaming' and mss.instanceOf is None
     
     def draw(self, context):
         layout = self.layout
@@ -94,7 +106,40 @@ class SMO_PT_MeshSequenceStreamingPanel(bpy.types.Panel):
         objSettings = context.object.mesh_sequence_settings
         col = layout.column(align=False)
         col.prop(objSettings, "cacheSize")
+        col.prop(objSettings, "autoCacheSize")
+        if objSettings.autoCacheSize is True:
+            col.prop(objSettings, "targetStallRate")
+            col.prop(objSettings, "memoryCeiling")
+            col.label(text="Effective cache size: " + str(objSettings.effectiveCacheSize))
+            tuner = cacheTuners.get(context.object.name)
+            if tuner is not None and tuner.numLoads > 0:
+                col.label(text="Loads: %.0f ms, %.1f MB on average, %.0f%% stalled" % (tuner.meanLoadSeconds * 1000, tuner.meanMeshBytes / 1e6, 100 * tuner.stallRate()))
         col.prop(objSettings, "streamDuringPlayback")
+        row = col.row()
+        row.enabled = objSettings.streamDuringPlayback
+        row.prop(objSettings, "dropFrames")
+        if objSettings.dropFrames is True and objSettings.streamDuringPlayback is True:
+            col.label(text="Dropped frames: " + str(objSettings.numDroppedFrames))
+        col.prop(objSettings, "skipInvisibleFrames")
+        col.prop(objSettings, "renderPrewarm")
+        row = col.row()
+        row.enabled = objSettings.renderPrewarm
+        row.prop(objSettings, "renderReadAhead")
+        col.prop(objSettings, "playbackReadAhead")
+        col.prop(objSettings, "useFrameCache")
+        col.prop(objSettings, "useSharedCache")
+        if objSettings.useSharedCache is True:
+            row = col.row()
+            if shared_cache.lastUsage is not None:
+                numEntries, totalBytes = shared_cache.lastUsage
+                row.label(text="Shared frames on this machine: %d (%.0f MB)" % (numEntries, totalBytes / 1e6))
+            else:
+                row.label(text="Shared frames on this machine: not counted yet")
+            row.operator("ms.refresh_shared_cache_usage", text="", icon='FILE_REFRESH')
+
+        megabytesPerSecond, numFilesRead = read_ahead.readAheadThroughput()
+        if numFilesRead > 0:
+            col.label(text="Read ahead: %.1f MB/s over %d files" % (megabytesPerSecond, numFilesRead))
 
 
 class SMO_PT_MeshSequenceExportPanel(bpy.types.Panel):
@@ -149,14 +194,20 @@ class SMO_PT_MeshSequenceAdvancedPanel(bpy.types.Panel):
         objSettings = context.object.mesh_sequence_settings
         inObjectMode = context.mode == 'OBJECT'
         inSculptMode = context.mode == 'SCULPT'
-        if objSettings.loaded is True:
+        if objSettings.loaded is True and objSettings.instanceOf is not None:
+            layout.row().label(text="Instance of: " + objSettings.instanceOf.name)
+            row = layout.row()
+            row.enabled = inObjectMode
+            row.operator("ms.add_sequence_instance")
+        elif objSettings.loaded is True:
             # only allow mesh duplication for non-imported sequences in Keyframe playback mode
             if objSettings.isImported is False and objSettings.frameMode == '4':
                 row = layout.row(align=True)
                 row.enabled = inObjectMode or inSculptMode
                 row.operator("ms.duplicate_mesh_frame")
                 
-            if objSettings.cacheMode == 'cached' or objSettings.cacheMode == 'streaming':
+            # point clouds have no faces to shade
+            if (objSettings.cacheMode == 'cached' or objSettings.cacheMode == 'streaming') and objSettings.pointCloud is False:
                 row = layout.row(align=True)
                 row.enabled = inObjectMode
                 row.label(text="Shading:")
@@ -170,18 +221,22 @@ class SMO_PT_MeshSequenceAdvancedPanel(bpy.types.Panel):
 
                 if objSettings.isImported is True:
                     # non-imported sequences won't have a fileName or dirPath and cannot be reloaded
-                    row = layout.row()
+                    row = layout.row(align=True)
                     row.enabled = inObjectMode
                     row.operator("ms.reload_mesh_sequence")
+                    if objSettings.splitObjectName == '':
+                        row.operator("ms.resume_import")
 
-                row = layout.row()
+                row = layout.row(align=True)
                 row.enabled = inObjectMode
                 row.operator("ms.bake_sequence")
+                row.operator("ms.bake_point_cache")
             
             
 
-            row = layout.row()
+            row = layout.row(align=True)
             row.enabled = inObjectMode
+            row.operator("ms.add_sequence_instance")
             row.operator("ms.deep_delete_sequence")
 
             layout.row().separator()
@@ -192,11 +247,35 @@ class SMO_PT_MeshSequenceAdvancedPanel(bpy.types.Panel):
             if objSettings.cacheMode == 'streaming':
                 layout.row().label(text="Cached meshes: " + str(objSettings.numMeshesInMemory)  + " meshes")
 
+            if objSettings.shareIdenticalFrames is True:
+                numUniqueMeshes, numFrames = getFrameSharingStats(context.object)
+                if numUniqueMeshes > 0:
+                    layout.row().label(text="Shared frames: %d meshes for %d frames (%.2fx)" % (numUniqueMeshes, numFrames, numFrames / numUniqueMeshes))
+
             if objSettings.isImported is True:
                 # non-imported sequences won't have a dirPath to display
                 layout.row().label(text="Mesh directory: " + objSettings.dirPath)
             layout.row().label(text="Sequence version: " + objSettings.version.toString())
 
+            layout.row().separator()
+            wm = context.window_manager
+            layout.row().prop(wm, "smoTimingEnabled")
+            if wm.smoTimingEnabled is True:
+                col = layout.column(align=True)
+                for name, numCalls, p50, p95 in profiling.timingSummary():
+                    col.label(text="%s: p50 %.1f ms, p95 %.1f ms (%d calls)" % (name, p50 * 1000, p95 * 1000, numCalls))
+
+                row = layout.row(align=True)
+                row.operator("ms.dump_timing_trace")
+                row.operator("ms.clear_timing_trace")
+
+            layout.row().prop(wm, "smoAccessTraceEnabled")
+            if wm.smoAccessTraceEnabled is True:
+                layout.row().label(text="%d accesses recorded" % len(profiling.accessTrace))
+                row = layout.row(align=True)
+                row.operator("ms.dump_access_trace")
+                row.operator("ms.clear_access_trace")
+
 
 class SequenceImportSettings(bpy.types.PropertyGroup):
     fileNamePrefix: bpy.props.StringProperty(name='File Name')
@@ -206,6 +285,16 @@ class SequenceImportSettings(bpy.types.PropertyGroup):
         name='Material per Frame',
         default=False)
 
+    shareIdenticalFrames: bpy.props.BoolProperty(
+        name='Share Identical Frames',
+        description="Frames whose files are byte-for-byte identical (e.g. stop-motion holds) use the same mesh. Files of the same size are read an extra time while importing to find them",
+        default=False)
+
+    useFrameCache: bpy.props.BoolProperty(
+        name='Use Frame Caches',
+        description="Build frames from the batch converter's frame caches (.smo_cache) when they are newer than the source files, instead of running the importer. Frame caches hold only positions and faces, so UVs, normals, and per-face materials are lost, and they don't follow the importer settings",
+        default=False)
+
     # Whether to load the entire sequence into memory or to load meshes on-demand
     cacheMode: bpy.props.EnumProperty(
         items=[('cached', 'Cached', 'The full sequence is loaded into memory and saved in the .blend file'),
@@ -224,6 +313,14 @@ class SequenceImportSettings(bpy.types.PropertyGroup):
         name="Relative Paths",
         description="Store relative paths for Streaming sequences and for reloading Cached sequences",
         default=True)
+    splitObjects: bpy.props.BoolProperty(
+        name="Split Objects",
+        description="Make a separate sequence for each object in the OBJ files. Each file is still only imported once",
+        default=False)
+    pointCloud: bpy.props.BoolProperty(
+        name="Point Cloud",
+        description="Load only the points of each OBJ/PLY file, with their color, radius, and velocity attributes. Faces and materials are skipped",
+        default=False)
 
 
 @orientation_helper(axis_forward='-Z', axis_up='Y')
@@ -237,7 +334,8 @@ class ImportSequence(bpy.types.Operator, ImportHelper):
     sequenceSettings: bpy.props.PointerProperty(type=SequenceImportSettings)
 
     # for now, we'll just show any file type that Stop Motion OBJ supports
-    filter_glob: bpy.props.StringProperty(default="*.stl;*.obj;*.mtl;*.ply;*.x3d;*.wrl")
+    # (frames can also be compressed or packed into a zip/tar archive)
+    filter_glob: bpy.props.StringProperty(default="*.stl;*.obj;*.mtl;*.ply;*.x3d;*.wrl;*.gz;*.xz;*.bz2;*.zip;*.tar;*.tgz")
 
     directory: bpy.props.StringProperty(subtype='DIR_PATH')
 
@@ -303,6 +401,9 @@ class ImportSequence(bpy.types.Operator, ImportHelper):
                 mss.dirPath = dirPath
                 mss.fileName = basenamePrefix
                 mss.perFrameMaterial = self.sequenceSettings.perFrameMaterial
+                mss.shareIdenticalFrames = self.sequenceSettings.shareIdenticalFrames
+                mss.useFrameCache = self.sequenceSettings.useFrameCache
+                mss.pointCloud = self.sequenceSettings.pointCloud is True and self.sequenceSettings.fileFormat in ('obj', 'ply')
                 mss.cacheMode = self.sequenceSettings.cacheMode
                 mss.fileFormat = self.sequenceSettings.fileFormat
                 mss.dirPathIsRelative = self.sequenceSettings.dirPathIsRelative
@@ -314,14 +415,28 @@ class ImportSequence(bpy.types.Operator, ImportHelper):
                 self.copyImportSettings(self.importSettings, mss.fileImporter)
 
                 meshCount = 0
+                splitObjects = self.sequenceSettings.splitObjects is True and mss.fileFormat == 'obj' and mss.pointCloud is False
 
                 # cached
                 if mss.cacheMode == 'cached':
-                    meshCount = loadSequenceFromMeshFiles(seqObj, mss.dirPath, mss.fileName)
+                    if splitObjects:
+                        meshCount = loadSplitSequenceFromMeshFiles(seqObj, mss.dirPath, mss.fileName)
+                    elif context.window is not None:
+                        # load the frames in the background, so Blender stays responsive and the import can be stopped
+                        # (ImportSequenceFrames names the sequence once it's done)
+                        mss.isImported = True
+                        bpy.ops.ms.import_sequence_frames('INVOKE_DEFAULT', objectName=seqObj.name)
+                        self.resetToDefaults()
+                        continue
+                    else:
+                        meshCount = loadSequenceFromMeshFiles(seqObj, mss.dirPath, mss.fileName)
 
                 # streaming
                 elif mss.cacheMode == 'streaming':
-                    meshCount = loadStreamingSequenceFromMeshFiles(seqObj, mss.dirPath, mss.fileName)
+                    if splitObjects:
+                        meshCount = loadSplitStreamingSequenceFromMeshFiles(seqObj, mss.dirPath, mss.fileName)
+                    else:
+                        meshCount = loadStreamingSequenceFromMeshFiles(seqObj, mss.dirPath, mss.fileName)
 
                 self.resetToDefaults()
 
@@ -331,9 +446,9 @@ class ImportSequence(bpy.types.Operator, ImportHelper):
                     self.report({'ERROR'}, "No matching files found. Make sure the Root Folder, File Name, and File Format are correct.")
                     return {'CANCELLED'}
                 
-                # get the name of the first mesh, remove trailing numbers and _ and .
-                firstMeshName = os.path.splitext(mss.meshNameArray[1].basename)[0].rstrip('._0123456789')
-                seqObj.name = createUniqueName(firstMeshName + '_sequence', bpy.data.objects)
+                # split sequences are named after their objects
+                if mss.splitObjectName == '':
+                    nameSequenceFromMeshes(seqObj)
                 seqObj.mesh_sequence_settings.isImported = True
             else:
                 # this filename prefix had no matching files
@@ -467,7 +582,13 @@ class SMO_PT_SequenceImportSettingsPanel(bpy.types.Panel):
         row.prop(op.sequenceSettings, "fileNamePrefix")
         col.prop(op.sequenceSettings, "cacheMode")
         col.prop(op.sequenceSettings, "perFrameMaterial")
+        col.prop(op.sequenceSettings, "shareIdenticalFrames")
+        col.prop(op.sequenceSettings, "useFrameCache")
         col.prop(op.sequenceSettings, "dirPathIsRelative")
+        if op.sequenceSettings.fileFormat in ('obj', 'ply'):
+            col.prop(op.sequenceSettings, "pointCloud")
+        if op.sequenceSettings.fileFormat == 'obj' and op.sequenceSettings.pointCloud is False:
+            col.prop(op.sequenceSettings, "splitObjects")
 
 
 def menu_func_import_sequence(self, context):
@@ -0,0 +1,154 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#   Stop motion OBJ: A Mesh sequence importer for Blender
+#   Copyright (C) 2016-2024  Justin Jensen
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Lightweight timing for the add-on's hot paths.
+# Each timed function or section keeps its most recent calls in a fixed-size ring buffer.
+# While timing is disabled, a timed call costs one extra function call and a flag check
+
+import csv
+import functools
+import json
+import time
+from collections import deque
+
+TIMING_BUFFER_SIZE = 1024
+
+timingEnabled = False
+
+# name -> deque of (start time, duration) in seconds
+timingBuffers = {}
+
+# The streaming cache's access trace: one record for every frame change of a Streaming sequence.
+# Saved traces can be replayed against other cache sizes and eviction policies with cache_simulator.py
+ACCESS_TRACE_FIELDS = ['object', 'frame', 'meshIdx', 'hit', 'loadSeconds', 'meshBytes']
+ACCESS_TRACE_SIZE = 1000000
+
+accessTraceEnabled = False
+accessTrace = deque(maxlen=ACCESS_TRACE_SIZE)
+
+
+def setTimingEnabled(enabled):
+    global timingEnabled
+    timingEnabled = enabled
+
+
+def recordTiming(name, startTime, duration):
+    timingBuffer = timingBuffers.get(name)
+    if timingBuffer is None:
+        timingBuffer = deque(maxlen=TIMING_BUFFER_SIZE)
+        timingBuffers[name] = timingBuffer
+    timingBuffer.append((startTime, duration))
+
+
+def clearTimings():
+    timingBuffers.clear()
+
+
+def timed(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if timingEnabled is False:
+                return func(*args, **kwargs)
+
+            startTime = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recordTiming(name, startTime, time.perf_counter() - startTime)
+        return wrapper
+    return decorator
+
+
+class timedSection:
+    """Time a block of code inside a function: with timedSection('importer'): ..."""
+
+    def __init__(self, name):
+        self.name = name
+        self.startTime = 0.0
+
+    def __enter__(self):
+        if timingEnabled is True:
+            self.startTime = time.perf_counter()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        if timingEnabled is True and self.startTime > 0.0:
+            recordTiming(self.name, self.startTime, time.perf_counter() - self.startTime)
+        return False
+
+
+def percentile(sortedValues, fraction):
+    if len(sortedValues) == 0:
+        return 0.0
+    return sortedValues[min(len(sortedValues) - 1, int(fraction * len(sortedValues)))]
+
+
+# returns a list of (name, number of calls, p50, p95), with durations in seconds
+def timingSummary():
+    summary = []
+    for name in sorted(timingBuffers.keys()):
+        durations = sorted(duration for startTime, duration in timingBuffers[name])
+        summary.append((name, len(durations), percentile(durations, 0.5), percentile(durations, 0.95)))
+    return summary
+
+
+# fileFormat is 'csv' or 'json'. If it's None, the file's extension decides
+def writeTimingTrace(filePath, fileFormat=None):
+    records = []
+    for name, timingBuffer in timingBuffers.items():
+        for startTime, duration in timingBuffer:
+            records.append({'name': name, 'start': startTime, 'duration': duration})
+    records.sort(key=lambda record: record['start'])
+
+    if fileFormat is None:
+        fileFormat = 'json' if filePath.lower().endswith('.json') else 'csv'
+
+    if fileFormat == 'json':
+        with open(filePath, 'w') as f:
+            json.dump(records, f, indent=1)
+    else:
+        with open(filePath, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['name', 'start', 'duration'])
+            writer.writeheader()
+            writer.writerows(records)
+
+    return len(records)
+
+
+def setAccessTraceEnabled(enabled):
+    global accessTraceEnabled
+    accessTraceEnabled = enabled
+
+
+def recordAccess(objectName, frameNum, meshIdx, hit, loadSeconds, meshBytes):
+    accessTrace.append((objectName, frameNum, meshIdx, 1 if hit else 0, loadSeconds, meshBytes))
+
+
+def clearAccessTrace():
+    accessTrace.clear()
+
+
+def writeAccessTrace(filePath):
+    with open(filePath, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(ACCESS_TRACE_FIELDS)
+        writer.writerows(accessTrace)
+    return len(accessTrace)
@@ -0,0 +1,166 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#   Stop motion OBJ: A Mesh sequence importer for Blender
+#   Copyright (C) 2016-2024  Justin Jensen
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Reading sequence files ahead of time, and directory metadata from a single scan. Nothing in here depends on bpy.
+# Blender's importers read files with lots of small reads, which is slow on network file systems. Reading the next files
+#   on a background thread, in large sequential chunks, gets them into the OS file cache before the importer opens them
+
+import collections
+import os
+import queue
+import threading
+import time
+
+READ_CHUNK_SIZE = 8 << 20
+
+# directory listings are rescanned when the directory changes, or when they get this old (in seconds)
+DIRECTORY_INDEX_MAX_AGE = 60.0
+
+# how many recently read files to remember, so the same file isn't read again right away
+RECENT_FILES_SIZE = 256
+
+readAheadQueue = queue.Queue()
+readAheadThread = None
+readAheadLock = threading.Lock()
+
+# files that are queued but haven't been read yet, and the files that were read most recently
+pendingFiles = set()
+recentFiles = collections.OrderedDict()
+
+# totals for everything the read-ahead thread has read, for reporting throughput
+readAheadStats = {'files': 0, 'bytes': 0, 'seconds': 0.0}
+
+# directory -> DirectoryIndex
+directoryIndexes = {}
+
+
+class DirectoryIndex:
+    """The names of the files in a directory, from a single scan.
+    Adding or removing files changes the directory's mtime, but rewriting one in place doesn't,
+    so this is only good for listing files. Anything that depends on a file's contents has to stat() the file itself"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.scanTime = time.monotonic()
+        self.mtime = os.stat(directory).st_mtime
+        self.fileNames = []
+        with os.scandir(directory) as dirEntries:
+            for dirEntry in dirEntries:
+                if dirEntry.is_file():
+                    self.fileNames.append(dirEntry.name)
+
+    def isCurrent(self):
+        if time.monotonic() - self.scanTime > DIRECTORY_INDEX_MAX_AGE:
+            return False
+        return os.stat(self.directory).st_mtime == self.mtime
+
+
+def getDirectoryIndex(directory):
+    index = directoryIndexes.get(directory)
+    if index is None or index.isCurrent() is False:
+        index = DirectoryIndex(directory)
+        directoryIndexes[directory] = index
+    return index
+
+
+def forgetDirectory(directory):
+    directoryIndexes.pop(directory, None)
+
+
+# the names of the files in a directory, or an empty list if it doesn't exist
+def listDirectory(directory):
+    try:
+        return getDirectoryIndex(directory).fileNames
+    except OSError:
+        return []
+
+
+# read a whole file in large sequential chunks and throw the data away. Returns the number of bytes read
+def readWholeFile(filePath, buffer):
+    fd = os.open(filePath, os.O_RDONLY)
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        numBytes = 0
+        with os.fdopen(fd, 'rb', buffering=0, closefd=False) as f:
+            while True:
+                numRead = f.readinto(buffer)
+                if not numRead:
+                    break
+                numBytes += numRead
+        return numBytes
+    finally:
+        os.close(fd)
+
+
+def readAheadWorker():
+    buffer = bytearray(READ_CHUNK_SIZE)
+    while True:
+        filePath = readAheadQueue.get()
+        startTime = time.perf_counter()
+        try:
+            numBytes = readWholeFile(filePath, buffer)
+        except OSError:
+            # e.g. frames inside an archive, which aren't files of their own
+            numBytes = -1
+        duration = time.perf_counter() - startTime
+
+        with readAheadLock:
+            pendingFiles.discard(filePath)
+            recentFiles[filePath] = True
+            if len(recentFiles) > RECENT_FILES_SIZE:
+                recentFiles.popitem(last=False)
+            if numBytes >= 0:
+                readAheadStats['files'] += 1
+                readAheadStats['bytes'] += numBytes
+                readAheadStats['seconds'] += duration
+        readAheadQueue.task_done()
+
+
+# Queue files to be read on the background thread. Files that are already queued or were just read are skipped
+def readAheadFiles(filePaths):
+    global readAheadThread
+    if readAheadThread is None or readAheadThread.is_alive() is False:
+        readAheadThread = threading.Thread(target=readAheadWorker, daemon=True)
+        readAheadThread.start()
+
+    with readAheadLock:
+        for filePath in filePaths:
+            if filePath in pendingFiles or filePath in recentFiles:
+                continue
+            pendingFiles.add(filePath)
+            readAheadQueue.put(filePath)
+
+
+# returns (MB/s, number of files) for everything read ahead so far
+def readAheadThroughput():
+    with readAheadLock:
+        seconds = readAheadStats['seconds']
+        megabytesPerSecond = readAheadStats['bytes'] / seconds / 1e6 if seconds > 0.0 else 0.0
+        return megabytesPerSecond, readAheadStats['files']
+
+
+def clearReadAheadStats():
+    with readAheadLock:
+        readAheadStats['files'] = 0
+        readAheadStats['bytes'] = 0
+        readAheadStats['seconds'] = 0.0
+        recentFiles.clear()
@@ -0,0 +1,229 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#   Stop motion OBJ: A Mesh sequence importer for Blender
+#   Copyright (C) 2016-2024  Justin Jensen
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Finding the files that make up a sequence.
+# Nothing in here depends on bpy, so it can also be used from the command-line tools
+
+import bz2
+import fnmatch
+import gzip
+import hashlib
+import lzma
+import os
+import re
+import tarfile
+import time
+import zipfile
+
+if __package__:
+    from . import read_ahead
+else:
+    import read_ahead
+
+# a sequence's folder can also be one of these archives; its frames are read straight out of it
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.xz', '.txz', '.tar.bz2', '.tbz2')
+
+# frames can be compressed individually (e.g. frame_001.obj.gz)
+COMPRESSED_EXTENSIONS = {
+    '.gz': gzip.open,
+    '.xz': lzma.open,
+    '.bz2': bz2.open
+}
+
+# archive path -> SequenceArchive. Archives stay open so their member list works as an index
+openArchives = {}
+
+
+def alphanumKey(string):
+    """ Turn a string into a list of string and number chunks.
+        "z23a" -> ["z", 23, "a"]
+    """
+    return [int(c) if c.isdigit() else c for c in re.split('([0-9]+)', string)]
+
+
+class SequenceArchive:
+    """An open zip or tar file, with the names of the files in it"""
+
+    def __init__(self, archivePath):
+        self.path = archivePath
+        self.mtime = os.stat(archivePath).st_mtime
+        if zipfile.is_zipfile(archivePath):
+            self.zipFile = zipfile.ZipFile(archivePath)
+            self.tarFile = None
+            self.memberNames = [info.filename for info in self.zipFile.infolist() if not info.filename.endswith('/')]
+        else:
+            self.zipFile = None
+            self.tarFile = tarfile.open(archivePath)
+            self.memberNames = [member.name for member in self.tarFile.getmembers() if member.isfile()]
+
+    def open(self, memberName):
+        if self.zipFile is not None:
+            return self.zipFile.open(memberName)
+        return self.tarFile.extractfile(memberName)
+
+    # (size, modification time in nanoseconds) of a file in the archive
+    def memberStamp(self, memberName):
+        if self.zipFile is not None:
+            info = self.zipFile.getinfo(memberName)
+            return info.file_size, int(time.mktime(info.date_time + (0, 0, -1))) * 1000000000
+        member = self.tarFile.getmember(memberName)
+        return member.size, int(member.mtime) * 1000000000
+
+    def close(self):
+        if self.zipFile is not None:
+            self.zipFile.close()
+        else:
+            self.tarFile.close()
+
+
+def isArchivePath(path):
+    return path.lower().endswith(ARCHIVE_EXTENSIONS) and os.path.isfile(path)
+
+
+def getArchive(archivePath):
+    archive = openArchives.get(archivePath)
+    if archive is not None and archive.mtime != os.stat(archivePath).st_mtime:
+        # the archive was replaced, so its index is out of date
+        archive.close()
+        archive = None
+    if archive is None:
+        archive = SequenceArchive(archivePath)
+        openArchives[archivePath] = archive
+    return archive
+
+
+def closeArchives():
+    for archive in openArchives.values():
+        archive.close()
+    openArchives.clear()
+
+
+# "shots/seq.zip/frame_001.obj" -> ("shots/seq.zip", "frame_001.obj"), or (None, None) if the path isn't inside an archive
+def splitArchivePath(path):
+    parts = os.path.normpath(path).split(os.sep)
+    # check the names first so that ordinary paths don't cost any stat() calls
+    for i in range(len(parts) - 1, 0, -1):
+        if parts[i - 1].lower().endswith(ARCHIVE_EXTENSIONS):
+            archivePath = os.sep.join(parts[:i])
+            if os.path.isfile(archivePath):
+                return archivePath, '/'.join(parts[i:])
+    return None, None
+
+
+def compressionOpener(path):
+    return COMPRESSED_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+# archived and compressed frames can't be handed to Blender's importers, which need a real file
+def needsNativeReader(path):
+    return compressionOpener(path) is not None or splitArchivePath(path)[0] is not None
+
+
+# the file name without its compression and format extensions: "frame_001.obj.gz" -> "frame_001"
+def sequenceFileStem(path):
+    basename = os.path.basename(path)
+    if compressionOpener(basename) is not None:
+        basename = os.path.splitext(basename)[0]
+    return os.path.splitext(basename)[0]
+
+
+# open a sequence file for reading (in binary mode), whether it's a normal file, compressed, or inside an archive
+def openSequenceFile(path):
+    opener = compressionOpener(path)
+    archivePath, memberName = splitArchivePath(path)
+    if archivePath is not None:
+        memberFile = getArchive(archivePath).open(memberName)
+        return opener(memberFile) if opener is not None else memberFile
+    return opener(path, 'rb') if opener is not None else open(path, 'rb')
+
+
+# return the absolute paths of every file in the sequence, in playback order
+# directory may be (or be inside) a zip or tar archive, and each file may be compressed
+def listSequenceFiles(directory, filePrefix, fileExtension):
+    patterns = [filePrefix + '*.' + fileExtension] + [filePrefix + '*.' + fileExtension + ext for ext in COMPRESSED_EXTENSIONS]
+
+    if isArchivePath(directory):
+        archivePath, innerDir = directory, ''
+    else:
+        archivePath, innerDir = splitArchivePath(directory)
+
+    if archivePath is not None:
+        files = []
+        for memberName in getArchive(archivePath).memberNames:
+            memberDir, memberBasename = memberName.rpartition('/')[0::2]
+            if memberDir == innerDir and any(fnmatch.fnmatchcase(memberBasename, pattern) for pattern in patterns):
+                files.append(os.path.join(directory, memberBasename))
+        return sorted(files, key=alphanumKey)
+
+    # one scan of the folder for every pattern. Like glob, leave out hidden files unless the prefix asks for them
+    files = []
+    for fileName in read_ahead.listDirectory(directory):
+        if fileName.startswith('.') and not filePrefix.startswith('.'):
+            continue
+        if any(fnmatch.fnmatch(fileName, pattern) for pattern in patterns):
+            files.append(os.path.join(directory, fileName))
+    return sorted(files, key=alphanumKey)
+
+
+# "size:mtime" for a sequence file, so an import can tell which files have changed since they were loaded
+def fileStamp(path):
+    archivePath, memberName = splitArchivePath(path)
+    if archivePath is not None:
+        size, mtime = getArchive(archivePath).memberStamp(memberName)
+    else:
+        stat = os.stat(path)
+        size, mtime = stat.st_size, stat.st_mtime_ns
+    return '%d:%d' % (size, mtime)
+
+
+# the size of a sequence file (or archive member) in bytes, as stored
+def fileSize(path):
+    archivePath, memberName = splitArchivePath(path)
+    if archivePath is not None:
+        return getArchive(archivePath).memberStamp(memberName)[0]
+    return os.stat(path).st_size
+
+
+# Hash the files that could be byte-identical to another file in the list. Files can only match one of the same size,
+#   so files with a size of their own aren't read at all. Returns {path: digest}
+# When files are being added to ones that were loaded before, newPaths limits the hashing to the sizes that include a new
+#   file, and knownDigests ({path: digest}) saves re-reading the files that were already hashed
+def duplicateCandidateDigests(filePaths, newPaths=None, knownDigests=None):
+    newPaths = set(filePaths if newPaths is None else newPaths)
+    knownDigests = {} if knownDigests is None else knownDigests
+    pathsBySize = {}
+    for path in filePaths:
+        pathsBySize.setdefault(fileSize(path), []).append(path)
+
+    digests = {}
+    for paths in pathsBySize.values():
+        if len(paths) > 1 and any(path in newPaths for path in paths):
+            for path in paths:
+                digests[path] = knownDigests.get(path) or fileDigest(path)
+    return digests
+
+
+# hash a file's bytes, so that byte-identical frames (e.g. stop-motion holds) can share one mesh
+def fileDigest(filePath, chunkSize=1 << 20):
+    digest = hashlib.sha1()
+    with openSequenceFile(filePath) as f:
+        for chunk in iter(lambda: f.read(chunkSize), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,170 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#   Stop motion OBJ: A Mesh sequence importer for Blender
+#   Copyright (C) 2016-2024  Justin Jensen
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# A decoded-frame cache shared by every Blender process on the machine (e.g. several render instances working on one shot).
+# Entries use the frame cache format from mesh_readers.py and live in /dev/shm when it exists, so they're in RAM.
+# The first process to need a frame decodes it and writes the entry; the others map the entry instead of parsing the file.
+# Nothing in here depends on bpy
+
+import contextlib
+import hashlib
+import os
+import tempfile
+
+if __package__:
+    from . import mesh_readers
+else:
+    import mesh_readers
+
+# file locks are only available on Unix. Without them, two processes may both decode a frame, but the atomic
+#   replace in writeFrameCache still means nobody sees a half-written entry
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+SHARED_CACHE_DIRNAME = 'stop_motion_obj_frames'
+
+# /dev/shm is a RAM disk, so the entries take memory. Once they add up to more than this, the oldest are removed
+SHARED_CACHE_MAX_BYTES = 8 << 30
+
+# how many entries to write between checks of the cache's size
+TRIM_INTERVAL = 16
+
+numWritesSinceTrim = 0
+
+# (number of entries, total bytes) from the last time the cache was scanned, or None. Scanning stats every entry,
+#   so the UI shows this instead of scanning on every redraw
+lastUsage = None
+
+
+def sharedCacheDir():
+    baseDir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(baseDir, SHARED_CACHE_DIRNAME)
+
+
+# An entry is named after the source file, the file's "size:mtime" stamp (see sequence_files.fileStamp), and anything else
+#   that changes the decoded result (e.g. the file format and merge distance), so a changed file never matches an old entry
+def entryPath(sourcePath, stamp, variant=''):
+    key = '\0'.join((os.path.abspath(sourcePath), stamp, variant))
+    return os.path.join(sharedCacheDir(), hashlib.sha1(key.encode('utf-8')).hexdigest() + mesh_readers.FRAME_CACHE_EXTENSION)
+
+
+def mapEntry(path, name=''):
+    try:
+        return mesh_readers.mapFrameCache(path, name)
+    except (OSError, ValueError):
+        return None
+
+
+# hold an exclusive lock on an entry while it's being decoded, so that the other processes wait for it instead of
+#   decoding the same file themselves
+@contextlib.contextmanager
+def lockedEntry(path):
+    if fcntl is None:
+        yield
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.lock', 'wb') as lockFile:
+        fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lockFile.fileno(), fcntl.LOCK_UN)
+
+
+# Returns the decoded MeshData for an entry, calling decode() to make it if no process has yet.
+# decode() may return None if the frame can't be decoded here, in which case nothing is stored
+def getOrDecode(path, decode, name=''):
+    meshData = mapEntry(path, name)
+    if meshData is not None:
+        return meshData
+
+    with lockedEntry(path):
+        # another process may have written it while we waited for the lock
+        meshData = mapEntry(path, name)
+        if meshData is not None:
+            return meshData
+
+        meshData = decode()
+        if meshData is None:
+            return None
+        try:
+            mesh_readers.writeFrameCache(path, meshData)
+        except OSError:
+            # e.g. the RAM disk is full; the frame is still usable, it just isn't shared
+            return meshData
+
+    global numWritesSinceTrim
+    numWritesSinceTrim += 1
+    if numWritesSinceTrim >= TRIM_INTERVAL:
+        numWritesSinceTrim = 0
+        trimSharedCache()
+    return meshData
+
+
+# remove the least recently written entries until the cache fits in maxBytes
+# (processes that still have an entry mapped keep their copy until they're done with it)
+def trimSharedCache(maxBytes=SHARED_CACHE_MAX_BYTES, cacheDir=None):
+    cacheDir = sharedCacheDir() if cacheDir is None else cacheDir
+    try:
+        with os.scandir(cacheDir) as dirEntries:
+            entries = [(dirEntry.stat().st_mtime, dirEntry.stat().st_size, dirEntry.path) for dirEntry in dirEntries
+                       if dirEntry.name.endswith(mesh_readers.FRAME_CACHE_EXTENSION)]
+    except OSError:
+        return 0
+
+    totalBytes = sum(size for mtime, size, path in entries)
+    numRemoved = 0
+    for mtime, size, path in sorted(entries):
+        if totalBytes <= maxBytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        with contextlib.suppress(OSError):
+            os.remove(path + '.lock')
+        totalBytes -= size
+        numRemoved += 1
+
+    global lastUsage
+    lastUsage = (len(entries) - numRemoved, totalBytes)
+    return numRemoved
+
+
+# returns (number of entries, total bytes), and remembers them in lastUsage
+def sharedCacheUsage(cacheDir=None):
+    cacheDir = sharedCacheDir() if cacheDir is None else cacheDir
+    numEntries = 0
+    totalBytes = 0
+    try:
+        with os.scandir(cacheDir) as dirEntries:
+            for dirEntry in dirEntries:
+                if dirEntry.name.endswith(mesh_readers.FRAME_CACHE_EXTENSION):
+                    numEntries += 1
+                    totalBytes += dirEntry.stat().st_size
+    except OSError:
+        pass
+
+    global lastUsage
+    lastUsage = (numEntries, totalBytes)
+    return numEntries, totalBytes
@@ -19,13 +19,26 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+import array
+import bisect
 import math
 import os
 import re
-import glob
+import struct
+import uuid
 from bpy.app.handlers import persistent
+from bpy_extras.io_utils import ExportHelper, axis_conversion
+from bpy_extras.object_utils import world_to_camera_view
+from mathutils import Matrix, Vector
 import time
 from .version import *
+from .sequence_files import alphanumKey, listSequenceFiles, duplicateCandidateDigests, fileStamp, needsNativeReader, sequenceFileStem
+from . import mesh_readers
+from . import mesh_ops
+from . import read_ahead
+from . import shared_cache
+from . import cache_tuning
+from . import profiling
 
 # global variables
 storedUseLockInterface = False
@@ -34,6 +47,40 @@ loadingSequenceLock = False
 inRenderMode = False
 lockFrameSwitch = False
 
+# frame -> mesh index lookup tables, keyed by object name (see getFrameLookupTable)
+frameLookupTables = {}
+
+# render schedules for streaming sequences with Render Pre-warm enabled, keyed by object name
+# these are built in renderInitHandler and thrown away when the render stops
+renderSchedules = {}
+
+# owner of the message bus subscription that swaps proxies out for editing (see handleObjectModeChange)
+modeChangeOwner = object()
+swappingProxiesForEditing = False
+
+# MeshReferenceIndex for each sequence, keyed by object name (see getMeshReferenceIndex)
+meshReferenceIndexes = {}
+
+# cache_tuning.CacheTuner for each streaming sequence with Auto Cache Size enabled, keyed by object name
+cacheTuners = {}
+
+# material digest -> name of the material that was imported first with that definition
+materialsByDigest = {}
+
+# .mtl path -> (modification time, {material name: digest})
+mtlDigestCache = {}
+
+# how many files ahead of the current one the Cached loader reads in the background
+LOADER_READ_AHEAD = 4
+
+# ImportSequenceFrames loads frames for this many seconds at a time, then lets Blender redraw and handle input
+LOADER_TIME_SLICE = 0.1
+LOADER_TIMER_INTERVAL = 0.01
+
+# meshes that Drop Frames playback skipped and still needs to load: object name -> mesh index
+# only the most recently requested mesh of each object is kept; older requests are already out of date
+pendingStreamedMeshes = {}
+
 def convertOldToNewAxisStr(oldAxisStr):
     if oldAxisStr == '-X':
         return 'NEGATIVE_X'
@@ -44,12 +91,6 @@ def convertOldToNewAxisStr(oldAxisStr):
     else:
         return oldAxisStr
 
-def alphanumKey(string):
-    """ Turn a string into a list of string and number chunks.
-        "z23a" -> ["z", 23, "a"]
-    """
-    return [int(c) if c.isdigit() else c for c in re.split('([0-9]+)', string)]
-
 def clamp(value, minVal, maxVal):
     return max(minVal, min(value, maxVal))
 
@@ -62,6 +103,7 @@ def deselectAll():
         ob.select_set(state=False)
 
 @persistent
+@profiling.timed('checkMeshChangesFrameChangePre')
 def checkMeshChangesFrameChangePre(scene):
     global inRenderMode
     if inRenderMode == True:
@@ -92,7 +134,8 @@ def checkMeshChangesFrameChangePre(scene):
         return
     
     # generate the mesh hash for the current mesh (just before the frame switches)
-    meshHashStr = getMeshHashStr(obj.data)
+    with profiling.timedSection('getMeshHashStr'):
+        meshHashStr = getMeshHashStr(obj.data)
 
     # if the generated mesh hash does not match the mesh's stored hash
     # for some reason we also have to check whether the meshHash has not been calculated yet
@@ -123,7 +166,8 @@ def checkMeshChangesFrameChangePre(scene):
         selectOnly(obj)
 
         # actually export the file
-        mss.fileImporter.export(mss.fileFormat, filename)
+        with profiling.timedSection('exporter'):
+            mss.fileImporter.export(mss.fileFormat, filename)
 
         # show an unobtrusive message that the mesh has been exported
         msg = "Mesh exported: " + filename
@@ -135,6 +179,11 @@ def checkMeshChangesFrameChangePre(scene):
 
 
 def showError(message=""):
+    # there are no windows to show a popup in when Blender is running in the background
+    if bpy.app.background:
+        print("Stop Motion OBJ Error: " + message)
+        return
+
     def draw(self, context):
         self.layout.label(text=message)
     bpy.context.window_manager.popup_menu(draw, title='Stop Motion OBJ Error', icon='ERROR')
@@ -247,6 +296,7 @@ def lockLoadingSequence(lock):
 
 # set the frame number for all mesh sequence objects
 @persistent
+@profiling.timed('updateFrame')
 def updateFrame(scene):
     global lockFrameSwitch
     if lockFrameSwitch is True:
@@ -267,6 +317,8 @@ def renderInitHandler(scene):
     forceMeshLoad = True
     global inRenderMode
     inRenderMode = True
+    prewarmStreamingSequences(scene)
+    swapProxiesForRender(scene)
 
 
 @persistent
@@ -286,6 +338,129 @@ def renderStopped():
     forceMeshLoad = False
     global inRenderMode
     inRenderMode = False
+    renderSchedules.clear()
+    swapProxiesForRender(bpy.context.scene)
+
+
+# the frame doesn't necessarily change when a render starts or stops (e.g. rendering a still),
+#   so swap between proxies and full-resolution meshes right away
+def swapProxiesForRender(scene):
+    if any(obj.mesh_sequence_settings.useProxies is True for obj in bpy.data.objects):
+        setFrameNumber(scene.frame_current)
+
+
+# figure out exactly which mesh will be shown on each frame of the render, and the last frame each mesh is needed
+#   (instances show the same meshes on other frames, so their frames are merged into the schedule)
+def buildRenderSchedule(obj, scene):
+    renderFrames = list(range(scene.frame_start, scene.frame_end + 1, max(scene.frame_step, 1)))
+    scheduled = [(frameNum, getMeshIdxFromFrameNumber(obj, frameNum)) for frameNum in renderFrames]
+    for instance in getSequenceInstances(obj):
+        instance.mesh_sequence_settings.numMeshes = obj.mesh_sequence_settings.numMeshes
+        scheduled += [(frameNum, getMeshIdxFromFrameNumber(instance, frameNum)) for frameNum in renderFrames]
+    scheduled.sort(key=lambda frameAndIdx: frameAndIdx[0])
+
+    frames = [frameNum for frameNum, idx in scheduled]
+    meshIdxs = [idx for frameNum, idx in scheduled]
+    lastUse = {}
+    # every frame each mesh is shown on, in order, so the next use of a mesh is a binary search away
+    useFrames = {}
+    for frameNum, idx in zip(frames, meshIdxs):
+        # index 0 is the empty mesh, which is always in memory
+        if idx > 0:
+            lastUse[idx] = frameNum
+            idxFrames = useFrames.setdefault(idx, [])
+            if len(idxFrames) == 0 or idxFrames[-1] != frameNum:
+                idxFrames.append(frameNum)
+
+    return {'frames': frames, 'meshIdxs': meshIdxs, 'lastUse': lastUse, 'useFrames': useFrames, 'readAhead': set()}
+
+
+# the next frame after frameNum that the render shows a mesh on, or infinity if it's never shown again
+def nextScheduledUse(schedule, idx, frameNum):
+    idxFrames = schedule['useFrames'].get(idx)
+    if idxFrames is None:
+        return math.inf
+    nextPos = bisect.bisect_right(idxFrames, frameNum)
+    return idxFrames[nextPos] if nextPos < len(idxFrames) else math.inf
+
+
+def prewarmStreamingSequences(scene):
+    renderSchedules.clear()
+    for obj in bpy.data.objects:
+        mss = obj.mesh_sequence_settings
+        if mss.initialized is False or mss.loaded is False or mss.instanceOf is not None:
+            continue
+        if mss.cacheMode != 'streaming' or mss.renderPrewarm is False:
+            continue
+
+        schedule = buildRenderSchedule(obj, scene)
+        renderSchedules[obj.name] = schedule
+
+        # remove any cached meshes that won't appear anywhere in the render range
+        for idx in range(1, len(mss.meshNameArray)):
+            meshProp = mss.meshNameArray[idx]
+            # (the mesh on screen may be its proxy, so compare indices instead of mesh names)
+            if meshProp.inMemory is True and idx not in schedule['lastUse'] and idx != mss.curVisibleMeshIdx:
+                removeMeshFromCache(obj, idx)
+
+        queueRenderReadAhead(obj, schedule, scene.frame_current)
+
+
+def queueRenderReadAhead(obj, schedule, frameNum):
+    mss = obj.mesh_sequence_settings
+    absDirectory = bpy.path.abspath(mss.dirPath)
+    filePaths = []
+    # (the schedule is sorted by frame, so skip straight past the frames that are done)
+    start = bisect.bisect_right(schedule['frames'], frameNum)
+    for idx in schedule['meshIdxs'][start:]:
+        if len(filePaths) >= mss.renderReadAhead:
+            break
+        if idx <= 0 or idx in schedule['readAhead']:
+            continue
+        if mss.meshNameArray[idx].inMemory is True:
+            continue
+
+        schedule['readAhead'].add(idx)
+        filePaths.append(os.path.join(absDirectory, mss.meshNameArray[idx].basename))
+
+    if len(filePaths) > 0:
+        read_ahead.readAheadFiles(filePaths)
+
+
+# during playback, start reading the files for the next few frames so they're in the OS file cache when they're needed
+def queuePlaybackReadAhead(obj, frameNum):
+    mss = obj.mesh_sequence_settings
+    absDirectory = bpy.path.abspath(mss.dirPath)
+    filePaths = []
+    for nextFrame in range(frameNum + 1, frameNum + 1 + mss.playbackReadAhead):
+        idx = getMeshIdxFromFrameNumber(obj, nextFrame)
+        if idx > 0 and mss.meshNameArray[idx].inMemory is False:
+            filePaths.append(os.path.join(absDirectory, mss.meshNameArray[idx].basename))
+
+    if len(filePaths) > 0:
+        read_ahead.readAheadFiles(filePaths)
+
+
+# remove the meshes that the rest of the render will never show again
+def evictFinishedRenderMeshes(obj, schedule, frameNum, currentMeshIdx, instances=None):
+    mss = obj.mesh_sequence_settings
+    idxsInUse = getMeshIdxsInUse(obj, currentMeshIdx, instances)
+    finishedIdxs = [idx for idx, lastFrame in schedule['lastUse'].items() if lastFrame < frameNum and idx not in idxsInUse]
+    for idx in finishedIdxs:
+        del schedule['lastUse'][idx]
+        if mss.meshNameArray[idx].inMemory is True:
+            removeMeshFromCache(obj, idx)
+
+
+# when the render schedule is known, the best mesh to remove is the one whose next use is furthest away
+def nextScheduledMeshToDelete(obj, schedule, frameNum, currentMeshIdx, instances=None):
+    mss = obj.mesh_sequence_settings
+    idxsInUse = getMeshIdxsInUse(obj, currentMeshIdx, instances)
+    candidates = [idx for idx in range(1, len(mss.meshNameArray)) if idx not in idxsInUse and mss.meshNameArray[idx].inMemory is True]
+    if len(candidates) == 0:
+        return -1
+
+    return max(candidates, key=lambda idx: nextScheduledUse(schedule, idx, frameNum))
 
 
 @persistent
@@ -296,7 +471,7 @@ def makeDirPathsRelative(scene):
 
     for obj in bpy.data.objects:
         mss = obj.mesh_sequence_settings
-        if mss.initialized is True and mss.loaded is True:
+        if mss.initialized is True and mss.loaded is True and mss.instanceOf is None:
             # if any are using relative paths that have not yet been relative-ized, then relative-ize them
             if mss.dirPathIsRelative is True and mss.dirPathNeedsRelativizing is True:
                 newRelPath = bpy.path.relpath(mss.dirPath)
@@ -322,25 +497,57 @@ def handleAutoExportChange(self, context):
             obj.data.meshHash = meshHashStr
 
 
+# runs every time the "Drop Frames" checkbox is changed
+def handleDropFramesChange(self, context):
+    self.numDroppedFrames = 0
+    return None
+
+
+# runs every time the proxy settings change
+def handleProxySettingsChange(self, context):
+    updateFrame(0)
+    return None
+
+
 # runs every time the cache size changes
 def resizeCache(self, context):
     obj = context.object
     mss = obj.mesh_sequence_settings
 
+    # with Auto Cache Size, the cache size is only where tuning starts
+    if mss.autoCacheSize is True:
+        handleAutoCacheSizeChange(self, context)
+        return None
+
     # if the cache size was changed to zero, we don't want to resize it
     if mss.cacheSize == 0:
         return None
 
-    numMeshesToRemove = mss.numMeshesInMemory - mss.cacheSize
-    for i in range(numMeshesToRemove):
-        currentMeshIdx = getMeshIdxFromMeshKey(obj, obj.data.name)
-        idxToDelete = nextCachedMeshToDelete(obj, currentMeshIdx)
-        if idxToDelete >= 0:
-            removeMeshFromCache(obj, idxToDelete)
+    # (stops early if everything left is on screen, rather than removing the empty mesh)
+    trimStreamingCache(obj, context.scene.frame_current, mss.curVisibleMeshIdx, None)
+    return None
+
 
+# runs every time Auto Cache Size is turned on or off, or its starting size changes
+def handleAutoCacheSizeChange(self, context):
+    obj = context.object
+    mss = obj.mesh_sequence_settings
+    cacheTuners.pop(obj.name, None)
+    if mss.autoCacheSize is True:
+        # start from the cache size, or from what's loaded now if the cache size is unlimited
+        startSize = mss.cacheSize if mss.cacheSize > 0 else mss.numMeshesInMemory
+        mss.effectiveCacheSize = max(startSize, cache_tuning.MIN_CACHE_SIZE)
+        trimStreamingCache(obj, context.scene.frame_current, mss.curVisibleMeshIdx, None)
     return None
 
 
+# the number of meshes a streaming sequence may keep in memory (0 means all of them)
+def getStreamingCacheSize(mss):
+    if mss.autoCacheSize is True:
+        return mss.effectiveCacheSize
+    return mss.cacheSize
+
+
 def getMeshIdxFromMeshKey(obj, meshKey):
     for idx, meshNameItem in enumerate(obj.mesh_sequence_settings.meshNameArray):
         if meshNameItem.key == meshKey:
@@ -349,9 +556,7 @@ def getMeshIdxFromMeshKey(obj, meshKey):
     return -1
 
 def countMatchingFiles(_directory, _filePrefix, _fileExtension):
-    full_filepath = os.path.join(_directory, _filePrefix + '*.' + _fileExtension)
-    files = glob.glob(full_filepath)
-    return len(files)
+    return len(listSequenceFiles(_directory, _filePrefix, _fileExtension))
 
 
 def fileExtensionFromType(_type):
@@ -389,7 +594,7 @@ class MeshImporter(bpy.types.PropertyGroup):
     obj_use_edges: bpy.props.BoolProperty(name="Lines", description="Import lines and faces with 2 verts as edge", default=True)
     obj_use_smooth_groups: bpy.props.BoolProperty(name="Smooth Groups", description="Surround smooth groups by sharp edges", default=True)
 
-    # There will come a day when we'll support multi-object sequences. But it is not this day.
+    # Multi-object sequences are chosen with SequenceImportSettings.splitObjects and passed to load() directly
     # obj_use_split_objects: bpy.props.BoolProperty(name="Object", description="Import OBJ Objects into Blender Objects", default=True)
     # obj_use_split_groups: bpy.props.BoolProperty(name="Group", description="Import OBJ Groups into Blender Objects", default=False)
     # obj_split_mode: bpy.props.EnumProperty(
@@ -461,9 +666,9 @@ class MeshImporter(bpy.types.PropertyGroup):
     def draw(self):
         pass
 
-    def load(self, fileType, filePath, streaming=False):
+    def load(self, fileType, filePath, streaming=False, splitObjects=False):
         if fileType == 'obj':
-            self.loadOBJ(filePath, streaming)
+            self.loadOBJ(filePath, streaming, splitObjects)
         elif fileType == 'stl':
             self.loadSTL(filePath)
         elif fileType == 'ply':
@@ -489,7 +694,7 @@ class MeshImporter(bpy.types.PropertyGroup):
         #   (the OBJ exporter likes to switch to Object mode during the export)
         bpy.ops.object.mode_set(mode=contextMode)
 
-    def loadOBJ(self, filePath, streaming=False):
+    def loadOBJ(self, filePath, streaming=False, splitObjects=False):
         if bpy.app.version >= (4, 0, 0):
             showError("This version of Stop Motion OBJ doesn't support Blender 4.0")
         elif bpy.app.version < (2, 92, 0):
@@ -505,7 +710,7 @@ class MeshImporter(bpy.types.PropertyGroup):
                 clamp_size=self.obj_clamp_size,
                 forward_axis=newForwardAxisStr,
                 up_axis=newUpAxisStr,
-                use_split_objects=False,
+                use_split_objects=splitObjects,
                 use_split_groups=False)
         # if we are streaming or we're running an older version of Blender, use the legacy OBJ importer
         elif bpy.app.version < (3, 3, 0) or streaming is True:
@@ -514,7 +719,9 @@ class MeshImporter(bpy.types.PropertyGroup):
                 use_edges=self.obj_use_edges,
                 use_groups_as_vgroups=self.obj_import_vertex_groups,
                 use_image_search=self.obj_use_image_search,
-                split_mode="OFF",
+                use_split_objects=splitObjects,
+                use_split_groups=False,
+                split_mode="ON" if splitObjects else "OFF",
                 global_clamp_size=self.obj_clamp_size,
                 axis_forward=self.axis_forward,
                 axis_up=self.axis_up)
@@ -622,9 +829,25 @@ class MeshNameProp(bpy.types.PropertyGroup):
     key: bpy.props.StringProperty()
     basename: bpy.props.StringProperty()
     inMemory: bpy.props.BoolProperty(default=False)
+    # SHA-1 of the source file. Frames with the same hash share one mesh (see shareIdenticalFrames)
+    contentHash: bpy.props.StringProperty()
+    # "size:mtime" of the source file when it was loaded, so a resumed import knows which files are done (see fileStamp)
+    fileStamp: bpy.props.StringProperty()
+    # the frame's bounding box (in object space), from its frame cache or from the mesh once it's loaded
+    hasBounds: bpy.props.BoolProperty(default=False)
+    bboxMin: bpy.props.FloatVectorProperty(size=3)
+    bboxMax: bpy.props.FloatVectorProperty(size=3)
 
 
 class MeshSequenceSettings(bpy.types.PropertyGroup):
+    # for multi-object sequences: the name of the object (in each mesh file) that this sequence shows,
+    #   and an ID shared by all of the sequences that were imported from the same files
+    splitObjectName: bpy.props.StringProperty(name="Object Name")
+    splitGroup: bpy.props.StringProperty()
+
+    # for instances: the sequence whose meshes this object shows, using its own start frame, speed, and frame mode
+    instanceOf: bpy.props.PointerProperty(type=bpy.types.Object)
+
     isImported: bpy.props.BoolProperty(
         name="Sequence Is Imported",
         description="Whether the sequence was loaded from files on disk (True), or created in Blender (False)",
@@ -652,6 +875,23 @@ class MeshSequenceSettings(bpy.types.PropertyGroup):
         name='Material per Frame',
         default=False)
 
+    shareIdenticalFrames: bpy.props.BoolProperty(
+        name='Share Identical Frames',
+        description="Frames whose files are byte-for-byte identical (e.g. stop-motion holds) use the same mesh. Files of the same size are read an extra time while importing to find them",
+        default=False)
+
+    # whether to load frames from the batch converter's frame caches (see batch_convert.py)
+    useFrameCache: bpy.props.BoolProperty(
+        name='Use Frame Caches',
+        description="Build frames from the batch converter's frame caches (.smo_cache) when they are newer than the source files, instead of running the importer. Frame caches hold only positions and faces, so UVs, normals, and per-face materials are lost, and they don't follow the importer settings",
+        default=False)
+
+    # vertex-only frames (e.g. LiDAR scans or particles): positions and per-point attributes, with no faces or materials
+    pointCloud: bpy.props.BoolProperty(
+        name='Point Cloud',
+        description="Load only the points of each OBJ/PLY file, with their color, radius, and velocity attributes. Faces and materials are skipped",
+        default=False)
+
     # Whether to load the entire sequence into memory or to load meshes on-demand
     cacheMode: bpy.props.EnumProperty(
         items=[('cached', 'Cached', 'The full sequence is loaded into memory and saved in the .blend file'),
@@ -724,12 +964,104 @@ class MeshSequenceSettings(bpy.types.PropertyGroup):
         description='The maximum number of meshes to keep in memory. If >1, meshes will be removed from memory as new ones are loaded. If 0, all meshes will be kept.',
         update=resizeCache)
 
+    # whether to pick the cache size from measured load times and the available memory while the sequence plays
+    autoCacheSize: bpy.props.BoolProperty(
+        name='Auto Cache Size',
+        description='Grow the cache while loading meshes holds up playback, and shrink it again when it does not, without using more than the Memory Ceiling. Cache Size is where it starts',
+        default=False,
+        update=handleAutoCacheSizeChange)
+
+    targetStallRate: bpy.props.FloatProperty(
+        name='Target Stall Rate',
+        min=0.0,
+        max=1.0,
+        subtype='FACTOR',
+        description='The share of frame changes that may wait for a mesh to load for longer than a frame lasts',
+        default=0.05)
+
+    memoryCeiling: bpy.props.FloatProperty(
+        name='Memory Ceiling',
+        min=0.05,
+        max=1.0,
+        subtype='FACTOR',
+        description="The largest share of the system's available memory that the cache may use",
+        default=0.5)
+
+    # the cache size Auto Cache Size picked most recently
+    effectiveCacheSize: bpy.props.IntProperty(
+        name='Effective Cache Size',
+        default=cache_tuning.MIN_CACHE_SIZE)
+
     # whether to enable/disable loading frames as they're required
     streamDuringPlayback: bpy.props.BoolProperty(
         name='Stream During Playback',
         description='Load meshes into memory as they are needed. If not checked, only the meshes currently in memory will appear.',
         default=True)
 
+    # whether a cache miss during playback shows the nearest loaded mesh instead of waiting for the file to load
+    dropFrames: bpy.props.BoolProperty(
+        name='Drop Frames',
+        description="Don't wait for meshes that aren't loaded yet. Show the nearest loaded mesh and load the missing one between frames",
+        default=False,
+        update=handleDropFramesChange)
+
+    # whether to skip loading meshes for hidden or off-camera streaming sequences (the viewport shows their bounding box instead)
+    skipInvisibleFrames: bpy.props.BoolProperty(
+        name='Skip Invisible Frames',
+        description="Don't load meshes while the object is hidden or outside the active camera's view. Its bounding box is shown instead. Renders always load every mesh",
+        default=False,
+        update=handlePlaybackChange)
+
+    # the box that stands in for frames skipped by skipInvisibleFrames, and the display type to go back to
+    boundsMesh: bpy.props.PointerProperty(type=bpy.types.Mesh)
+    storedDisplayType: bpy.props.StringProperty(default='TEXTURED')
+
+    numDroppedFrames: bpy.props.IntProperty(
+        name='Dropped Frames',
+        description='How many times a nearby mesh was shown because the right one was still loading',
+        default=0)
+
+    # whether to plan streaming loads and evictions around the render frame range
+    renderPrewarm: bpy.props.BoolProperty(
+        name='Render Pre-warm',
+        description='When rendering, keep only the meshes needed for the render frame range, read upcoming files ahead of time, and remove meshes as soon as the render no longer needs them',
+        default=False)
+
+    renderReadAhead: bpy.props.IntProperty(
+        name='Read Ahead',
+        min=0,
+        soft_max=16,
+        description='The number of upcoming mesh files to read in the background while rendering',
+        default=2)
+
+    # decode each streamed frame once per machine and let the other Blender processes map it (see shared_cache.py)
+    useSharedCache: bpy.props.BoolProperty(
+        name='Shared Frame Cache',
+        description="Keep decoded frames in shared memory (/dev/shm) so that other Blender processes on this machine, e.g. render instances of the same shot, map them instead of parsing the files again. STL frames get the importer's axis and scale applied, like Blender's importer does. Like frame caches, shared frames have no UVs or materials of their own",
+        default=False)
+
+    playbackReadAhead: bpy.props.IntProperty(
+        name='Playback Read Ahead',
+        min=0,
+        soft_max=16,
+        description='The number of upcoming frames whose files are read in the background during playback. Helps most on network drives',
+        default=2)
+
+    # decimated stand-ins for each frame, shown in the viewport. Renders always use the full-resolution meshes
+    useProxies: bpy.props.BoolProperty(
+        name='Viewport Proxies',
+        description='Show a simplified version of each frame in the viewport so the sequence plays back faster. Renders use the full meshes',
+        default=False,
+        update=handleProxySettingsChange)
+
+    proxyResolution: bpy.props.IntProperty(
+        name='Proxy Resolution',
+        min=4,
+        soft_max=256,
+        description='The number of grid cells along the longest side of each frame when simplifying it. Lower is faster',
+        default=64,
+        update=handleProxySettingsChange)
+
     speed: bpy.props.FloatProperty(
         name='Speed',
         min=0.0001,
@@ -750,9 +1082,16 @@ class MeshSequenceSettings(bpy.types.PropertyGroup):
 
 @persistent
 def initializeSequences(scene):
+    # the lookup tables belong to the file that was open before
+    meshReferenceIndexes.clear()
+    materialsByDigest.clear()
+    mtlDigestCache.clear()
+    # looking meshes up by name isn't constant-time, so build the set of mesh names once for every sequence to share
+    meshKeys = set(bpy.data.meshes.keys())
     for obj in bpy.data.objects:
-        if obj.mesh_sequence_settings.initialized is True:
-            loadSequenceFromBlendFile(obj)
+        # instances have no meshes of their own to load
+        if obj.mesh_sequence_settings.initialized is True and obj.mesh_sequence_settings.instanceOf is None:
+            loadSequenceFromBlendFile(obj, meshKeys)
 
             # If auto-export is enabled, we'll need to recalculate the mesh hash for the current mesh.
             # This is because Python's hash function produces different values for each run of Python
@@ -784,6 +1123,344 @@ def deleteLinkedMeshMaterials(mesh, maxMaterialUsers=1, maxImageUsers=0):
     mesh.materials.clear()
 
 
+# build a Blender mesh directly from a MeshData (see mesh_readers.py)
+def createMeshFromMeshData(name, meshData):
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(meshData.numVertices)
+    mesh.vertices.foreach_set('co', meshData.positions)
+    mesh.loops.add(meshData.numLoops)
+    mesh.loops.foreach_set('vertex_index', meshData.faceVertices)
+    mesh.polygons.add(meshData.numFaces)
+    mesh.polygons.foreach_set('loop_start', meshData.loopStarts())
+    mesh.polygons.foreach_set('loop_total', meshData.faceSizes)
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+# which field of an attribute's data each Blender attribute type stores its values in
+attributeValueFields = {'FLOAT': 'value', 'FLOAT_VECTOR': 'vector', 'FLOAT_COLOR': 'color'}
+
+
+# build a vertex-only mesh from a point cloud MeshData, with a point attribute for each per-point value in the file
+def createPointCloudMesh(name, meshData):
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(meshData.numVertices)
+    mesh.vertices.foreach_set('co', meshData.positions)
+    for attrName, (attrType, values) in meshData.pointAttributes.items():
+        attribute = mesh.attributes.new(attrName, attrType, 'POINT')
+        attribute.data.foreach_set(attributeValueFields[attrType], values)
+    mesh.update()
+    return mesh
+
+
+def loadPointCloud(filePath, fileFormat):
+    meshName = sequenceFileStem(filePath)
+    try:
+        meshData = mesh_readers.readPointCloudFile(filePath, fileFormat)
+    except (OSError, ValueError, KeyError, EOFError) as e:
+        # leave an empty mesh in its place so the sequence doesn't have a gap
+        print("Stop Motion OBJ: couldn't read " + filePath + ": " + str(e))
+        return bpy.data.meshes.new(meshName)
+    return createPointCloudMesh(meshName, meshData)
+
+
+# If the batch converter has written a frame cache for this file (and it's up to date), build the mesh from that
+#   instead of running Blender's importer. Returns None if there is no usable frame cache.
+# Frame caches don't carry materials, so only use them once the sequence already has its material.
+# They don't carry UVs, normals, or the importer settings either, so they're only used when the sequence opts in (useFrameCache)
+def loadMeshFromFrameCache(filePath):
+    cachePath = mesh_readers.frameCachePath(filePath)
+    if mesh_readers.isFrameCacheFresh(filePath, cachePath) is False:
+        return None
+
+    meshName = os.path.splitext(os.path.basename(filePath))[0]
+    try:
+        meshData = mesh_readers.readFrameCache(cachePath, meshName)
+    except (OSError, ValueError):
+        return None
+
+    return createMeshFromMeshData(meshName, meshData)
+
+
+# Frames inside an archive, or compressed ones, are streamed straight into Stop Motion OBJ's own readers,
+#   since Blender's importers can only read plain files. These meshes don't get materials
+def loadMeshWithNativeReader(filePath, fileFormat, mergeDistance=0.0):
+    meshName = sequenceFileStem(filePath)
+    try:
+        meshData = mesh_readers.readMeshFile(filePath, fileFormat)
+    except (OSError, ValueError, KeyError, EOFError) as e:
+        # leave an empty mesh in its place so the sequence doesn't have a gap
+        print("Stop Motion OBJ: couldn't read " + filePath + ": " + str(e))
+        return bpy.data.meshes.new(meshName)
+
+    # merge by distance on the arrays, before the mesh exists, instead of as a pass over the Blender mesh
+    if mergeDistance > 0.0:
+        with profiling.timedSection('weldVertices'):
+            meshData = mesh_ops.weldVertices(meshData, mergeDistance)
+    return createMeshFromMeshData(meshName, meshData)
+
+
+# Decode a streamed frame once per machine: other Blender processes on the same node map the decoded frame from
+#   shared memory instead of parsing the file again. Returns None for frames the native readers can't decode
+def loadMeshFromSharedCache(obj, filePath):
+    mss = obj.mesh_sequence_settings
+    if mss.fileFormat not in mesh_readers.SUPPORTED_FORMATS:
+        return None
+
+    mergeDistance = nativeMergeDistance(mss)
+    importMatrix = nativeImportMatrix(mss)
+    meshName = sequenceFileStem(filePath)
+    # the matrix is part of the entry's name, so sequences imported with different axes or scales don't share entries
+    variant = mss.fileFormat + ':' + str(mergeDistance)
+    if importMatrix is not None:
+        variant += ':' + ','.join('%.6g' % value for row in importMatrix for value in row)
+    try:
+        entryPath = shared_cache.entryPath(filePath, fileStamp(filePath), variant)
+    except OSError:
+        return None
+
+    def decode():
+        try:
+            meshData = mesh_readers.readMeshFile(filePath, mss.fileFormat)
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+        if mergeDistance > 0.0:
+            meshData = mesh_ops.weldVertices(meshData, mergeDistance)
+        if importMatrix is not None:
+            meshData = mesh_ops.transformPositions(meshData, importMatrix)
+        return meshData
+
+    meshData = shared_cache.getOrDecode(entryPath, decode, meshName)
+    if meshData is None:
+        return None
+    return createMeshFromMeshData(meshName, meshData)
+
+
+# Blender's STL importer bakes its axis conversion and scale into the mesh, so the native readers have to do the same for
+#   streamed frames to line up with the first one. (The OBJ importer puts the axis conversion on the object instead,
+#   and the PLY importer used for streaming has no axis or scale settings.) Returns None when nothing needs to be applied
+def nativeImportMatrix(mss):
+    if mss.fileFormat != 'stl':
+        return None
+
+    importer = mss.fileImporter
+    globalScale = importer.stl_global_scale
+    unitSettings = bpy.context.scene.unit_settings
+    if importer.stl_use_scene_unit is True and unitSettings.system != 'NONE':
+        globalScale /= unitSettings.scale_length
+    importMatrix = axis_conversion(from_forward=importer.axis_forward, from_up=importer.axis_up).to_4x4() @ Matrix.Scale(globalScale, 4)
+    if importMatrix == Matrix.Identity(4):
+        return None
+    return [tuple(row) for row in importMatrix]
+
+
+# the native readers honour the PLY importer's Merge Vertices setting (STL corners are always welded by the reader)
+def nativeMergeDistance(mss):
+    if mss.fileFormat == 'ply' and mss.fileImporter.ply_merge_verts is True:
+        return mesh_ops.MERGE_DISTANCE
+    return 0.0
+
+
+def meshDataFromMesh(mesh):
+    meshData = mesh_readers.MeshData(mesh.name)
+    meshData.positions = array.array('f', bytes(12 * len(mesh.vertices)))
+    mesh.vertices.foreach_get('co', meshData.positions)
+    meshData.faceSizes = array.array('i', bytes(4 * len(mesh.polygons)))
+    mesh.polygons.foreach_get('loop_total', meshData.faceSizes)
+    meshData.faceVertices = array.array('i', bytes(4 * len(mesh.loops)))
+    mesh.loops.foreach_get('vertex_index', meshData.faceVertices)
+    return meshData
+
+
+# Returns the viewport proxy for a mesh, making it first if needed.
+# If the mesh came from a file, the proxy is also kept next to the frame cache so it doesn't have to be rebuilt next time
+def getProxyMesh(mesh, resolution, sourcePath=''):
+    proxy = mesh.proxyMesh
+    if proxy is not None and proxy.proxyResolution == resolution:
+        return proxy
+
+    with profiling.timedSection('generateProxyMesh'):
+        proxyName = mesh.name + '_proxy'
+        proxyData = None
+        cachePath = ''
+        if sourcePath != '':
+            cachePath = mesh_readers.frameCachePath(sourcePath, extension=mesh_readers.proxyCacheExtension(resolution))
+            if mesh_readers.isFrameCacheFresh(sourcePath, cachePath):
+                try:
+                    proxyData = mesh_readers.readFrameCache(cachePath, proxyName)
+                except (OSError, ValueError):
+                    proxyData = None
+
+        if proxyData is None:
+            proxyData = mesh_ops.clusterMeshData(meshDataFromMesh(mesh), resolution, proxyName)
+            if cachePath != '':
+                try:
+                    mesh_readers.writeFrameCache(cachePath, proxyData)
+                except OSError:
+                    pass
+
+        newProxy = createMeshFromMeshData(proxyName, proxyData)
+
+    newProxy.proxyResolution = resolution
+    for material in mesh.materials:
+        newProxy.materials.append(material)
+    if len(mesh.polygons) > 0 and mesh.polygons[0].use_smooth is True:
+        shadeMesh(newProxy, True)
+
+    # the proxy is kept alive (and saved) by the mesh that points to it
+    mesh.proxyMesh = newProxy
+
+    # an outdated proxy that's still on display is left for Blender to clean up once nothing uses it
+    if proxy is not None and proxy.users == 0:
+        bpy.data.meshes.remove(proxy)
+    return newProxy
+
+
+# the mesh to show for the given frame: its proxy in the viewport, or the mesh itself when rendering or editing
+def getDisplayMesh(obj, idx, mesh):
+    mss = obj.mesh_sequence_settings
+    if mss.useProxies is False or inRenderMode is True or idx == 0 or len(mesh.vertices) == 0:
+        return mesh
+
+    # edits and auto-export have to work on the real mesh
+    # (an object that just entered Edit mode on its proxy keeps it until handleObjectModeChange swaps it safely)
+    if obj.mode != 'OBJECT' and mesh.proxyMesh is not None and obj.data == mesh.proxyMesh:
+        return obj.data
+    if obj.mode != 'OBJECT' or mss.autoExportChanges is True:
+        return mesh
+
+    sourcePath = ''
+    basename = mss.meshNameArray[idx].basename
+    if mss.isImported is True and basename != '':
+        sourcePath = os.path.join(bpy.path.abspath(mss.dirPath), basename)
+    return getProxyMesh(mesh, mss.proxyResolution, sourcePath)
+
+
+# the full-resolution mesh an object should have while it's being edited, or None if it isn't showing a proxy
+def getProxiedMesh(obj):
+    mss = obj.mesh_sequence_settings
+    if mss.initialized is False or mss.loaded is False or obj.data is None:
+        return None
+    source = getSequenceSource(obj)
+    if source is None or source.mesh_sequence_settings.useProxies is False:
+        return None
+    meshProp = source.mesh_sequence_settings.meshNameArray[mss.curVisibleMeshIdx]
+    if meshProp.inMemory is False or meshProp.key not in bpy.data.meshes:
+        return None
+    mesh = bpy.data.meshes[meshProp.key]
+    if mesh.proxyMesh is None or obj.data != mesh.proxyMesh:
+        return None
+    return mesh
+
+
+# Runs whenever an object changes mode. Entering Edit or Sculpt mode while a proxy is on screen would edit the proxy,
+#   so step back out, swap the full-resolution meshes in, and go back in. Back in Object mode, the next update shows the proxies again
+def handleObjectModeChange():
+    global swappingProxiesForEditing
+    context = bpy.context
+    activeObj = context.object
+    if swappingProxiesForEditing is True or activeObj is None or activeObj.mode == 'OBJECT':
+        return
+
+    objsInMode = list(getattr(context, 'objects_in_mode', [])) or [activeObj]
+    meshesToEdit = [(obj, getProxiedMesh(obj)) for obj in objsInMode if obj.type == 'MESH']
+    meshesToEdit = [(obj, mesh) for obj, mesh in meshesToEdit if mesh is not None]
+    if len(meshesToEdit) == 0:
+        return
+
+    mode = activeObj.mode
+    swappingProxiesForEditing = True
+    try:
+        bpy.ops.object.mode_set(mode='OBJECT')
+        for obj, mesh in meshesToEdit:
+            obj.data = mesh
+        bpy.ops.object.mode_set(mode=mode)
+    finally:
+        swappingProxiesForEditing = False
+
+
+def subscribeToModeChanges():
+    bpy.msgbus.clear_by_owner(modeChangeOwner)
+    bpy.msgbus.subscribe_rna(key=(bpy.types.Object, 'mode'), owner=modeChangeOwner, args=(), notify=handleObjectModeChange)
+
+
+# message bus subscriptions don't survive loading a file
+@persistent
+def resubscribeToModeChanges(scene):
+    subscribeToModeChanges()
+
+
+def getMTLDigests(mtlPath):
+    try:
+        mtime = os.stat(mtlPath).st_mtime
+    except OSError:
+        return {}
+
+    cached = mtlDigestCache.get(mtlPath)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, mesh_readers.readMTLDigests(mtlPath))
+        mtlDigestCache[mtlPath] = cached
+    return cached[1]
+
+
+def findMaterialByDigest(digest):
+    # the lookup table is cleared when a .blend is opened (see initializeSequences), so rebuild it from the digests stored on the materials
+    if len(materialsByDigest) == 0:
+        for material in bpy.data.materials:
+            if material.materialHash != '':
+                materialsByDigest.setdefault(material.materialHash, material.name)
+
+    materialName = materialsByDigest.get(digest)
+    if materialName is None:
+        return None
+
+    material = bpy.data.materials.get(materialName)
+    if material is None or material.materialHash != digest:
+        del materialsByDigest[digest]
+        return None
+    return material
+
+
+# Point the mesh at materials that were already imported with an identical definition (same .mtl settings and texture files),
+#   then remove the duplicate materials and images the importer just created.
+# Blender only reads image pixels when an image is first used, so the duplicate images never get loaded
+def deduplicateMeshMaterials(mesh, filePath, fileFormat):
+    if fileFormat != 'obj':
+        return
+
+    digests = {}
+    for mtlPath in mesh_readers.readOBJMaterialLibraries(filePath):
+        digests.update(getMTLDigests(mtlPath))
+    if len(digests) == 0:
+        return
+
+    duplicateMaterials = set()
+    for slotIdx, material in enumerate(mesh.materials):
+        if material is None:
+            continue
+
+        # the importer adds ".001" etc. to names that are already taken
+        digest = digests.get(material.name) or digests.get(re.sub(r'\.[0-9]{3,}$', '', material.name))
+        if digest is None:
+            continue
+
+        existingMaterial = findMaterialByDigest(digest)
+        if existingMaterial is None:
+            material.materialHash = digest
+            materialsByDigest[digest] = material.name
+        elif existingMaterial != material:
+            mesh.materials[slotIdx] = existingMaterial
+            duplicateMaterials.add(material)
+
+    images = set()
+    for material in duplicateMaterials:
+        if hasattr(material, "node_tree") and material.node_tree is not None:
+            images.update(node.image for node in material.node_tree.nodes if node.type == 'TEX_IMAGE' and node.image is not None)
+
+    removeDatablocks(bpy.data.materials, [material for material in duplicateMaterials if material.users == 0])
+    removeDatablocks(bpy.data.images, [image for image in images if image.users == 0])
+
+
 def newMeshSequence():
     theMesh = bpy.data.meshes.new(createUniqueName('emptyMesh', bpy.data.meshes))
     theObj = bpy.data.objects.new(createUniqueName('sequence', bpy.data.objects), theMesh)
@@ -833,16 +1510,18 @@ def loadStreamingSequenceFromMeshFiles(obj, directory, filePrefix):
         return 0
 
     # load the first frame
-    wildcardAbsPath = os.path.join(absDirectory, filePrefix + '*.' + fileExtension)
     numFrames = 0
     numFramesInMemory = 0
-    unsortedFilenames = glob.glob(wildcardAbsPath)
-    sortedFilenames = sorted(unsortedFilenames, key=alphanumKey)
+    sortedFilenames = listSequenceFiles(absDirectory, filePrefix, fileExtension)
+    # hash the files here, once, so playback doesn't have to
+    digestsByFile = duplicateCandidateDigests(sortedFilenames) if mss.shareIdenticalFrames is True and mss.splitObjectName == '' else {}
     deselectAll()
     for filename in sortedFilenames:
         newMeshNameElement = mss.meshNameArray.add()
         newMeshNameElement.basename = os.path.basename(filename)
         newMeshNameElement.inMemory = False
+        newMeshNameElement.contentHash = digestsByFile.get(filename, '')
+        setBoundsFromFrameCache(mss, newMeshNameElement, filename)
         numFrames += 1
 
     mss.numMeshes = numFrames + 1
@@ -855,80 +1534,232 @@ def loadStreamingSequenceFromMeshFiles(obj, directory, filePrefix):
     return numFrames
 
 
-def loadSequenceFromMeshFiles(_obj, _dir, _file):
+def loadSequenceFromMeshFiles(_obj, _dir, _file, onFrameLoaded=None):
+    for numFrames, numFiles, file in iterLoadSequenceFromMeshFiles(_obj, _dir, _file):
+        # let the caller report progress (e.g. the batch converter prints it to stdout)
+        if onFrameLoaded is not None:
+            onFrameLoaded(numFrames, numFiles, file)
+
+    return finishLoadingSequence(_obj)
+
+
+# Load a Cached sequence one file at a time. Yields (files loaded so far, number of files to load, file) after each frame,
+#   so the caller can spread the import out (see ImportSequenceFrames) or stop early.
+# Every frame is complete when it's yielded, so stopping at any point leaves a usable partial sequence for finishLoadingSequence
+# With resume=True, only the files that aren't in the sequence yet (or that changed since they were loaded) are imported
+def iterLoadSequenceFromMeshFiles(_obj, _dir, _file, resume=False):
     full_dirpath = bpy.path.abspath(_dir)
     fileExtension = fileExtensionFromType(_obj.mesh_sequence_settings.fileFormat)
 
     # error out early if there are no files that match the file prefix
     if countMatchingFiles(full_dirpath, _file, fileExtension) == 0:
-        return 0
+        return
 
-    full_filepath = os.path.join(full_dirpath, _file + '*.' + fileExtension)
-    numFrames = 0
-    unsortedFiles = glob.glob(full_filepath)
-    sortedFiles = sorted(unsortedFiles, key=alphanumKey)
+    sortedFiles = listSequenceFiles(full_dirpath, _file, fileExtension)
+    allFiles = sortedFiles
 
     mss = _obj.mesh_sequence_settings
-    
-    # get the basename without frame numbers
-    firstBaseName = os.path.basename(sortedFiles[0])
-    commonMeshName = os.path.splitext(firstBaseName)[0].rstrip('._0123456789')
+    if resume is True:
+        sortedFiles = remainingSequenceFiles(_obj, sortedFiles)
+        if len(sortedFiles) == 0:
+            return
 
-    deselectAll()
-    for file in sortedFiles:
-        # import the mesh file
-        mss.fileImporter.load(mss.fileFormat, file, False)
+    # frames already in the sequence count too: only the sequence's first frame keeps its imported material
+    numFrames = len(mss.meshNameArray) - 1
+
+    # file hash -> name of the mesh that was loaded for it
+    meshKeysByDigest = {meshNameElement.contentHash: meshNameElement.key for meshNameElement in mss.meshNameArray[1:] if meshNameElement.contentHash != ''}
+    digestsByFile = {}
+    if mss.shareIdenticalFrames is True:
+        # sizes are compared across all of the files, so a new file can still share a frame that was loaded before.
+        #   Loaded frames that were never hashed (their size was unique then) get hashed now if a new file matches them
+        filesByBasename = {os.path.basename(file): file for file in allFiles}
+        loadedFrames = [(filesByBasename.get(meshNameElement.basename), meshNameElement) for meshNameElement in mss.meshNameArray[1:]]
+        knownDigests = {file: meshNameElement.contentHash for file, meshNameElement in loadedFrames if file is not None and meshNameElement.contentHash != ''}
+        digestsByFile = duplicateCandidateDigests(allFiles, sortedFiles, knownDigests)
+        for file, meshNameElement in loadedFrames:
+            digest = digestsByFile.get(file, '')
+            if digest != '' and meshNameElement.contentHash == '':
+                meshNameElement.contentHash = digest
+                meshKeysByDigest.setdefault(digest, meshNameElement.key)
+
+    # keep the next few files being read in the background while this one is imported
+    read_ahead.readAheadFiles(sortedFiles[:LOADER_READ_AHEAD])
+
+    # split sequences keep the materials of the first file that has their object in it
+    needsMaterial = numFrames == 0
+
+    # the caller may run other operators (or an undo) between frames, which can replace the object's data,
+    #   so it's looked up again by name for every frame instead of being held on to across a yield
+    objectName = _obj.name
 
-        # get the first object of type MESH
-        # TODO: eventually, let's pull out all MESH objects and put them into their own individual sequences
-        tmpObject = next(filter(lambda meshObj: meshObj.type == 'MESH', bpy.context.selected_objects), None)
+    deselectAll()
+    for fileIdx, file in enumerate(sortedFiles):
+        _obj = bpy.data.objects.get(objectName)
+        if _obj is None:
+            return
+        mss = _obj.mesh_sequence_settings
 
         tmpMesh = None
-        
-        # if the mesh is None, we need to create an empty mesh, otherwise it will fail and/or leave gaps in the sequence
-        if (tmpObject is None):
-            meshBaseName = os.path.splitext(os.path.basename(file))[0]
-            tmpMesh = bpy.data.meshes.new(meshBaseName)
-        else:
-            # IMPORTANT: don't copy it; just copy the pointer. This cuts memory usage in half.
-            tmpMesh = tmpObject.data
+        tmpObject = None
+        digest = ''
+        if fileIdx + LOADER_READ_AHEAD < len(sortedFiles):
+            read_ahead.readAheadFiles([sortedFiles[fileIdx + LOADER_READ_AHEAD]])
+
+        # identical files only get imported once
+        digest = digestsByFile.get(file, '')
+        if digest != '':
+            sharedMeshKey = meshKeysByDigest.get(digest)
+            if sharedMeshKey is not None:
+                newMeshNameElement = mss.meshNameArray.add()
+                newMeshNameElement.key = sharedMeshKey
+                newMeshNameElement.basename = os.path.basename(file)
+                newMeshNameElement.inMemory = True
+                newMeshNameElement.contentHash = digest
+                newMeshNameElement.fileStamp = fileStamp(file)
+                numFrames += 1
+                yield fileIdx + 1, len(sortedFiles), file
+                continue
+
+        # point clouds have no materials, so every frame goes straight through the point reader
+        if mss.pointCloud is True:
+            tmpMesh = loadPointCloud(file, mss.fileFormat)
+
+        # the first frame always goes through the importer so the sequence picks up its material
+        # (a frame cache holds a single mesh, so split sequences always use the importer)
+        if tmpMesh is None and mss.useFrameCache is True and numFrames >= 1 and mss.perFrameMaterial is False and mss.splitObjectName == '':
+            tmpMesh = loadMeshFromFrameCache(file)
+
+        if tmpMesh is None and needsNativeReader(file):
+            tmpMesh = loadMeshWithNativeReader(file, mss.fileFormat, nativeMergeDistance(mss))
+
+        if tmpMesh is None:
+            # import the mesh file
+            mss.fileImporter.load(mss.fileFormat, file, False, splitObjects=(mss.splitObjectName != ''))
+
+            # get the first object of type MESH, or for one sequence of a multi-object file (when it's reloaded), its own object
+            # (new multi-object sequences are loaded by loadSplitSequenceFromMeshFiles)
+            if mss.splitObjectName != '':
+                tmpObject = next(filter(lambda meshObj: meshObj.type == 'MESH' and splitObjectKey(meshObj.name) == mss.splitObjectName, bpy.context.selected_objects), None)
+            else:
+                tmpObject = next(filter(lambda meshObj: meshObj.type == 'MESH', bpy.context.selected_objects), None)
 
-        tmpMesh.use_fake_user = True
-        tmpMesh.inMeshSequence = True
+            # if the mesh is None, we need to create an empty mesh, otherwise it will fail and/or leave gaps in the sequence
+            if (tmpObject is None):
+                meshBaseName = os.path.splitext(os.path.basename(file))[0]
+                tmpMesh = bpy.data.meshes.new(meshBaseName)
+            else:
+                # IMPORTANT: don't copy it; just copy the pointer. This cuts memory usage in half.
+                tmpMesh = tmpObject.data
 
-        # make a list of the objects we're going to delete
-        objsToDelete = bpy.context.selected_objects.copy()
+                if mss.perFrameMaterial is True:
+                    deduplicateMeshMaterials(tmpMesh, file, mss.fileFormat)
 
-        # now, delete all selected objects. Yes, even our precious mesh object. We already saved its mesh data
-        for obj in objsToDelete:
-            bpy.data.objects.remove(obj, do_unlink=True)
+            # make a list of the objects we're going to delete
+            objsToDelete = bpy.context.selected_objects.copy()
 
-        # deselect everything just to be safe
-        deselectAll()
+            # now, delete all selected objects. Yes, even our precious mesh object. We already saved its mesh data
+            for obj in objsToDelete:
+                bpy.data.objects.remove(obj, do_unlink=True)
+
+            # deselect everything just to be safe
+            deselectAll()
+
+        tmpMesh.use_fake_user = True
+        tmpMesh.inMeshSequence = True
 
         # if this is not the first frame, remove any materials and/or images imported with the mesh
-        if numFrames >= 1 and mss.perFrameMaterial is False:
+        if needsMaterial is False and mss.perFrameMaterial is False and mss.pointCloud is False:
             deleteLinkedMeshMaterials(tmpMesh)
+        if mss.splitObjectName == '' or tmpObject is not None:
+            needsMaterial = False
 
         newMeshNameElement = mss.meshNameArray.add()
         newMeshNameElement.key = tmpMesh.name
         newMeshNameElement.basename = os.path.basename(file)
         newMeshNameElement.inMemory = True
+        newMeshNameElement.contentHash = digest
+        newMeshNameElement.fileStamp = fileStamp(file)
+        if digest != '':
+            meshKeysByDigest[digest] = tmpMesh.name
         numFrames += 1
+        yield fileIdx + 1, len(sortedFiles), file
 
+
+# Which of a sequence's files still need to be imported: the ones it doesn't have a frame for yet, plus any that changed
+#   since they were loaded (their old frames are dropped here). Frames from before file stamps were recorded count as done
+def remainingSequenceFiles(_obj, sortedFiles):
+    mss = _obj.mesh_sequence_settings
+    stampsByBasename = {os.path.basename(file): fileStamp(file) for file in sortedFiles}
+
+    for idx in range(len(mss.meshNameArray) - 1, 0, -1):
+        meshNameElement = mss.meshNameArray[idx]
+        currentStamp = stampsByBasename.get(meshNameElement.basename)
+        if meshNameElement.fileStamp == '' or currentStamp is None or currentStamp == meshNameElement.fileStamp:
+            continue
+
+        # the mesh goes away with the next save, unless another frame (or the object) still uses it
+        meshKey = meshNameElement.key
+        mss.meshNameArray.remove(idx)
+        if countMeshReferences(mss, meshKey) == 0 and meshKey in bpy.data.meshes:
+            bpy.data.meshes[meshKey].use_fake_user = False
+            bpy.data.meshes[meshKey].inMeshSequence = False
+
+    loadedBasenames = {meshNameElement.basename for meshNameElement in mss.meshNameArray[1:]}
+    return [file for file in sortedFiles if os.path.basename(file) not in loadedBasenames]
+
+
+# put a sequence's frames back in file name order after a resumed import added some at the end
+def sortSequenceFrames(_obj):
+    meshNameArray = _obj.mesh_sequence_settings.meshNameArray
+    basenames = [meshNameElement.basename for meshNameElement in meshNameArray]
+    sortedBasenames = [basenames[0]] + sorted(basenames[1:], key=alphanumKey)
+    if basenames == sortedBasenames:
+        return
+
+    # the empty mesh stays first
+    for targetIdx in range(1, len(sortedBasenames)):
+        currentIdx = basenames.index(sortedBasenames[targetIdx], targetIdx)
+        if currentIdx != targetIdx:
+            meshNameArray.move(currentIdx, targetIdx)
+            basenames.insert(targetIdx, basenames.pop(currentIdx))
+
+
+# make a Cached sequence out of whatever frames have been loaded. Returns the number of frames
+def finishLoadingSequence(_obj):
+    mss = _obj.mesh_sequence_settings
+    # the frames were added and moved around without it
+    meshReferenceIndexes.pop(_obj.name, None)
+    # the first mesh is the empty one
+    numFrames = len(mss.meshNameArray) - 1
+    if numFrames <= 0:
+        return 0
+
+    sortSequenceFrames(_obj)
     mss.numMeshes = numFrames + 1
     mss.numMeshesInMemory = numFrames
-    if(numFrames > 0):
-        setFrameObj(_obj, bpy.context.scene.frame_current)
-
-        _obj.select_set(state=True)
-        mss.loaded = True
+    setFrameObj(_obj, bpy.context.scene.frame_current)
 
+    _obj.select_set(state=True)
+    mss.loaded = True
     return numFrames
 
 
+# name an imported sequence after its first mesh, without the trailing frame numbers
+def nameSequenceFromMeshes(seqObj):
+    firstMeshName = sequenceFileStem(seqObj.mesh_sequence_settings.meshNameArray[1].basename).rstrip('._0123456789')
+    seqObj.name = createUniqueName(firstMeshName + '_sequence', bpy.data.objects)
+
+
+def formatDuration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return "%dm %02ds" % (minutes, seconds) if minutes > 0 else "%ds" % seconds
+
+
 # this is used when a mesh sequence object has been saved and subsequently found in a .blend file
-def loadSequenceFromBlendFile(_obj):
+# Only do what's needed to show the current frame here. Older sequences may have meshes that don't know they're part of
+#   a mesh sequence, but setFrameObj fixes that for each mesh as it's displayed
+def loadSequenceFromBlendFile(_obj, meshKeys=None):
     scn = bpy.context.scene
     mss = _obj.mesh_sequence_settings
 
@@ -937,17 +1768,16 @@ def loadSequenceFromBlendFile(_obj):
 
     if mss.cacheMode == 'cached':
         mss.numMeshesInMemory = len(mss.meshNameArray) - 1
-        # make sure the meshes know they're part of a mesh sequence (helps with backwards compatibility)
-        for meshName in mss.meshNameArray:
-            bpy.data.meshes[meshName.key].inMeshSequence = True
     elif mss.cacheMode == 'streaming':
         mss.numMeshesInMemory = 0
+        if meshKeys is None:
+            meshKeys = set(bpy.data.meshes.keys())
 
         # reset key and inMemory for meshes that were not saved in the .blend file
         for meshName in mss.meshNameArray:
             if not meshName.key.startswith('emptyMesh'):
                 # if the mesh is not in memory, let's not pretend that it is
-                if bpy.data.meshes.find(meshName.key) == -1:
+                if meshName.key not in meshKeys:
                     meshName.key = ''
                     meshName.inMemory = False
                 else:
@@ -960,6 +1790,200 @@ def loadSequenceFromBlendFile(_obj):
     mss.loaded = True
 
 
+# Importers name objects after the names in the file, adding ".001" etc. if the name is already taken
+def splitObjectKey(objName):
+    return re.sub(r'\.[0-9]{3,}$', '', objName)
+
+
+def getSplitSiblings(obj):
+    splitGroup = obj.mesh_sequence_settings.splitGroup
+    return [sibling for sibling in bpy.data.objects if sibling.mesh_sequence_settings.splitGroup == splitGroup]
+
+
+# create another sequence object for one of the objects in a multi-object sequence, with the same settings as templateObj
+def newSplitSibling(templateObj, splitObjectName):
+    sibling = newMeshSequence()
+    sibling.matrix_basis = templateObj.matrix_basis.copy()
+
+    templateSettings = templateObj.mesh_sequence_settings
+    siblingSettings = sibling.mesh_sequence_settings
+    for attr in ('isImported', 'dirPath', 'fileName', 'dirPathIsRelative', 'dirPathNeedsRelativizing', 'perFrameMaterial', 'shareIdenticalFrames', 'useFrameCache', 'cacheMode', 'fileFormat', 'splitGroup', 'shadingMode'):
+        setattr(siblingSettings, attr, getattr(templateSettings, attr))
+    for prop in templateSettings.fileImporter.bl_rna.properties:
+        if prop.identifier != 'rna_type' and prop.is_readonly is False:
+            setattr(siblingSettings.fileImporter, prop.identifier, getattr(templateSettings.fileImporter, prop.identifier))
+
+    siblingSettings.splitObjectName = splitObjectName
+    sibling.name = createUniqueName(splitObjectName + '_sequence', bpy.data.objects)
+    return sibling
+
+
+def appendMeshToSequence(seqObj, mesh, file, keepMaterials):
+    mss = seqObj.mesh_sequence_settings
+    mesh.use_fake_user = True
+    mesh.inMeshSequence = True
+    if mss.perFrameMaterial is True:
+        deduplicateMeshMaterials(mesh, file, mss.fileFormat)
+    elif keepMaterials is False:
+        deleteLinkedMeshMaterials(mesh)
+
+    newMeshNameElement = mss.meshNameArray.add()
+    newMeshNameElement.key = mesh.name
+    newMeshNameElement.basename = os.path.basename(file)
+    newMeshNameElement.inMemory = True
+
+
+# Cached import for files that contain several objects: each file is only imported once,
+#   and each object in it gets its own sequence. _obj becomes the sequence for the first object
+def loadSplitSequenceFromMeshFiles(_obj, _dir, _file, onFrameLoaded=None):
+    full_dirpath = bpy.path.abspath(_dir)
+    mss = _obj.mesh_sequence_settings
+    sortedFiles = listSequenceFiles(full_dirpath, _file, fileExtensionFromType(mss.fileFormat))
+    if len(sortedFiles) == 0:
+        return 0
+
+    mss.splitGroup = uuid.uuid4().hex
+
+    # object name -> sequence object, in the order they were first found
+    sequences = {}
+    # sequences that still need a mesh that keeps its materials
+    needsMaterials = set()
+    deselectAll()
+    for frameIdx, file in enumerate(sortedFiles):
+        mss.fileImporter.load(mss.fileFormat, file, False, splitObjects=True)
+        importedObjects = bpy.context.selected_objects.copy()
+
+        frameMeshes = {}
+        for importedObj in importedObjects:
+            if importedObj.type == 'MESH':
+                frameMeshes.setdefault(splitObjectKey(importedObj.name), importedObj.data)
+
+        # we already have the mesh data, so the imported objects can go
+        for importedObj in importedObjects:
+            bpy.data.objects.remove(importedObj, do_unlink=True)
+        deselectAll()
+
+        for objName in frameMeshes:
+            if objName in sequences:
+                continue
+
+            if len(sequences) == 0:
+                seqObj = _obj
+                mss.splitObjectName = objName
+                _obj.name = createUniqueName(objName + '_sequence', bpy.data.objects)
+            else:
+                seqObj = newSplitSibling(_obj, objName)
+            sequences[objName] = seqObj
+            needsMaterials.add(objName)
+
+            # this object wasn't in the earlier files, so fill in those frames with empty meshes
+            for earlierFile in sortedFiles[:frameIdx]:
+                appendMeshToSequence(seqObj, bpy.data.meshes.new(os.path.splitext(os.path.basename(earlierFile))[0]), earlierFile, False)
+
+        for objName, seqObj in sequences.items():
+            mesh = frameMeshes.get(objName)
+            if mesh is None:
+                mesh = bpy.data.meshes.new(os.path.splitext(os.path.basename(file))[0])
+
+            # only the first imported mesh of each sequence keeps its materials
+            keepMaterials = objName in needsMaterials and objName in frameMeshes
+            if keepMaterials is True:
+                needsMaterials.discard(objName)
+            appendMeshToSequence(seqObj, mesh, file, keepMaterials)
+
+        if onFrameLoaded is not None:
+            onFrameLoaded(frameIdx + 1, len(sortedFiles), file)
+
+    # none of the files had any meshes in them
+    if len(sequences) == 0:
+        sequences[''] = _obj
+        for file in sortedFiles:
+            appendMeshToSequence(_obj, bpy.data.meshes.new(os.path.splitext(os.path.basename(file))[0]), file, False)
+
+    for seqObj in sequences.values():
+        seqMss = seqObj.mesh_sequence_settings
+        seqMss.numMeshes = len(sortedFiles) + 1
+        seqMss.numMeshesInMemory = len(sortedFiles)
+        setFrameObj(seqObj, bpy.context.scene.frame_current)
+        seqObj.select_set(state=True)
+        seqMss.loaded = True
+
+    return len(sortedFiles)
+
+
+# Streaming import for files that contain several objects.
+# The current frame is imported once to find out which objects the files contain, and each object gets its own sequence.
+# After that, whenever one of the sequences imports a file, the other objects in it go to their own sequences (see distributeSplitMeshes)
+def loadSplitStreamingSequenceFromMeshFiles(obj, directory, filePrefix):
+    mss = obj.mesh_sequence_settings
+    absDirectory = bpy.path.abspath(directory)
+    sortedFilenames = listSequenceFiles(absDirectory, filePrefix, fileExtensionFromType(mss.fileFormat))
+    if len(sortedFilenames) == 0:
+        return 0
+
+    for filename in sortedFilenames:
+        newMeshNameElement = mss.meshNameArray.add()
+        newMeshNameElement.basename = os.path.basename(filename)
+        newMeshNameElement.inMemory = False
+    mss.numMeshes = len(sortedFilenames) + 1
+    mss.numMeshesInMemory = 0
+    mss.splitGroup = uuid.uuid4().hex
+
+    frameNum = bpy.context.scene.frame_current
+    idx = max(getMeshIdxFromFrameNumber(obj, frameNum), 1)
+
+    deselectAll()
+    lockLoadingSequence(True)
+    mss.fileImporter.load(mss.fileFormat, sortedFilenames[idx - 1], True, splitObjects=True)
+    lockLoadingSequence(False)
+    importedObjects = getSelectedObjects()
+
+    siblings = {}
+    unusedMeshes = []
+    for importedObj in importedObjects:
+        if importedObj.type != 'MESH':
+            continue
+        objName = splitObjectKey(importedObj.name)
+        if objName in siblings:
+            unusedMeshes.append(importedObj.data)
+            continue
+
+        if len(siblings) == 0:
+            seqObj = obj
+            mss.splitObjectName = objName
+            obj.name = createUniqueName(objName + '_sequence', bpy.data.objects)
+        else:
+            seqObj = newSplitSibling(obj, objName)
+            seqMss = seqObj.mesh_sequence_settings
+            for meshNameElement in mss.meshNameArray[1:]:
+                newMeshNameElement = seqMss.meshNameArray.add()
+                newMeshNameElement.basename = meshNameElement.basename
+                newMeshNameElement.inMemory = False
+            seqMss.numMeshes = mss.numMeshes
+            seqMss.numMeshesInMemory = 0
+
+        storeStreamedMesh(seqObj, idx, importedObj.data)
+        siblings[objName] = seqObj
+
+    for importedObj in importedObjects:
+        bpy.data.objects.remove(importedObj, do_unlink=True)
+    for mesh in unusedMeshes:
+        deleteLinkedMeshMaterials(mesh)
+        mesh.use_fake_user = False
+    removeDatablocks(bpy.data.meshes, unusedMeshes)
+
+    # with no meshes to split up, this is just an ordinary streaming sequence
+    if len(siblings) == 0:
+        siblings[''] = obj
+
+    for seqObj in siblings.values():
+        seqObj.mesh_sequence_settings.loaded = True
+        setFrameObjStreamed(seqObj, frameNum, True, False)
+        seqObj.select_set(state=True)
+
+    return len(sortedFilenames)
+
+
 def reloadSequenceFromMeshFiles(_object, _directory, _filePrefix):
     # if there are no files that match the file prefix, error out early before making changes
     fileExtension = fileExtensionFromType(_object.mesh_sequence_settings.fileFormat)
@@ -969,15 +1993,19 @@ def reloadSequenceFromMeshFiles(_object, _directory, _filePrefix):
     meshNamesArray = _object.mesh_sequence_settings.meshNameArray
 
     # mark the existing meshes for cleanup (keep the first 'emptyMesh' one)
-    meshesToRemove = []
+    meshesToRemove = set()
     for meshNameElement in meshNamesArray[1:]:
+        # frames can share a mesh, so only mark each mesh once
+        if meshNameElement.key in meshesToRemove:
+            continue
         bpy.data.meshes[meshNameElement.key].use_fake_user = False
         bpy.data.meshes[meshNameElement.key].inMeshSequence = False
-        meshesToRemove.append(meshNameElement.key)
+        meshesToRemove.add(meshNameElement.key)
 
     # re-initialize _object.meshNameArray
     emptyMeshName = meshNamesArray[0].key
     meshNamesArray.clear()
+    meshReferenceIndexes.pop(_object.name, None)
     emptyMeshNameElement = meshNamesArray.add()
     emptyMeshNameElement.key = emptyMeshName
 
@@ -1010,18 +2038,112 @@ def getMeshPropFromIndex(obj, idx):
 
 
 def setFrameNumber(frameNum):
+    # built once here, so evicting meshes doesn't have to search every object for instances
+    instancesBySource = getInstancesBySource()
     for obj in bpy.data.objects:
         mss = obj.mesh_sequence_settings
         if mss.initialized is True and mss.loaded is True:
+            if mss.instanceOf is not None:
+                setFrameInstance(obj, frameNum, instancesBySource)
+                continue
+
             cacheMode = mss.cacheMode
             if cacheMode == 'cached':
                 setFrameObj(obj, frameNum)
             elif cacheMode == 'streaming':
+                # renders load everything, since hidden or off-camera objects can still show up in shadows and reflections
+                if mss.skipInvisibleFrames is True and inRenderMode is False:
+                    if obj.visible_get() is False:
+                        continue
+
+                    idx = getMeshIdxFromFrameNumber(obj, frameNum)
+                    meshNameElement = mss.meshNameArray[idx]
+                    if meshNameElement.inMemory is False and isFrameOffCamera(obj, meshNameElement, bpy.context.scene):
+                        showFrameBounds(obj, idx)
+                        continue
+
+                showingBounds = mss.boundsMesh is not None and obj.data == mss.boundsMesh
+
                 global forceMeshLoad
-                setFrameObjStreamed(obj, frameNum, forceLoad=forceMeshLoad, deleteMaterials=not mss.perFrameMaterial)
+                setFrameObjStreamed(obj, frameNum, forceLoad=forceMeshLoad, deleteMaterials=not (mss.perFrameMaterial or mss.pointCloud), instances=instancesBySource.get(obj.name, []))
+
+                # only go back to drawing the object normally once a real mesh has replaced the bounding box
+                # (with Stream During Playback off, nothing may have been loaded)
+                if showingBounds is True and obj.data != mss.boundsMesh:
+                    obj.display_type = mss.storedDisplayType
+
+
+def findMeshIdxCurve(_obj):
+    if _obj.animation_data is None or _obj.animation_data.action is None:
+        return None
+    return next((curve for curve in _obj.animation_data.action.fcurves if 'curKeyframeMeshIdx' in curve.data_path), None)
+
+
+# Everything that the frame -> mesh mapping depends on. If any of these change, the lookup table has to be rebuilt.
+# Moving keyframes doesn't change any of these, so handleActionUpdates takes care of that
+def getFrameLookupKey(_obj, scene):
+    mss = _obj.mesh_sequence_settings
+    actionName = None
+    numKeyframes = 0
+    if mss.frameMode == '4' and _obj.animation_data is not None and _obj.animation_data.action is not None:
+        actionName = _obj.animation_data.action.name
+        meshIdxCurve = frameLookupTables.get(_obj.name, {}).get('meshIdxCurve')
+        try:
+            numKeyframes = len(meshIdxCurve.keyframe_points) if meshIdxCurve is not None else -1
+        except ReferenceError:
+            # the cached curve has been deleted
+            numKeyframes = -1
+
+    return (mss.startFrame, mss.speed, mss.frameMode, mss.numMeshes, scene.frame_start, scene.frame_end, actionName, numKeyframes)
+
+
+def getFrameLookupTable(_obj):
+    scn = bpy.context.scene
+    key = getFrameLookupKey(_obj, scn)
+    table = frameLookupTables.get(_obj.name)
+    if table is not None and table['key'] == key:
+        return table
+
+    # cache the keyframe curve so that it doesn't have to be searched for every frame
+    meshIdxCurve = findMeshIdxCurve(_obj) if _obj.mesh_sequence_settings.frameMode == '4' else None
+    table = {
+        'meshIdxCurve': meshIdxCurve,
+        'firstFrame': scn.frame_start,
+        'meshIdxs': array.array('i', (computeMeshIdxFromFrameNumber(_obj, frameNum, meshIdxCurve) for frameNum in range(scn.frame_start, scn.frame_end + 1)))
+    }
+    frameLookupTables[_obj.name] = table
+
+    # the key includes the curve's keyframe count, which we can only read once the curve is cached
+    table['key'] = getFrameLookupKey(_obj, scn)
+    return table
+
+
+# keyframes that get moved around don't change the lookup key, so throw away the tables that use an edited action
+@persistent
+def handleActionUpdates(scene, depsgraph=None):
+    if depsgraph is None or len(frameLookupTables) == 0:
+        return
+
+    updatedActions = {update.id.original.name for update in depsgraph.updates if isinstance(update.id, bpy.types.Action)}
+    if len(updatedActions) == 0:
+        return
+
+    for objName in list(frameLookupTables.keys()):
+        if frameLookupTables[objName]['key'][6] in updatedActions:
+            del frameLookupTables[objName]
 
 
+# within the scene's frame range, the mesh index comes straight out of the lookup table
 def getMeshIdxFromFrameNumber(_obj, frameNum):
+    table = getFrameLookupTable(_obj)
+    offset = frameNum - table['firstFrame']
+    if offset == int(offset) and 0 <= offset < len(table['meshIdxs']):
+        return table['meshIdxs'][int(offset)]
+
+    return computeMeshIdxFromFrameNumber(_obj, frameNum, table['meshIdxCurve'])
+
+
+def computeMeshIdxFromFrameNumber(_obj, frameNum, meshIdxCurve):
     mss = _obj.mesh_sequence_settings
     numRealMeshes = mss.numMeshes - 1
 
@@ -1066,11 +2188,9 @@ def getMeshIdxFromFrameNumber(_obj, frameNum):
     # 4: Keyframe
     elif frameMode == '4':
         finalIdx = 0
-        if _obj.animation_data != None:
+        if meshIdxCurve is not None:
             # we can't just look at mss.curKeyframeMeshIdx since it hasn't yet been updated
             # instead we have to evaluate the actual keyframe curve at this new frame number
-            meshIdxCurve = next(curve for curve in _obj.animation_data.action.fcurves if 'curKeyframeMeshIdx' in curve.data_path)
-            
             # make sure the 1-based index is in-bounds
             curveValue = clamp(meshIdxCurve.evaluate(frameNum), 1, numRealMeshes)
 
@@ -1082,6 +2202,7 @@ def getMeshIdxFromFrameNumber(_obj, frameNum):
     return finalIdx + 1
 
 
+@profiling.timed('setFrameObj')
 def setFrameObj(_obj, frameNum):
     # store the current mesh for grabbing the material later
     prevMesh = _obj.data
@@ -1089,6 +2210,11 @@ def setFrameObj(_obj, frameNum):
     _obj.mesh_sequence_settings.curVisibleMeshIdx = idx
     nextMesh = getMeshFromIndex(_obj, idx)
 
+    # make sure the mesh knows it's part of a mesh sequence (helps with backwards compatibility)
+    if nextMesh.inMeshSequence is False:
+        nextMesh.inMeshSequence = True
+
+    nextMesh = getDisplayMesh(_obj, idx, nextMesh)
     if nextMesh != prevMesh:
         # swap the meshes
         _obj.data = nextMesh
@@ -1101,29 +2227,52 @@ def setFrameObj(_obj, frameNum):
                     _obj.data.materials.append(material)
 
 
-def setFrameObjStreamed(obj, frameNum, forceLoad=False, deleteMaterials=False):
+@profiling.timed('setFrameObjStreamed')
+# measureAccess=False shows the mesh without counting it as a frame change (for the access trace and Auto Cache Size)
+def setFrameObjStreamed(obj, frameNum, forceLoad=False, deleteMaterials=False, measureAccess=True, instances=None):
     mss = obj.mesh_sequence_settings
     idx = getMeshIdxFromFrameNumber(obj, frameNum)
     mss.curVisibleMeshIdx = idx
     nextMeshProp = getMeshPropFromIndex(obj, idx)
+    requestedIdx = idx
+    wasResident = nextMeshProp.inMemory
+    loadSeconds = 0.0
+    droppedFrame = False
+
+    # in Drop Frames mode, a missing mesh is loaded later and the nearest loaded mesh stands in for it
+    if nextMeshProp.inMemory is False and mss.dropFrames is True and mss.streamDuringPlayback is True and forceLoad is False and inRenderMode is False:
+        queueStreamedMeshLoad(obj, idx)
+        mss.numDroppedFrames += 1
+        droppedFrame = True
+        residentIdx = nearestResidentMeshIdx(obj, idx)
+        if residentIdx > 0:
+            idx = residentIdx
+            nextMeshProp = getMeshPropFromIndex(obj, idx)
 
     # if we want to load new meshes as needed and it's not already loaded
     if nextMeshProp.inMemory is False and (mss.streamDuringPlayback is True or forceLoad is True):
+        loadStartTime = time.perf_counter()
         importStreamedFile(obj, idx)
+        loadSeconds = time.perf_counter() - loadStartTime
         obj.select_set(state=True)
-        if deleteMaterials is True:
+        # a shared mesh may be the one that holds the sequence's material
+        if deleteMaterials is True and countMeshReferences(mss, nextMeshProp.key) <= 1:
             nextMesh = getMeshFromIndex(obj, idx)
-            deleteLinkedMeshMaterials(nextMesh)
+            with profiling.timedSection('deleteLinkedMeshMaterials'):
+                deleteLinkedMeshMaterials(nextMesh)
 
     # if the mesh is in memory, show it
     if nextMeshProp.inMemory is True:
         nextMesh = getMeshFromIndex(obj, idx)
         
-        # if the user has enabled auto-shading
-        if (mss.shadingMode != 'imported'):
+        # if the user has enabled auto-shading (point clouds have no faces to shade)
+        if (mss.shadingMode != 'imported' and mss.pointCloud is False):
             # shade smooth/flat the mesh based on the sequence settings
             useSmooth = True if mss.shadingMode == 'smooth' else False
-            shadeMesh(nextMesh, useSmooth)
+            with profiling.timedSection('shadeMesh'):
+                shadeMesh(nextMesh, useSmooth)
+
+        nextMesh = getDisplayMesh(obj, idx, nextMesh)
 
         # store the current mesh for grabbing the material later
         prevMesh = obj.data
@@ -1134,76 +2283,553 @@ def setFrameObjStreamed(obj, frameNum, forceLoad=False, deleteMaterials=False):
             # if we need to, copy the materials from the old one onto the new one
             if obj.mesh_sequence_settings.perFrameMaterial is False:
                 if len(prevMesh.materials) > 0:
-                    obj.data.materials.clear()
-                    for material in prevMesh.materials:
-                        obj.data.materials.append(material)
+                    with profiling.timedSection('copyMaterials'):
+                        obj.data.materials.clear()
+                        for material in prevMesh.materials:
+                            obj.data.materials.append(material)
 
 
-    if mss.cacheSize > 0 and mss.numMeshesInMemory > mss.cacheSize:
-        idxToDelete = nextCachedMeshToDelete(obj, idx)
-        if idxToDelete >= 0:
-            removeMeshFromCache(obj, idxToDelete)
+    # renders wait for every load anyway, so only playback is measured
+    if measureAccess is True and mss.autoCacheSize is True and inRenderMode is False and requestedIdx > 0 and (wasResident is True or loadSeconds > 0.0 or droppedFrame is True):
+        tuneCacheSize(obj, requestedIdx, wasResident, loadSeconds, droppedFrame)
 
+    schedule = renderSchedules.get(obj.name) if inRenderMode is True else None
+    if schedule is not None:
+        evictFinishedRenderMeshes(obj, schedule, frameNum, idx, instances)
+        queueRenderReadAhead(obj, schedule, frameNum)
+    elif inRenderMode is False and mss.streamDuringPlayback is True and mss.playbackReadAhead > 0:
+        queuePlaybackReadAhead(obj, frameNum)
 
-def nextCachedMeshToDelete(obj, currentMeshIdx):
-    mss = obj.mesh_sequence_settings
+    trimStreamingCache(obj, frameNum, idx, schedule, instances)
 
-    # find and delete the one closest to the end of the array
-    idxToDelete = len(mss.meshNameArray) - 1
-    while idxToDelete > 0 and (idxToDelete == currentMeshIdx or mss.meshNameArray[idxToDelete].inMemory is False):
-        idxToDelete -= 1
-    
-    return idxToDelete
+    if measureAccess is True and profiling.accessTraceEnabled is True:
+        recordStreamedAccess(obj, frameNum, requestedIdx, wasResident, loadSeconds)
+
+
+# Bytes per element of a Blender mesh: its vertex, edge, loop, and face records, plus the normals Blender keeps for them
+MESH_VERTEX_BYTES = 32
+MESH_EDGE_BYTES = 12
+MESH_LOOP_BYTES = 20
+MESH_POLYGON_BYTES = 24
+MESH_UV_LOOP_BYTES = 12
+MESH_COLOR_LOOP_BYTES = 4
+
+# The records above leave out allocator overhead, other attribute layers, and the evaluated copy of the mesh on screen.
+# Underestimating lets the cache grow past its memory ceiling, so round up
+MESH_BYTES_SAFETY_FACTOR = 1.5
+
+
+# An estimate of how much memory a mesh takes up in Blender
+def estimateMeshBytes(mesh):
+    loopBytes = MESH_LOOP_BYTES + MESH_UV_LOOP_BYTES * len(mesh.uv_layers) + MESH_COLOR_LOOP_BYTES * len(mesh.vertex_colors)
+    numBytes = MESH_VERTEX_BYTES * len(mesh.vertices) + MESH_EDGE_BYTES * len(mesh.edges) + loopBytes * len(mesh.loops) + MESH_POLYGON_BYTES * len(mesh.polygons)
+    return int(numBytes * MESH_BYTES_SAFETY_FACTOR)
+
+
+# add a frame change to the access trace (Advanced > Record Access Trace)
+def recordStreamedAccess(obj, frameNum, meshIdx, wasResident, loadSeconds):
+    meshBytes = 0
+    if meshIdx > 0 and getMeshPropFromIndex(obj, meshIdx).inMemory is True:
+        meshBytes = estimateMeshBytes(getMeshFromIndex(obj, meshIdx))
+    profiling.recordAccess(obj.name, frameNum, meshIdx, wasResident, loadSeconds, meshBytes)
+
+
+# measure a frame change for Auto Cache Size, and pick a new cache size every cache_tuning.ADJUST_INTERVAL frame changes
+def tuneCacheSize(obj, meshIdx, wasResident, loadSeconds, droppedFrame=False):
+    mss = obj.mesh_sequence_settings
+    tuner = getCacheTuner(obj)
+
+    if droppedFrame is True:
+        tuner.recordDroppedFrame()
+    else:
+        render = bpy.context.scene.render
+        tuner.recordAccess(wasResident, loadSeconds, render.fps_base / render.fps, loadedMeshBytes(obj, meshIdx, wasResident))
+
+    if tuner.shouldAdjust():
+        mss.effectiveCacheSize = tuner.adjust(
+            mss.targetStallRate,
+            cache_tuning.readAvailableMemory(),
+            mss.numMeshesInMemory,
+            mss.memoryCeiling,
+            len(mss.meshNameArray) - 1)
+
+
+def getCacheTuner(obj):
+    tuner = cacheTuners.get(obj.name)
+    if tuner is None:
+        tuner = cache_tuning.CacheTuner(obj.mesh_sequence_settings.effectiveCacheSize)
+        cacheTuners[obj.name] = tuner
+    return tuner
+
+
+# the estimated size of a mesh that was just loaded, or 0 if nothing was loaded
+def loadedMeshBytes(obj, meshIdx, wasResident):
+    if wasResident is False and getMeshPropFromIndex(obj, meshIdx).inMemory is True:
+        return estimateMeshBytes(getMeshFromIndex(obj, meshIdx))
+    return 0
+
+
+# remove meshes until the sequence fits in its cache size
+def trimStreamingCache(obj, frameNum, idx, schedule, instances=None):
+    mss = obj.mesh_sequence_settings
+    cacheSize = getStreamingCacheSize(mss)
+    if cacheSize > 0 and mss.numMeshesInMemory > cacheSize and instances is None:
+        instances = getSequenceInstances(obj)
+    # (Drop Frames playback can load meshes between frame changes, so there may be more than one to remove)
+    while cacheSize > 0 and mss.numMeshesInMemory > cacheSize:
+        if schedule is not None:
+            idxToDelete = nextScheduledMeshToDelete(obj, schedule, frameNum, idx, instances)
+        else:
+            idxToDelete = nextCachedMeshToDelete(obj, idx, instances)
+        # index 0 is the empty mesh, which is never removed
+        if idxToDelete < 1:
+            break
+        removeMeshFromCache(obj, idxToDelete)
+
+
+# follow instanceOf to the sequence that owns the meshes (an instance of an instance shows the original's meshes)
+def getSequenceSource(obj):
+    visited = set()
+    while obj is not None and obj.mesh_sequence_settings.instanceOf is not None:
+        if obj.name in visited:
+            return None
+        visited.add(obj.name)
+        obj = obj.mesh_sequence_settings.instanceOf
+    return obj
+
+
+def getSequenceInstances(sourceObj):
+    return [obj for obj in bpy.data.objects if obj.mesh_sequence_settings.instanceOf is not None and getSequenceSource(obj) == sourceObj]
+
+
+# every sequence's instances in a single pass over the objects, keyed by the source's name
+def getInstancesBySource():
+    instancesBySource = {}
+    for obj in bpy.data.objects:
+        if obj.mesh_sequence_settings.instanceOf is None:
+            continue
+        source = getSequenceSource(obj)
+        if source is not None:
+            instancesBySource.setdefault(source.name, []).append(obj)
+    return instancesBySource
+
+
+# the indices of the meshes that a sequence or any of its instances is showing, none of which may be removed from the cache
+def getMeshIdxsInUse(obj, currentMeshIdx, instances=None):
+    if instances is None:
+        instances = getSequenceInstances(obj)
+    idxsInUse = {currentMeshIdx}
+    for instance in instances:
+        idxsInUse.add(instance.mesh_sequence_settings.curVisibleMeshIdx)
+    return idxsInUse
+
+
+# Instances look their frame up with their own playback settings, but show (and, when streaming, load) the source's meshes.
+#   Each file is parsed once and kept in the source's cache, no matter how many instances show it
+@profiling.timed('setFrameInstance')
+def setFrameInstance(obj, frameNum, instancesBySource=None):
+    mss = obj.mesh_sequence_settings
+    source = getSequenceSource(obj)
+    if source is None:
+        return
+    sourceSettings = source.mesh_sequence_settings
+    if sourceSettings.initialized is False or sourceSettings.loaded is False:
+        return
+
+    # the source may have gained or lost frames since the instance was made
+    if mss.numMeshes != sourceSettings.numMeshes:
+        mss.numMeshes = sourceSettings.numMeshes
+
+    idx = getMeshIdxFromFrameNumber(obj, frameNum)
+    mss.curVisibleMeshIdx = idx
+    meshNameElement = sourceSettings.meshNameArray[idx]
+
+    if meshNameElement.inMemory is False:
+        if sourceSettings.cacheMode != 'streaming':
+            return
+        if sourceSettings.streamDuringPlayback is False and forceMeshLoad is False:
+            return
+
+        importStreamedFile(source, idx)
+        if sourceSettings.perFrameMaterial is False and sourceSettings.pointCloud is False and countMeshReferences(sourceSettings, meshNameElement.key) <= 1:
+            deleteLinkedMeshMaterials(getMeshFromIndex(source, idx))
+        schedule = renderSchedules.get(source.name) if inRenderMode is True else None
+        instances = instancesBySource.get(source.name, []) if instancesBySource is not None else None
+        trimStreamingCache(source, frameNum, sourceSettings.curVisibleMeshIdx, schedule, instances)
+
+    nextMesh = getDisplayMesh(source, idx, getMeshFromIndex(source, idx))
+    prevMesh = obj.data
+    if nextMesh != prevMesh:
+        obj.data = nextMesh
+
+        if sourceSettings.perFrameMaterial is False and len(prevMesh.materials) > 0:
+            obj.data.materials.clear()
+            for material in prevMesh.materials:
+                obj.data.materials.append(material)
+
+
+def addSequenceInstance(sourceObj):
+    source = getSequenceSource(sourceObj)
+    sourceSettings = source.mesh_sequence_settings
+
+    instance = bpy.data.objects.new(createUniqueName(source.name + '_instance', bpy.data.objects), source.data)
+    for collection in sourceObj.users_collection:
+        collection.objects.link(instance)
+    instance.matrix_world = sourceObj.matrix_world.copy()
+
+    mss = instance.mesh_sequence_settings
+    for attr in ('cacheMode', 'frameMode', 'startFrame', 'speed', 'numMeshes', 'curVisibleMeshIdx'):
+        setattr(mss, attr, getattr(sourceObj.mesh_sequence_settings, attr))
+    for attr in ('versionMajor', 'versionMinor', 'versionRevision', 'versionDevelopment'):
+        setattr(mss.version, attr, getattr(sourceSettings.version, attr))
+    mss.instanceOf = source
+    mss.initialized = True
+    mss.loaded = True
+
+    deselectAll()
+    instance.select_set(state=True)
+    bpy.context.view_layer.objects.active = instance
+    return instance
+
+
+def nearestResidentMeshIdx(obj, meshIdx):
+    meshNameArray = obj.mesh_sequence_settings.meshNameArray
+    for distance in range(1, len(meshNameArray)):
+        for idx in (meshIdx - distance, meshIdx + distance):
+            if 0 < idx < len(meshNameArray) and meshNameArray[idx].inMemory is True:
+                return idx
+    return -1
+
+
+def queueStreamedMeshLoad(obj, meshIdx):
+    mss = obj.mesh_sequence_settings
+    pendingStreamedMeshes[obj.name] = meshIdx
+
+    # start reading the file now so it's in the OS cache by the time the timer gets to it
+    read_ahead.readAheadFiles([os.path.join(bpy.path.abspath(mss.dirPath), mss.meshNameArray[meshIdx].basename)])
+    if bpy.app.timers.is_registered(loadPendingStreamedMeshes) is False:
+        bpy.app.timers.register(loadPendingStreamedMeshes, first_interval=0.0)
+
+
+# Timer callback for Drop Frames playback. Blender's importers have to run on the main thread, so this
+#   loads one pending mesh per call, in between frame changes, and shows it if its frame is still current
+def loadPendingStreamedMeshes():
+    if len(pendingStreamedMeshes) == 0:
+        return None
+
+    objName, meshIdx = pendingStreamedMeshes.popitem()
+    obj = bpy.data.objects.get(objName)
+    if obj is not None and obj.mesh_sequence_settings.loaded is True and meshIdx < len(obj.mesh_sequence_settings.meshNameArray):
+        mss = obj.mesh_sequence_settings
+        if mss.meshNameArray[meshIdx].inMemory is False:
+            loadStartTime = time.perf_counter()
+            importStreamedFile(obj, meshIdx)
+            loadSeconds = time.perf_counter() - loadStartTime
+            if mss.perFrameMaterial is False and mss.pointCloud is False and countMeshReferences(mss, mss.meshNameArray[meshIdx].key) <= 1:
+                deleteLinkedMeshMaterials(getMeshFromIndex(obj, meshIdx))
+            # the frame change that dropped this mesh was already counted as a stall
+            if mss.autoCacheSize is True:
+                getCacheTuner(obj).recordLoad(loadSeconds, loadedMeshBytes(obj, meshIdx, False))
+        # (showing it now isn't another frame change)
+        if mss.curVisibleMeshIdx == meshIdx:
+            setFrameObjStreamed(obj, bpy.context.scene.frame_current, measureAccess=False)
+
+    return 0.0 if len(pendingStreamedMeshes) > 0 else None
+
+
+def nextCachedMeshToDelete(obj, currentMeshIdx, instances=None):
+    mss = obj.mesh_sequence_settings
+
+    # find and delete the one closest to the end of the array
+    idxsInUse = getMeshIdxsInUse(obj, currentMeshIdx, instances)
+    idxToDelete = len(mss.meshNameArray) - 1
+    while idxToDelete > 0 and (idxToDelete in idxsInUse or mss.meshNameArray[idxToDelete].inMemory is False):
+        idxToDelete -= 1
+    
+    return idxToDelete
 
 
 # This function will be called from within both the Editor context and the Render context
 # Keep that in mind when using bpy.context
+@profiling.timed('importStreamedFile')
 def importStreamedFile(obj, idx):
     mss = obj.mesh_sequence_settings
     absDirectory = bpy.path.abspath(mss.dirPath)
     filename = os.path.join(absDirectory, mss.meshNameArray[idx].basename)
-    deselectAll()
-    
-    lockLoadingSequence(True)
-    mss.fileImporter.load(mss.fileFormat, filename, True)
-    lockLoadingSequence(False)
-
-    selectedObjects = getSelectedObjects()
-    tmpObject = next(filter(lambda meshObj: meshObj.type == 'MESH', selectedObjects), None)
-    
     tmpMesh = None
-    
-    # if tmpObject is None, we'll need to create an empty mesh to take its place
-    if (tmpObject is None):
-        # take the frame numbers off the basename
-        meshBaseName = os.path.splitext(mss.meshNameArray[idx].basename)[0]
-        tmpMesh = bpy.data.meshes.new(meshBaseName)
-    else:
-        tmpMesh = tmpObject.data
 
-    # make a list of the objects we're going to delete
-    objsToDelete = selectedObjects.copy()
+    # if an identical file is already loaded, use its mesh
+    # (the files were hashed when the sequence was loaded. Multi-object sequences hand meshes to each other, so they don't share frames)
+    digest = mss.meshNameArray[idx].contentHash
+    if mss.shareIdenticalFrames is True and mss.splitObjectName == '' and digest != '':
+        sharedMeshKey = findSharedMeshKey(mss, digest)
+        if sharedMeshKey is not None:
+            storeStreamedMesh(obj, idx, bpy.data.meshes[sharedMeshKey])
+            return bpy.data.meshes[sharedMeshKey]
+
+    if mss.pointCloud is True:
+        with profiling.timedSection('loadPointCloud'):
+            tmpMesh = loadPointCloud(filename, mss.fileFormat)
+
+    # once a mesh is in memory, the sequence has its material and later meshes can come from the frame cache
+    # (a frame cache holds a single mesh, so multi-object sequences always use the importer)
+    if tmpMesh is None and mss.useFrameCache is True and mss.perFrameMaterial is False and mss.numMeshesInMemory > 0 and mss.splitObjectName == '':
+        with profiling.timedSection('loadMeshFromFrameCache'):
+            tmpMesh = loadMeshFromFrameCache(filename)
+
+    # the shared cache has no materials either, so it's only used once the sequence has one
+    if tmpMesh is None and mss.useSharedCache is True and mss.perFrameMaterial is False and mss.numMeshesInMemory > 0 and mss.splitObjectName == '':
+        with profiling.timedSection('loadMeshFromSharedCache'):
+            tmpMesh = loadMeshFromSharedCache(obj, filename)
+
+    if tmpMesh is None and needsNativeReader(filename):
+        with profiling.timedSection('loadMeshWithNativeReader'):
+            tmpMesh = loadMeshWithNativeReader(filename, mss.fileFormat, nativeMergeDistance(mss))
+
+    if tmpMesh is None:
+        deselectAll()
+
+        lockLoadingSequence(True)
+        with profiling.timedSection('importer'):
+            mss.fileImporter.load(mss.fileFormat, filename, True, splitObjects=(mss.splitObjectName != ''))
+        lockLoadingSequence(False)
+
+        selectedObjects = getSelectedObjects()
+        if mss.splitObjectName != '':
+            tmpObject = distributeSplitMeshes(obj, idx, selectedObjects)
+        else:
+            tmpObject = next(filter(lambda meshObj: meshObj.type == 'MESH', selectedObjects), None)
+
+        # if tmpObject is None, we'll need to create an empty mesh to take its place
+        if (tmpObject is None):
+            # take the frame numbers off the basename
+            meshBaseName = os.path.splitext(mss.meshNameArray[idx].basename)[0]
+            tmpMesh = bpy.data.meshes.new(meshBaseName)
+        else:
+            tmpMesh = tmpObject.data
+
+            if mss.perFrameMaterial is True:
+                deduplicateMeshMaterials(tmpMesh, filename, mss.fileFormat)
+
+        # make a list of the objects we're going to delete
+        objsToDelete = selectedObjects.copy()
+
+        # now delete all selected objects
+        for objToDelete in objsToDelete:
+            bpy.data.objects.remove(objToDelete, do_unlink=True)
+
+    storeStreamedMesh(obj, idx, tmpMesh)
+    return tmpMesh
+
+
+class MeshReferenceIndex:
+    """How many of a sequence's in-memory frames use each mesh, and which mesh was loaded for each file hash"""
+
+    def __init__(self, mss):
+        self.refCounts = {}
+        self.keysByDigest = {}
+        self.digestsByKey = {}
+        for meshNameElement in mss.meshNameArray:
+            if meshNameElement.inMemory is True:
+                self.add(meshNameElement.key, meshNameElement.contentHash)
+        self.signature = self.getSignature(mss)
+
+    # meshNameArray changes that don't go through storeStreamedMesh or removeMeshFromCache (loading, reloading, resuming)
+    #   change the number of frames or meshes in memory, so the index is rebuilt when these don't match
+    @staticmethod
+    def getSignature(mss):
+        return (len(mss.meshNameArray), mss.numMeshesInMemory)
+
+    def add(self, meshKey, digest):
+        self.refCounts[meshKey] = self.refCounts.get(meshKey, 0) + 1
+        if digest != '':
+            self.keysByDigest.setdefault(digest, meshKey)
+            self.digestsByKey.setdefault(meshKey, digest)
+
+    def remove(self, meshKey):
+        numRefs = self.refCounts.get(meshKey, 0) - 1
+        if numRefs > 0:
+            self.refCounts[meshKey] = numRefs
+            return
+        self.refCounts.pop(meshKey, None)
+        digest = self.digestsByKey.pop(meshKey, None)
+        if digest is not None and self.keysByDigest.get(digest) == meshKey:
+            del self.keysByDigest[digest]
+
+
+def getMeshReferenceIndex(mss):
+    objName = mss.id_data.name
+    index = meshReferenceIndexes.get(objName)
+    if index is None or index.signature != MeshReferenceIndex.getSignature(mss):
+        index = MeshReferenceIndex(mss)
+        meshReferenceIndexes[objName] = index
+    return index
+
+
+# undo and redo put meshNameArray back the way it was, which the indexes can't tell
+@persistent
+def clearMeshReferenceIndexes(scene):
+    meshReferenceIndexes.clear()
+
+
+def findSharedMeshKey(mss, digest):
+    meshKey = getMeshReferenceIndex(mss).keysByDigest.get(digest)
+    if meshKey is not None and meshKey in bpy.data.meshes:
+        return meshKey
+    return None
+
+
+# how many frames of the sequence currently use the given mesh
+def countMeshReferences(mss, meshKey):
+    return getMeshReferenceIndex(mss).refCounts.get(meshKey, 0)
+
+
+# returns (number of distinct meshes, number of frames) over the frames that are in memory
+def getFrameSharingStats(obj):
+    mss = obj.mesh_sequence_settings
+    meshKeys = [meshNameElement.key for meshNameElement in mss.meshNameArray[1:] if meshNameElement.inMemory is True]
+    return len(set(meshKeys)), len(meshKeys)
 
-    # now delete all selected objects
-    for obj in objsToDelete:
-        bpy.data.objects.remove(obj, do_unlink=True)
 
+def storeStreamedMesh(obj, idx, mesh):
+    mss = obj.mesh_sequence_settings
+    index = getMeshReferenceIndex(mss)
     # we want to make sure the cached meshes are saved to the .blend file
-    tmpMesh.use_fake_user = True
-    tmpMesh.inMeshSequence = True
-    mss.meshNameArray[idx].key = tmpMesh.name
+    mesh.use_fake_user = True
+    mesh.inMeshSequence = True
+    mss.meshNameArray[idx].key = mesh.name
     mss.meshNameArray[idx].inMemory = True
     mss.numMeshesInMemory += 1
-    return tmpMesh
+    index.add(mesh.name, mss.meshNameArray[idx].contentHash)
+    index.signature = MeshReferenceIndex.getSignature(mss)
+    # the loaded mesh has the importer's axes and scale, which bounds from a frame cache may not
+    setBoundsFromMesh(mss.meshNameArray[idx], mesh)
+
+
+# if the file has a frame cache, its header already has the bounding box
+# (frame caches are in the file's own space, so their bounds are only right for sequences that load from them)
+def setBoundsFromFrameCache(mss, meshNameElement, filePath):
+    if mss.useFrameCache is False:
+        return
+    cachePath = mesh_readers.frameCachePath(filePath)
+    if mesh_readers.isFrameCacheFresh(filePath, cachePath) is False:
+        return
+    try:
+        meshNameElement.bboxMin, meshNameElement.bboxMax = mesh_readers.readFrameCacheBounds(cachePath)
+    except (OSError, ValueError, struct.error):
+        return
+    meshNameElement.hasBounds = True
+
+
+def setBoundsFromMesh(meshNameElement, mesh):
+    if len(mesh.vertices) == 0:
+        return
+    positions = array.array('f', bytes(12 * len(mesh.vertices)))
+    mesh.vertices.foreach_get('co', positions)
+    meshNameElement.bboxMin = (min(positions[0::3]), min(positions[1::3]), min(positions[2::3]))
+    meshNameElement.bboxMax = (max(positions[0::3]), max(positions[1::3]), max(positions[2::3]))
+    meshNameElement.hasBounds = True
+
 
+def getBoundsCorners(meshNameElement):
+    bboxMin = meshNameElement.bboxMin
+    bboxMax = meshNameElement.bboxMax
+    return [(x, y, z) for x in (bboxMin[0], bboxMax[0]) for y in (bboxMin[1], bboxMax[1]) for z in (bboxMin[2], bboxMax[2])]
 
+
+# whether a frame's bounding box is completely outside the active camera's view
+def isFrameOffCamera(obj, meshNameElement, scene):
+    camera = scene.camera
+    if camera is None or meshNameElement.hasBounds is False:
+        return False
+
+    viewCoords = [world_to_camera_view(scene, camera, obj.matrix_world @ Vector(corner)) for corner in getBoundsCorners(meshNameElement)]
+    return (all(co.x < 0.0 for co in viewCoords) or all(co.x > 1.0 for co in viewCoords)
+            or all(co.y < 0.0 for co in viewCoords) or all(co.y > 1.0 for co in viewCoords)
+            or all(co.z < 0.0 for co in viewCoords))
+
+
+# show an off-camera frame as its bounding box, without loading the mesh
+def showFrameBounds(obj, idx):
+    mss = obj.mesh_sequence_settings
+    mss.curVisibleMeshIdx = idx
+    meshNameElement = mss.meshNameArray[idx]
+    if meshNameElement.hasBounds is False:
+        return
+
+    boundsMesh = mss.boundsMesh
+    if boundsMesh is None:
+        boundsMesh = bpy.data.meshes.new(obj.name + '_bounds')
+        boundsMesh.vertices.add(8)
+        mss.boundsMesh = boundsMesh
+    boundsMesh.vertices.foreach_set('co', [value for corner in getBoundsCorners(meshNameElement) for value in corner])
+    boundsMesh.update()
+
+    if obj.data != boundsMesh:
+        # carry the sequence's materials over so they can be copied back onto the next real mesh
+        boundsMesh.materials.clear()
+        for material in obj.data.materials:
+            boundsMesh.materials.append(material)
+        mss.storedDisplayType = obj.display_type
+        obj.data = boundsMesh
+        obj.display_type = 'BOUNDS'
+
+
+# After a multi-object file was imported for obj, give each of the other objects' meshes to its own sequence,
+#   so the file doesn't have to be imported again for them.
+# Returns the imported object that belongs to obj (or None if the file doesn't have it)
+def distributeSplitMeshes(obj, idx, importedObjects):
+    mss = obj.mesh_sequence_settings
+    siblings = {sibling.mesh_sequence_settings.splitObjectName: sibling for sibling in getSplitSiblings(obj)}
+    ownObject = None
+    unusedMeshes = []
+    for importedObj in importedObjects:
+        if importedObj.type != 'MESH':
+            continue
+
+        objName = splitObjectKey(importedObj.name)
+        if objName == mss.splitObjectName and ownObject is None:
+            ownObject = importedObj
+            continue
+
+        sibling = siblings.get(objName)
+        if sibling is None or sibling == obj or sibling.mesh_sequence_settings.meshNameArray[idx].inMemory is True:
+            unusedMeshes.append(importedObj.data)
+            continue
+
+        siblingMss = sibling.mesh_sequence_settings
+        if siblingMss.perFrameMaterial is True:
+            deduplicateMeshMaterials(importedObj.data, os.path.join(bpy.path.abspath(siblingMss.dirPath), siblingMss.meshNameArray[idx].basename), siblingMss.fileFormat)
+        elif siblingMss.numMeshesInMemory > 0:
+            deleteLinkedMeshMaterials(importedObj.data)
+        storeStreamedMesh(sibling, idx, importedObj.data)
+
+        # keep the sibling within its own cache size. Its next frame change will most likely show this mesh, so that one stays
+        schedule = renderSchedules.get(sibling.name) if inRenderMode is True else None
+        trimStreamingCache(sibling, bpy.context.scene.frame_current, idx, schedule)
+
+    # nobody needs the meshes of objects that have no sequence (or that were already loaded)
+    for mesh in unusedMeshes:
+        deleteLinkedMeshMaterials(mesh)
+    removeDatablocks(bpy.data.meshes, unusedMeshes)
+
+    return ownObject
+
+
+@profiling.timed('removeMeshFromCache')
 def removeMeshFromCache(obj, meshIdx):
     mss = obj.mesh_sequence_settings
     meshToRemoveKey = mss.meshNameArray[meshIdx].key
-    removeMeshFromScene(meshToRemoveKey, mss.perFrameMaterial)
+    index = getMeshReferenceIndex(mss)
+
+    # shared meshes are only removed along with the last frame that uses them
+    if index.refCounts.get(meshToRemoveKey, 0) <= 1:
+        removeMeshFromScene(meshToRemoveKey, mss.perFrameMaterial)
     mss.meshNameArray[meshIdx].inMemory = False
     mss.meshNameArray[meshIdx].key = ''
     mss.numMeshesInMemory -= 1
+    index.remove(meshToRemoveKey)
+    index.signature = MeshReferenceIndex.getSignature(mss)
 
 
 def removeMeshFromScene(meshKey, removeOwnedMaterials):
@@ -1214,7 +2840,10 @@ def removeMeshFromScene(meshKey, removeOwnedMaterials):
             deleteLinkedMeshMaterials(meshToRemove)
         
         meshToRemove.use_fake_user = False
+        proxy = meshToRemove.proxyMesh
         bpy.data.meshes.remove(meshToRemove)
+        if proxy is not None:
+            bpy.data.meshes.remove(proxy)
 
 # shadeMesh function
 def shadeMesh(mesh, smooth):
@@ -1223,6 +2852,10 @@ def shadeMesh(mesh, smooth):
     # update the mesh to force a UI update
     mesh.update()
 
+    # keep the viewport proxy looking the same
+    if mesh.proxyMesh is not None:
+        shadeMesh(mesh.proxyMesh, smooth)
+
 
 def shadeSequence(obj, smooth):
     mss = obj.mesh_sequence_settings
@@ -1247,6 +2880,26 @@ def shadeSequence(obj, smooth):
                 shadeMesh(mesh, useSmooth)
     
 
+# write a whole list of (frame, value) keyframes into new fcurves at once, with constant interpolation
+# this is much faster than calling keyframe_insert() for every keyframe
+def setConstantKeyframes(obj, dataPaths, keys):
+    if obj.animation_data is None:
+        obj.animation_data_create()
+    if obj.animation_data.action is None:
+        obj.animation_data.action = bpy.data.actions.new(name=obj.name + 'Action')
+    action = obj.animation_data.action
+
+    coords = [coord for key in keys for coord in key]
+    constantInterpolation = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['CONSTANT'].value
+    for dataPath in dataPaths:
+        fcurve = action.fcurves.new(data_path=dataPath)
+        fcurve.keyframe_points.add(len(keys))
+        fcurve.keyframe_points.foreach_set('co', coords)
+        fcurve.keyframe_points.foreach_set('interpolation', [constantInterpolation] * len(keys))
+        fcurve.update()
+
+
+@profiling.timed('bakeSequence')
 def bakeSequence(_obj):
     scn = bpy.context.scene
     activeCollection = bpy.context.collection
@@ -1280,21 +2933,17 @@ def bakeSequence(_obj):
     # for each mesh (including the empty mesh):
     for meshName in meshNameElements:
         currentMesh = bpy.data.meshes[meshName.key]
+        if currentMesh in meshToObject:
+            continue
         # even though it's kinda still part of a mesh sequence, it's not really anymore
         currentMesh.inMeshSequence = False
         tmpObj = bpy.data.objects.new('o_' + currentMesh.name, currentMesh)
         activeCollection.objects.link(tmpObj)
         currentMesh.use_fake_user = False
         meshToObject[currentMesh] = tmpObj
-        # in the object, add keyframes at frames 0 and the last frame of the animation:
+        # every object is hidden unless its keyframes say otherwise
         tmpObj.hide_viewport = True
-        tmpObj.keyframe_insert(data_path='hide_viewport', frame=scn.frame_start)
-        tmpObj.keyframe_insert(data_path='hide_viewport', frame=scn.frame_end)
-
         tmpObj.hide_render = True
-        tmpObj.keyframe_insert(data_path='hide_render', frame=scn.frame_start)
-        tmpObj.keyframe_insert(data_path='hide_render', frame=scn.frame_end)
-
         tmpObj.parent = containerObj
 
     # If this is a single-material sequence, make sure the material is copied to the whole sequence
@@ -1312,32 +2961,139 @@ def bakeSequence(_obj):
             for material in objMaterials:
                 currentMesh.materials.append(material)
 
+    # work out the whole visibility schedule first. Each object only needs a keyframe when it appears or disappears
+    # visibilityKeys maps each object to a list of (frame, hidden) pairs
+    visibilityKeys = {tmpObj: [] for tmpObj in meshToObject.values()}
+    prevFrameObj = None
     for frameNum in range(scn.frame_start, scn.frame_end + 1):
-        # figure out which mesh is visible
+        # figure out which mesh is visible and which object it belongs to
         idx = getMeshIdxFromFrameNumber(_obj, frameNum)
-        frameMesh = getMeshFromIndex(_obj, idx)
+        frameObj = meshToObject[getMeshFromIndex(_obj, idx)]
+        if frameObj is not prevFrameObj:
+            if prevFrameObj is not None:
+                visibilityKeys[prevFrameObj].append((frameNum, 1.0))
+            visibilityKeys[frameObj].append((frameNum, 0.0))
+            prevFrameObj = frameObj
+
+    if prevFrameObj is not None:
+        visibilityKeys[prevFrameObj].append((scn.frame_end + 1, 1.0))
+
+    for tmpObj, keys in visibilityKeys.items():
+        # objects that aren't visible on the first frame need to start out hidden
+        if len(keys) == 0 or keys[0][0] != scn.frame_start:
+            keys.insert(0, (scn.frame_start, 1.0))
+        setConstantKeyframes(tmpObj, ('hide_viewport', 'hide_render'), keys)
 
-        # use the dictionary to find which object the mesh belongs to
-        frameObj = meshToObject[frameMesh]
-
-        # add two keyframes to the object at the current frame:
-        frameObj.hide_viewport = False
-        frameObj.keyframe_insert(data_path='hide_viewport', frame=frameNum)
+    # delete the sequence object
+    deselectAll()
+    _obj.select_set(state=True)
+    bpy.ops.object.delete()
 
-        frameObj.hide_render = False
-        frameObj.keyframe_insert(data_path='hide_render', frame=frameNum)
 
-        # add two keyframes to the object at the next frame:
-        frameObj.hide_viewport = True
-        frameObj.keyframe_insert(data_path='hide_viewport', frame=frameNum + 1)
+# Returns an error message, or an empty string if every frame can go into a point cache
+def checkPointCacheCompatible(obj, scene):
+    mss = obj.mesh_sequence_settings
+    if mss.initialized is False or mss.loaded is False:
+        return "The sequence isn't loaded"
+    if mss.instanceOf is not None:
+        return "Instances have no meshes of their own. Bake the sequence they show instead"
+    if mss.cacheMode != 'cached':
+        return "Only Cached sequences can be baked to a point cache"
+    if mss.numMeshes < 2 or len(mss.meshNameArray) < mss.numMeshes:
+        return "The sequence has no meshes to bake"
+    if any(mss.meshNameArray[idx].key not in bpy.data.meshes for idx in range(1, mss.numMeshes)):
+        return "Some of the sequence's meshes are missing. Try reloading it"
+
+    numVerts = len(getMeshFromIndex(obj, 1).vertices)
+    for idx in range(2, mss.numMeshes):
+        if len(getMeshFromIndex(obj, idx).vertices) != numVerts:
+            return "Every mesh needs the same number of vertices to be baked to a point cache"
+
+    for frameNum in range(scene.frame_start, scene.frame_end + 1):
+        if getMeshIdxFromFrameNumber(obj, frameNum) == 0:
+            return "Blank frames can't be stored in a point cache. Try a different playback mode"
+
+    return ""
+
+
+# Write every frame's vertex positions into a single PC2 point cache file, then replace the sequence
+#   with one mesh object that plays the point cache back with a Mesh Cache modifier
+def bakeSequenceToPointCache(_obj, filePath):
+    scn = bpy.context.scene
+    mss = _obj.mesh_sequence_settings
+    firstMesh = getMeshFromIndex(_obj, 1)
+    numVerts = len(firstMesh.vertices)
+    frameRange = range(scn.frame_start, scn.frame_end + 1)
+
+    # PC2 header: signature, file version, number of points, start frame, sample rate, number of samples
+    header = struct.pack('<12siiffi', b'POINTCACHE2\0', 1, numVerts, float(scn.frame_start), 1.0, len(frameRange))
+
+    # each distinct mesh only has its positions read once, no matter how many frames it's shown on
+    positionsByIdx = {}
+    with open(bpy.path.abspath(filePath), 'wb') as f:
+        f.write(header)
+        for frameNum in frameRange:
+            idx = getMeshIdxFromFrameNumber(_obj, frameNum)
+            positions = positionsByIdx.get(idx)
+            if positions is None:
+                positions = array.array('f', [0.0]) * (numVerts * 3)
+                getMeshFromIndex(_obj, idx).vertices.foreach_get('co', positions)
+                positionsByIdx[idx] = positions
+            positions.tofile(f)
+
+    # the new object gets its own copy of the first mesh, including its materials
+    bakedMesh = firstMesh.copy()
+    bakedMesh.name = _obj.name + '_pointcache'
+    bakedMesh.use_fake_user = False
+    bakedMesh.inMeshSequence = False
+    if mss.perFrameMaterial is False:
+        bakedMesh.materials.clear()
+        for material in _obj.data.materials:
+            bakedMesh.materials.append(material)
+
+    bakedObj = bpy.data.objects.new(createUniqueName(_obj.name + '_pointcache', bpy.data.objects), bakedMesh)
+    for collection in _obj.users_collection:
+        collection.objects.link(bakedObj)
+    bakedObj.parent = _obj.parent
+    bakedObj.matrix_world = _obj.matrix_world.copy()
 
-        frameObj.hide_render = True
-        frameObj.keyframe_insert(data_path='hide_render', frame=frameNum + 1)
+    if _obj.animation_data is not None:
+        seq_anim = _obj.animation_data
+        properties = [p.identifier for p in seq_anim.bl_rna.properties if not p.is_readonly]
+        baked_anim = bakedObj.animation_data_create()
+        for prop in properties:
+            setattr(baked_anim, prop, getattr(seq_anim, prop))
+
+    meshCacheMod = bakedObj.modifiers.new(name='Mesh Cache', type='MESH_CACHE')
+    meshCacheMod.cache_format = 'PC2'
+    meshCacheMod.filepath = filePath
+    meshCacheMod.play_mode = 'SCENE'
+    meshCacheMod.time_mode = 'FRAME'
+    meshCacheMod.frame_start = scn.frame_start
+    # the positions were written in Blender's own coordinate system
+    meshCacheMod.forward_axis = 'POS_Y'
+    meshCacheMod.up_axis = 'POS_Z'
+
+    # the sequence's meshes are no longer needed
+    deepDeleteSequence(_obj)
+    bpy.data.objects.remove(_obj, do_unlink=True)
 
-    # delete the sequence object
     deselectAll()
-    _obj.select_set(state=True)
-    bpy.ops.object.delete()
+    bakedObj.select_set(state=True)
+    bpy.context.view_layer.objects.active = bakedObj
+    return bakedObj
+
+
+# remove a group of datablocks in one go. bpy.data.batch_remove only has to check ID users once for the whole group
+def removeDatablocks(collection, datablocks):
+    if len(datablocks) == 0:
+        return
+
+    if hasattr(bpy.data, 'batch_remove'):
+        bpy.data.batch_remove(ids=datablocks)
+    else:
+        for datablock in datablocks:
+            collection.remove(datablock)
 
 
 def deepDeleteSequence(obj):
@@ -1345,42 +3101,39 @@ def deepDeleteSequence(obj):
     if mss.initialized is not True or mss.loaded is not True:
         return
     
-    # make a list of all unique material and image texture used by any mesh in the sequence
-    meshes = []
-    materials = []
-    images = []
-    for meshName in mss.meshNameArray:
-        # add unique meshes to the list
-        if meshName.key not in meshes:
-            meshes.append(meshName.key)
-
-        if meshName.inMemory is True:
-            mesh = bpy.data.meshes[meshName.key]
-            for material in mesh.materials:
-                # add unique materials to the list
-                if material.name not in materials:
-                    materials.append(material.name)
-                
-                # we're assuming the default import paradigm was used for creating materials:
-                if hasattr(material, "node_tree") and "Image Texture" in material.node_tree.nodes:
-                    imageKey = material.node_tree.nodes['Image Texture'].image.name
-                    if imageKey not in images:
-                        images.append(imageKey)
+    # find every mesh in the sequence with a single pass over bpy.data.meshes (looking meshes up by name is not constant-time)
+    meshKeys = {meshName.key for meshName in mss.meshNameArray}
+    meshes = [mesh for mesh in bpy.data.meshes if mesh.name in meshKeys]
+    meshes += [mesh.proxyMesh for mesh in meshes if mesh.proxyMesh is not None]
+    if mss.boundsMesh is not None:
+        meshes.append(mss.boundsMesh)
+
+    # make a set of all unique materials and image textures used by any mesh in the sequence
+    materials = set()
+    for mesh in meshes:
+        materials.update(material for material in mesh.materials if material is not None)
+
+    images = set()
+    for material in materials:
+        # we're assuming the default import paradigm was used for creating materials:
+        if hasattr(material, "node_tree") and material.node_tree is not None and "Image Texture" in material.node_tree.nodes:
+            image = material.node_tree.nodes['Image Texture'].image
+            if image is not None:
+                images.add(image)
+
+    # instances can't show a sequence that no longer exists
+    for instance in getSequenceInstances(obj):
+        instance.mesh_sequence_settings.instanceOf = None
+        instance.mesh_sequence_settings.loaded = False
 
     # delete all meshes in the sequence
-    for meshKey in meshes:
-        if meshKey in bpy.data.meshes:
-            bpy.data.meshes.remove(bpy.data.meshes[meshKey])
-            
+    removeDatablocks(bpy.data.meshes, meshes)
+
     # delete each material that no longer has any meshes referencing it
-    for materialKey in materials:
-        if materialKey in bpy.data.materials and bpy.data.materials[materialKey].users == 0:
-            bpy.data.materials.remove(bpy.data.materials[materialKey])
+    removeDatablocks(bpy.data.materials, [material for material in materials if material.users == 0])
 
     # delete each image that no longer has any materials referencing it
-    for imageKey in images:
-        if imageKey in bpy.data.images and bpy.data.images[imageKey].users == 0:
-            bpy.data.images.remove(bpy.data.images[imageKey])
+    removeDatablocks(bpy.data.images, [image for image in images if image.users == 0])
 
 
 def mergeDuplicateMaterials(obj):
@@ -1420,23 +3173,245 @@ def mergeDuplicateMaterials(obj):
 
 
 def freeUnusedMeshes():
+    # gather every mesh name used by a sequence once, then reconcile fake users in a single pass over the meshes
+    sequenceMeshKeys = set()
+    for t_obj in bpy.data.objects:
+        mss = t_obj.mesh_sequence_settings
+        if mss.initialized is True and mss.loaded is True:
+            sequenceMeshKeys.update(t_meshName.key for t_meshName in mss.meshNameArray)
+
     numFreed = 0
     for t_mesh in bpy.data.meshes:
-        if t_mesh.inMeshSequence is True:
+        if t_mesh.name in sequenceMeshKeys:
+            if t_mesh.use_fake_user is False:
+                t_mesh.use_fake_user = True
+        elif t_mesh.inMeshSequence is True and t_mesh.use_fake_user is True:
             t_mesh.use_fake_user = False
             numFreed += 1
-    for t_obj in bpy.data.objects:
-        mss = t_obj.mesh_sequence_settings
-        if mss.initialized is True and mss.loaded is True:
-            for t_meshName in mss.meshNameArray:
-                if bpy.data.meshes.find(t_meshName.key) != -1:
-                    bpy.data.meshes[t_meshName.key].use_fake_user = True
-                    numFreed -= 1
 
     # the remaining meshes with no real or fake users will be garbage collected when Blender is closed
     print(numFreed, " meshes freed")
 
 
+# runs every time the "Record Timings" checkbox is changed
+def handleTimingEnabledChange(self, context):
+    profiling.setTimingEnabled(self.smoTimingEnabled)
+    return None
+
+
+# the checkboxes are saved with the window manager, so a loaded file may have them set differently than the recorders are
+@persistent
+def syncRecordingSettings(scene):
+    wm = bpy.context.window_manager
+    if wm is not None:
+        profiling.setTimingEnabled(wm.smoTimingEnabled)
+        profiling.setAccessTraceEnabled(wm.smoAccessTraceEnabled)
+
+
+class DumpTimingTrace(bpy.types.Operator, ExportHelper):
+    """Save the recorded timings to a .csv or .json file"""
+    bl_idname = "ms.dump_timing_trace"
+    bl_label = "Save Timings"
+
+    filename_ext = ".csv"
+    filter_glob: bpy.props.StringProperty(default="*.csv;*.json", options={'HIDDEN'})
+
+    fileFormat: bpy.props.EnumProperty(
+        name='Format',
+        items=[('csv', 'CSV', 'One row per timed call'),
+               ('json', 'JSON', 'A list of {name, start, duration} records')],
+        default='csv')
+
+    # ExportHelper fixes up the file name's extension from filename_ext, so follow the chosen format
+    def check(self, context):
+        self.filename_ext = '.' + self.fileFormat
+        return ExportHelper.check(self, context)
+
+    def execute(self, context):
+        filePath = bpy.path.ensure_ext(os.path.splitext(self.filepath)[0], '.' + self.fileFormat)
+        numRecords = profiling.writeTimingTrace(filePath, self.fileFormat)
+        self.report({'INFO'}, "Saved " + str(numRecords) + " timings to " + filePath)
+        return {'FINISHED'}
+
+
+class ClearTimingTrace(bpy.types.Operator):
+    """Forget all recorded timings"""
+    bl_idname = "ms.clear_timing_trace"
+    bl_label = "Clear Timings"
+
+    def execute(self, context):
+        profiling.clearTimings()
+        return {'FINISHED'}
+
+
+# runs every time the "Record Access Trace" checkbox is changed
+def handleAccessTraceEnabledChange(self, context):
+    profiling.setAccessTraceEnabled(self.smoAccessTraceEnabled)
+    return None
+
+
+class RefreshSharedCacheUsage(bpy.types.Operator):
+    """Count the frames in the shared frame cache and how much memory they take"""
+    bl_idname = "ms.refresh_shared_cache_usage"
+    bl_label = "Count Shared Frames"
+
+    def execute(self, context):
+        shared_cache.sharedCacheUsage()
+        return {'FINISHED'}
+
+
+class DumpAccessTrace(bpy.types.Operator, ExportHelper):
+    """Save the recorded streaming cache accesses to a .csv file, to replay with cache_simulator.py"""
+    bl_idname = "ms.dump_access_trace"
+    bl_label = "Save Access Trace"
+
+    filename_ext = ".csv"
+    filter_glob: bpy.props.StringProperty(default="*.csv", options={'HIDDEN'})
+
+    def execute(self, context):
+        numRecords = profiling.writeAccessTrace(self.filepath)
+        self.report({'INFO'}, "Saved " + str(numRecords) + " accesses to " + self.filepath)
+        return {'FINISHED'}
+
+
+class ClearAccessTrace(bpy.types.Operator):
+    """Forget all recorded streaming cache accesses"""
+    bl_idname = "ms.clear_access_trace"
+    bl_label = "Clear Access Trace"
+
+    def execute(self, context):
+        profiling.clearAccessTrace()
+        return {'FINISHED'}
+
+
+# bumped by every undo and redo, so a running import can tell that the data it was working on has been replaced
+numUndoSteps = 0
+
+
+@persistent
+def countUndoSteps(scene):
+    global numUndoSteps
+    numUndoSteps += 1
+
+
+def isUndoEvent(event):
+    return event.type in ('Z', 'Y') and (event.ctrl is True or event.oskey is True)
+
+
+class ImportSequenceFrames(bpy.types.Operator):
+    """Load the frames of a new Cached sequence a few at a time, so Blender stays responsive. Press Esc to stop and keep the frames loaded so far"""
+    bl_idname = "ms.import_sequence_frames"
+    bl_label = "Load Sequence Frames"
+    bl_options = {'UNDO'}
+
+    objectName: bpy.props.StringProperty()
+    # add the missing frames to an existing sequence instead of loading a new one
+    resume: bpy.props.BoolProperty(default=False)
+
+    def invoke(self, context, event):
+        obj = bpy.data.objects.get(self.objectName)
+        if obj is None:
+            return {'CANCELLED'}
+
+        mss = obj.mesh_sequence_settings
+        # keep the frame change handlers away from the sequence while frames are added and removed
+        mss.loaded = False
+        self.frameLoads = iterLoadSequenceFromMeshFiles(obj, mss.dirPath, mss.fileName, self.resume)
+        self.numFrames = 0
+        self.numFiles = 0
+        self.startTime = time.perf_counter()
+        self.undoStep = numUndoSteps
+
+        wm = context.window_manager
+        self.timer = wm.event_timer_add(LOADER_TIMER_INTERVAL, window=context.window)
+        wm.progress_begin(0, 100)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            return self.finish(context, stopped=True)
+        # undoing in the middle of an import would free the data it's adding frames to
+        if isUndoEvent(event):
+            return {'RUNNING_MODAL'}
+        # (an undo from a menu still gets through, so stop if one happened)
+        if numUndoSteps != self.undoStep:
+            return self.finish(context, stopped=True)
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        # the object might have been deleted in the meantime
+        if bpy.data.objects.get(self.objectName) is None:
+            return self.finish(context, stopped=True)
+
+        # the user may have selected something since the last batch, and the importers work on the selection
+        deselectAll()
+        sliceEnd = time.perf_counter() + LOADER_TIME_SLICE
+        try:
+            while time.perf_counter() < sliceEnd:
+                self.numFrames, self.numFiles, file = next(self.frameLoads)
+        except StopIteration:
+            return self.finish(context, stopped=False)
+
+        elapsed = time.perf_counter() - self.startTime
+        remaining = elapsed / max(self.numFrames, 1) * (self.numFiles - self.numFrames)
+        context.workspace.status_text_set("Loading sequence: %d / %d frames, about %s left (Esc to stop)" % (self.numFrames, self.numFiles, formatDuration(remaining)))
+        context.window_manager.progress_update(100 * self.numFrames // max(self.numFiles, 1))
+        return {'RUNNING_MODAL'}
+
+    def finish(self, context, stopped):
+        wm = context.window_manager
+        wm.event_timer_remove(self.timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+        self.frameLoads.close()
+
+        obj = bpy.data.objects.get(self.objectName)
+        if obj is None:
+            return {'CANCELLED'}
+
+        numFrames = finishLoadingSequence(obj)
+        if numFrames == 0:
+            if self.resume is False:
+                bpy.data.objects.remove(obj, do_unlink=True)
+            self.report({'WARNING'}, "Stopped before any frames were loaded")
+            return {'CANCELLED'}
+
+        if self.resume is False:
+            nameSequenceFromMeshes(obj)
+        if stopped is True:
+            self.report({'INFO'}, "Stopped after loading %d of %d files. Use Resume Import to load the rest" % (self.numFrames, self.numFiles))
+        elif self.resume is True:
+            self.report({'INFO'}, "Loaded %d files" % self.numFrames)
+        return {'FINISHED'}
+
+
+class ResumeImport(bpy.types.Operator):
+    """Import the files that this Cached sequence doesn't have yet (e.g. after a stopped or crashed import), and re-import any that changed since they were loaded"""
+    bl_idname = "ms.resume_import"
+    bl_label = "Resume Import"
+    bl_options = {'UNDO'}
+
+    def execute(self, context):
+        if context.mode != 'OBJECT':
+            self.report({'ERROR'}, "You may resume an import only while in Object mode")
+            return {'CANCELLED'}
+
+        obj = context.object
+        mss = obj.mesh_sequence_settings
+        if context.window is not None:
+            bpy.ops.ms.import_sequence_frames('INVOKE_DEFAULT', objectName=obj.name, resume=True)
+            return {'FINISHED'}
+
+        numFiles = 0
+        mss.loaded = False
+        for numFiles, totalFiles, file in iterLoadSequenceFromMeshFiles(obj, mss.dirPath, mss.fileName, resume=True):
+            pass
+        finishLoadingSequence(obj)
+        self.report({'INFO'}, "Loaded %d files" % numFiles)
+        return {'FINISHED'}
+
+
 class ReloadMeshSequence(bpy.types.Operator):
     """Reload From Disk"""
     bl_idname = "ms.reload_mesh_sequence"
@@ -1494,6 +3469,58 @@ class BatchShadeFlat(bpy.types.Operator):
         return {'FINISHED'}
 
 
+# make (or remake) the viewport proxy of every frame that's in memory
+def generateSequenceProxies(obj):
+    mss = obj.mesh_sequence_settings
+    absDirectory = bpy.path.abspath(mss.dirPath)
+    numProxies = 0
+    for meshNameElement in mss.meshNameArray[1:]:
+        if meshNameElement.inMemory is False or meshNameElement.key not in bpy.data.meshes:
+            continue
+        mesh = bpy.data.meshes[meshNameElement.key]
+        if len(mesh.vertices) == 0:
+            continue
+
+        sourcePath = ''
+        if mss.isImported is True and meshNameElement.basename != '':
+            sourcePath = os.path.join(absDirectory, meshNameElement.basename)
+        getProxyMesh(mesh, mss.proxyResolution, sourcePath)
+        numProxies += 1
+    return numProxies
+
+
+class GenerateProxies(bpy.types.Operator):
+    """Make the simplified viewport version of every loaded frame now, instead of during playback"""
+    bl_idname = "ms.generate_proxies"
+    bl_label = "Generate Proxies"
+    bl_options = {'UNDO'}
+
+    def execute(self, context):
+        if context.mode != 'OBJECT':
+            self.report({'ERROR'}, "You may generate proxies only while in Object mode")
+            return {'CANCELLED'}
+
+        numProxies = generateSequenceProxies(context.object)
+        updateFrame(0)
+        self.report({'INFO'}, "Generated " + str(numProxies) + " proxies")
+        return {'FINISHED'}
+
+
+class AddSequenceInstance(bpy.types.Operator):
+    """Add an object that shows this sequence's meshes with its own start frame, speed, and frame mode. Every file is loaded only once, however many instances show it"""
+    bl_idname = "ms.add_sequence_instance"
+    bl_label = "Add Instance"
+    bl_options = {'UNDO'}
+
+    def execute(self, context):
+        if context.mode != 'OBJECT':
+            self.report({'ERROR'}, "You may add an instance only while in Object mode")
+            return {'CANCELLED'}
+
+        addSequenceInstance(context.object)
+        return {'FINISHED'}
+
+
 class BakeMeshSequence(bpy.types.Operator):
     """Bake Sequence"""
     bl_idname = "ms.bake_sequence"
@@ -1512,6 +3539,43 @@ class BakeMeshSequence(bpy.types.Operator):
         return {'FINISHED'}
 
 
+class BakePointCache(bpy.types.Operator, ExportHelper):
+    """Bake the sequence into a single PC2 point cache played back by a Mesh Cache modifier (every mesh must have the same vertex count)"""
+    bl_idname = "ms.bake_point_cache"
+    bl_label = "Bake to Point Cache"
+    bl_options = {'UNDO'}
+
+    filename_ext = ".pc2"
+    filter_glob: bpy.props.StringProperty(default="*.pc2", options={'HIDDEN'})
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        if obj is None:
+            return False
+        mss = obj.mesh_sequence_settings
+        return mss.initialized is True and mss.loaded is True and mss.cacheMode == 'cached' and mss.numMeshes >= 2
+
+    def execute(self, context):
+        if context.mode != 'OBJECT':
+            self.report({'ERROR'}, "You may bake a sequence only while in Object mode")
+            return {'CANCELLED'}
+
+        obj = context.object
+        errorMessage = checkPointCacheCompatible(obj, context.scene)
+        if errorMessage != "":
+            self.report({'ERROR'}, errorMessage)
+            return {'CANCELLED'}
+
+        # store the point cache path relative to the .blend file if we can
+        filePath = self.filepath
+        if bpy.data.is_saved is True:
+            filePath = bpy.path.relpath(filePath)
+
+        bakeSequenceToPointCache(obj, filePath)
+        return {'FINISHED'}
+
+
 class DeepDeleteSequence(bpy.types.Operator):
     """Deep Delete Sequence"""
     bl_idname = "ms.deep_delete_sequence"
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the add-on's package imports bpy, so tests import the bpy-free modules from src directly
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
@@ -0,0 +1,38 @@
+import cache_simulator
+import profiling
+
+
+def accessTrace(meshIdxs):
+    return [{'object': 'seq', 'frame': frame, 'meshIdx': meshIdx, 'hit': False, 'loadSeconds': 0.1, 'meshBytes': 1000}
+            for frame, meshIdx in enumerate(meshIdxs)]
+
+
+def test_belady_is_never_worse(tmp_path):
+    # playback loops over a short range, with the empty mesh in between
+    trace = accessTrace([1, 2, 3, 4, 5, 0, 1, 2, 3, 4, 5, 1, 2, 3, 4, 5])
+    for cacheSize in (2, 3, 4):
+        results = {policy: cache_simulator.simulate(trace, cacheSize, policy) for policy in cache_simulator.POLICIES}
+        for result in results.values():
+            assert result['accesses'] == 15
+            assert results['belady']['hits'] >= result['hits']
+            assert results['belady']['stallSeconds'] <= result['stallSeconds'] + 1e-9
+
+
+def test_unlimited_cache_only_misses_first_uses():
+    trace = accessTrace([3, 1, 3, 2, 1, 2, 3])
+    result = cache_simulator.simulate(trace, 0, 'smo')
+    assert result['hits'] == 4
+    assert abs(result['stallSeconds'] - 0.3) < 1e-9
+
+
+def test_saved_traces_can_be_replayed(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'accessTrace', profiling.deque())
+    profiling.recordAccess('a', 1, 1, False, 0.5, 100)
+    profiling.recordAccess('b', 1, 2, False, 0.25, 200)
+    profiling.recordAccess('a', 2, 1, True, 0.0, 100)
+    path = str(tmp_path / 'trace.csv')
+    assert profiling.writeAccessTrace(path) == 3
+
+    traces = cache_simulator.splitTraceByObject(cache_simulator.readAccessTrace(path))
+    assert list(traces.keys()) == ['a', 'b']
+    assert cache_simulator.simulate(traces['a'], 1, 'lru')['hits'] == 1
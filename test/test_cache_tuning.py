@@ -0,0 +1,57 @@
+import cache_tuning
+
+
+def playFrames(tuner, numFrames, stall, meshBytes=1000):
+    for i in range(numFrames):
+        if stall is True:
+            tuner.recordAccess(False, 0.1, 1 / 24, meshBytes)
+        else:
+            tuner.recordAccess(True, 0.0, 1 / 24, 0)
+
+
+def test_available_memory_is_read_from_meminfo(tmp_path):
+    meminfo = tmp_path / 'meminfo'
+    meminfo.write_text("MemTotal:       16384000 kB\nMemFree:         1000000 kB\nMemAvailable:    8192000 kB\n")
+    assert cache_tuning.readAvailableMemory(str(meminfo)) == 8192000 * 1024
+    # falls back to another source (or None) when there's no meminfo
+    fallback = cache_tuning.readAvailableMemory(str(tmp_path / 'missing'))
+    assert fallback is None or fallback > 0
+
+
+def test_cache_grows_while_playback_stalls_and_shrinks_when_it_does_not():
+    tuner = cache_tuning.CacheTuner(4)
+    playFrames(tuner, cache_tuning.ADJUST_INTERVAL, True)
+    assert tuner.shouldAdjust()
+    assert tuner.adjust(0.05, None, 4, 0.5, 100) == 6
+
+    playFrames(tuner, cache_tuning.ADJUST_INTERVAL, False)
+    assert tuner.adjust(0.05, None, 6, 0.5, 100) == 5
+
+    # never larger than the sequence
+    tuner = cache_tuning.CacheTuner(8)
+    playFrames(tuner, cache_tuning.ADJUST_INTERVAL, True)
+    assert tuner.adjust(0.05, None, 8, 0.5, 10) == 10
+
+
+def test_dropped_frames_count_as_stalls():
+    tuner = cache_tuning.CacheTuner(4)
+    for i in range(cache_tuning.ADJUST_INTERVAL):
+        if i % 2 == 0:
+            tuner.recordDroppedFrame()
+            # the dropped mesh loads quickly in between frames, but the frame was still dropped
+            tuner.recordLoad(0.01, 1000)
+        else:
+            tuner.recordAccess(True, 0.0, 1 / 24, 0)
+    assert tuner.stallRate() == 0.5
+    assert tuner.meanMeshBytes == 1000
+    assert tuner.adjust(0.05, None, 4, 0.5, 100) == 6
+
+
+def test_cache_stays_under_the_memory_ceiling():
+    tuner = cache_tuning.CacheTuner(20)
+    playFrames(tuner, cache_tuning.ADJUST_INTERVAL, True, meshBytes=1000)
+    # half of (10 kB free + the 20 kB it already holds) is 15 meshes
+    assert tuner.adjust(0.05, 10000, 20, 0.5, 100) == 15
+    # and never below the minimum, even with no memory to spare
+    playFrames(tuner, cache_tuning.ADJUST_INTERVAL, True, meshBytes=1000)
+    assert tuner.adjust(0.05, 0, 0, 0.5, 100) == cache_tuning.MIN_CACHE_SIZE
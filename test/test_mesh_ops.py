@@ -0,0 +1,72 @@
+import array
+
+import mesh_ops
+import mesh_readers
+
+
+def gridMeshData(rows, cols):
+    meshData = mesh_readers.MeshData('grid')
+    for r in range(rows):
+        for c in range(cols):
+            meshData.positions.extend((c / (cols - 1), r / (rows - 1), 0.0))
+    for r in range(rows - 1):
+        for c in range(cols - 1):
+            v = r * cols + c
+            meshData.faceSizes.append(4)
+            meshData.faceVertices.extend((v, v + 1, v + cols + 1, v + cols))
+    return meshData
+
+
+def test_clustering_reduces_a_grid():
+    meshData = gridMeshData(33, 33)
+    proxy = mesh_ops.clusterMeshData(meshData, 4)
+
+    assert 0 < proxy.numVertices < meshData.numVertices
+    assert 0 < proxy.numFaces < meshData.numFaces
+    assert sum(proxy.faceSizes) == proxy.numLoops
+    assert all(0 <= v < proxy.numVertices for v in proxy.faceVertices)
+
+    # every remaining face has distinct vertices
+    loopStart = 0
+    for faceSize in proxy.faceSizes:
+        face = proxy.faceVertices[loopStart:loopStart + faceSize]
+        assert faceSize >= 3 and len(set(face)) == faceSize
+        loopStart += faceSize
+
+
+def test_clustering_a_flat_point_keeps_the_mesh():
+    meshData = mesh_readers.MeshData('point')
+    meshData.positions = array.array('f', [1.0, 2.0, 3.0])
+    proxy = mesh_ops.clusterMeshData(meshData, 16)
+    assert list(proxy.positions) == [1.0, 2.0, 3.0]
+
+
+def test_welding_merges_close_vertices_and_drops_collapsed_faces(monkeypatch):
+    meshData = mesh_readers.MeshData('weld')
+    # two triangles sharing an edge, with the shared corners duplicated (one of them slightly off),
+    #   plus a sliver whose corners all land on the same vertex
+    meshData.positions = array.array('f', [0, 0, 0, 1, 0, 0, 0, 1, 0,
+                                           1, 0, 0, 1, 1, 0, 0, 1.00001, 0,
+                                           5, 5, 5, 5.00001, 5, 5, 5, 5.00001, 5])
+    meshData.faceSizes = array.array('i', [3, 3, 3])
+    meshData.faceVertices = array.array('i', [0, 1, 2, 3, 4, 5, 6, 7, 8])
+
+    for numpyModule in (mesh_ops.numpy, None):
+        monkeypatch.setattr(mesh_ops, 'numpy', numpyModule)
+        welded = mesh_ops.weldVertices(meshData, 0.001)
+        assert welded.numVertices == 5
+        assert list(welded.faceSizes) == [3, 3]
+        assert list(welded.faceVertices) == [0, 1, 2, 1, 3, 2]
+
+
+def test_transforming_positions_matches_the_matrix(monkeypatch):
+    meshData = gridMeshData(3, 3)
+    # -Z forward / Y up to Blender's axes (y -> z, z -> -y), scaled by 2 and moved up by 1
+    matrix = ((2, 0, 0, 0), (0, 0, -2, 0), (0, 2, 0, 1), (0, 0, 0, 1))
+
+    for numpyModule in (mesh_ops.numpy, None):
+        monkeypatch.setattr(mesh_ops, 'numpy', numpyModule)
+        transformed = mesh_ops.transformPositions(meshData, matrix)
+        assert transformed.numVertices == meshData.numVertices
+        assert list(transformed.positions[-3:]) == [2.0, 0.0, 3.0]
+        assert transformed.faceVertices == meshData.faceVertices
@@ -0,0 +1,97 @@
+import io
+import struct
+
+import pytest
+
+import mesh_readers
+
+
+def test_obj_faces_with_negative_indices():
+    objText = b"v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1/1 2/2 3/3 4/4\nf -4 -3 -2\n"
+    meshData = mesh_readers.readOBJ(io.BytesIO(objText))
+    assert meshData.numVertices == 4
+    assert list(meshData.faceSizes) == [4, 3]
+    assert list(meshData.faceVertices) == [0, 1, 2, 3, 0, 1, 2]
+    assert list(meshData.loopStarts()) == [0, 4]
+
+
+def test_binary_stl_welds_shared_corners():
+    triangles = [(0, 0, 0, 1, 0, 0, 0, 1, 0), (1, 0, 0, 1, 1, 0, 0, 1, 0)]
+    data = b'\0' * 80 + struct.pack('<I', len(triangles))
+    for corners in triangles:
+        data += struct.pack('<12fH', 0, 0, 1, *corners, 0)
+
+    meshData = mesh_readers.readSTL(io.BytesIO(data))
+    assert meshData.numVertices == 4
+    assert meshData.numFaces == 2
+    assert list(meshData.faceVertices) == [0, 1, 2, 1, 3, 2]
+
+
+def test_ascii_ply():
+    plyText = (b"ply\nformat ascii 1.0\nelement vertex 3\nproperty float x\nproperty float y\nproperty float z\n"
+               b"element face 1\nproperty list uchar int vertex_indices\nend_header\n"
+               b"0 0 0\n1 0 0\n0 1 0\n3 0 1 2\n")
+    meshData = mesh_readers.readPLY(io.BytesIO(plyText))
+    assert list(meshData.positions) == [0, 0, 0, 1, 0, 0, 0, 1, 0]
+    assert list(meshData.faceVertices) == [0, 1, 2]
+
+
+def test_frame_cache_round_trip(tmp_path):
+    sourcePath = tmp_path / "frame_001.obj"
+    sourcePath.write_bytes(b"v 0 0 0\nv 2 0 0\nv 0 3 -1\nf 1 2 3\n")
+    meshData = mesh_readers.readMeshFile(str(sourcePath), 'obj')
+
+    cachePath = mesh_readers.frameCachePath(str(sourcePath))
+    mesh_readers.writeFrameCache(cachePath, meshData)
+    assert mesh_readers.isFrameCacheFresh(str(sourcePath), cachePath)
+
+    cached = mesh_readers.readFrameCache(cachePath)
+    assert list(cached.positions) == list(meshData.positions)
+    assert list(cached.faceSizes) == [3]
+    assert list(cached.faceVertices) == [0, 1, 2]
+
+    with open(cachePath, 'rb') as f:
+        header = mesh_readers.readFrameCacheHeader(f.read())
+    assert header['bboxMin'] == (0.0, 0.0, -1.0)
+    assert header['bboxMax'] == (2.0, 3.0, 0.0)
+    assert mesh_readers.readFrameCacheBounds(cachePath) == ((0.0, 0.0, -1.0), (2.0, 3.0, 0.0))
+
+
+def test_mtl_digests_ignore_material_names(tmp_path):
+    (tmp_path / "a.mtl").write_text("newmtl skin\nKd 0.8 0.6 0.5\nmap_Kd tex/skin.png\n\nnewmtl eyes\nKd 1 1 1\n")
+    (tmp_path / "b.mtl").write_text("# another frame\nnewmtl skin_copy\nKd  0.8 0.6 0.5\nmap_Kd tex/skin.png\n")
+    (tmp_path / "frame_001.obj").write_text("mtllib a.mtl\no body\nv 0 0 0\n")
+
+    mtlPaths = mesh_readers.readOBJMaterialLibraries(str(tmp_path / "frame_001.obj"))
+    assert mtlPaths == [str(tmp_path / "a.mtl")]
+
+    digestsA = mesh_readers.readMTLDigests(str(tmp_path / "a.mtl"))
+    digestsB = mesh_readers.readMTLDigests(str(tmp_path / "b.mtl"))
+    assert digestsA['skin'] == digestsB['skin_copy']
+    assert digestsA['skin'] != digestsA['eyes']
+
+
+def test_ply_point_cloud_attributes():
+    header = (b"ply\nformat binary_little_endian 1.0\nelement vertex 2\nproperty float x\nproperty float y\nproperty float z\n"
+              b"property uchar red\nproperty uchar green\nproperty uchar blue\nproperty float radius\n"
+              b"element face 0\nproperty list uchar int vertex_indices\nend_header\n")
+    data = header + struct.pack('<3f3Bf', 1, 2, 3, 255, 0, 51, 0.5) + struct.pack('<3f3Bf', 4, 5, 6, 0, 255, 0, 0.25)
+    meshData = mesh_readers.readPLYPoints(io.BytesIO(data))
+    assert list(meshData.positions) == [1, 2, 3, 4, 5, 6]
+    assert meshData.numFaces == 0
+
+    colorType, colors = meshData.pointAttributes['color']
+    assert colorType == 'FLOAT_COLOR'
+    assert [round(value, 3) for value in colors] == [1.0, 0.0, 0.2, 1.0, 0.0, 1.0, 0.0, 1.0]
+    assert list(meshData.pointAttributes['radius'][1]) == [0.5, 0.25]
+    assert 'velocity' not in meshData.pointAttributes
+
+
+def test_invalid_faces_are_rejected(tmp_path, monkeypatch):
+    for objText in (b"v 0 0 0\nv 1 0 0\nv 1 1 0\nf 1 2 4\n", b"v 0 0 0\nv 1 0 0\nv 1 1 0\nf 0 1 2\n", b"v 0 0 0\nv 1 0 0\nf 1 2\n"):
+        path = tmp_path / 'frame.obj'
+        path.write_bytes(objText)
+        for numpyModule in (mesh_readers.numpy, None):
+            monkeypatch.setattr(mesh_readers, 'numpy', numpyModule)
+            with pytest.raises(ValueError):
+                mesh_readers.readMeshFile(str(path), 'obj')
@@ -0,0 +1,26 @@
+import read_ahead
+
+
+def test_listing_follows_added_files(tmp_path):
+    (tmp_path / "frame_1.obj").write_bytes(b"v 0 0 0\n")
+    assert read_ahead.listDirectory(str(tmp_path)) == ["frame_1.obj"]
+    assert read_ahead.listDirectory(str(tmp_path / "missing")) == []
+
+    # adding a file changes the folder's mtime, but keep the test independent of the file system's mtime resolution
+    read_ahead.forgetDirectory(str(tmp_path))
+    (tmp_path / "frame_2.obj").write_bytes(b"v 0 0 0\n")
+    assert sorted(read_ahead.listDirectory(str(tmp_path))) == ["frame_1.obj", "frame_2.obj"]
+    read_ahead.forgetDirectory(str(tmp_path))
+
+
+def test_read_ahead_reports_throughput(tmp_path):
+    filePath = tmp_path / "frame_1.obj"
+    filePath.write_bytes(b"x" * 100000)
+    read_ahead.clearReadAheadStats()
+
+    read_ahead.readAheadFiles([str(filePath), str(filePath)])
+    read_ahead.readAheadQueue.join()
+
+    megabytesPerSecond, numFiles = read_ahead.readAheadThroughput()
+    assert numFiles == 1
+    assert megabytesPerSecond > 0.0
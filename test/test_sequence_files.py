@@ -0,0 +1,88 @@
+import sequence_files
+
+
+def test_sequence_files_sort_numerically(tmp_path):
+    for name in ["shot_10.obj", "shot_9.obj", "shot_100.obj", "other_1.obj", "shot_1.mtl"]:
+        (tmp_path / name).write_bytes(b"")
+
+    files = sequence_files.listSequenceFiles(str(tmp_path), "shot_", "obj")
+    assert [f.rsplit('/', 1)[-1] for f in files] == ["shot_9.obj", "shot_10.obj", "shot_100.obj"]
+
+
+def test_identical_files_have_the_same_digest(tmp_path):
+    (tmp_path / "a.obj").write_bytes(b"v 0 0 0\n")
+    (tmp_path / "b.obj").write_bytes(b"v 0 0 0\n")
+    (tmp_path / "c.obj").write_bytes(b"v 0 0 1\n")
+
+    digest = sequence_files.fileDigest(str(tmp_path / "a.obj"), chunkSize=3)
+    assert digest == sequence_files.fileDigest(str(tmp_path / "b.obj"))
+    assert digest != sequence_files.fileDigest(str(tmp_path / "c.obj"))
+
+
+def test_frames_inside_a_zip_and_compressed(tmp_path):
+    import gzip
+    import zipfile
+
+    import mesh_readers
+
+    objText = b"v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\n"
+    archivePath = tmp_path / "shot.zip"
+    with zipfile.ZipFile(str(archivePath), 'w') as archive:
+        archive.writestr("frame_2.obj", objText)
+        archive.writestr("frame_10.obj.gz", gzip.compress(objText))
+        archive.writestr("frame_1.mtl", b"")
+
+    files = sequence_files.listSequenceFiles(str(archivePath), "frame_", "obj")
+    assert [f.rsplit('/', 1)[-1] for f in files] == ["frame_2.obj", "frame_10.obj.gz"]
+    assert all(sequence_files.needsNativeReader(f) for f in files)
+
+    meshData = mesh_readers.readMeshFile(files[1], 'obj')
+    assert meshData.name == "frame_10"
+    assert list(meshData.faceVertices) == [0, 1, 2]
+    sequence_files.closeArchives()
+
+
+def test_file_stamp_changes_when_a_file_is_rewritten(tmp_path):
+    import os
+
+    framePath = tmp_path / "frame_1.obj"
+    framePath.write_bytes(b"v 0 0 0\n")
+    stamp = sequence_files.fileStamp(str(framePath))
+    assert stamp == sequence_files.fileStamp(str(framePath))
+
+    framePath.write_bytes(b"v 0 0 0\nv 1 0 0\n")
+    os.utime(str(framePath), ns=(0, 0))
+    assert sequence_files.fileStamp(str(framePath)) != stamp
+    assert sequence_files.fileStamp(str(framePath)) == "16:0"
+
+
+def test_only_files_of_matching_size_are_hashed(tmp_path, monkeypatch):
+    for name, contents in (("a.obj", b"v 0 0 0\n"), ("b.obj", b"v 0 0 0\n"), ("c.obj", b"v 1 1 1\n"), ("d.obj", b"v 0 0\n")):
+        (tmp_path / name).write_bytes(contents)
+    paths = [str(tmp_path / name) for name in ("a.obj", "b.obj", "c.obj", "d.obj")]
+
+    hashedPaths = []
+    fileDigest = sequence_files.fileDigest
+    monkeypatch.setattr(sequence_files, 'fileDigest', lambda path: hashedPaths.append(path) or fileDigest(path))
+    digests = sequence_files.duplicateCandidateDigests(paths)
+
+    assert sorted(hashedPaths) == paths[:3]
+    assert digests[paths[0]] == digests[paths[1]]
+    assert digests[paths[0]] != digests[paths[2]]
+
+
+def test_new_files_are_hashed_against_loaded_ones(tmp_path, monkeypatch):
+    for name, contents in (("a.obj", b"v 0 0 0\n"), ("b.obj", b"v 1 1\n"), ("c.obj", b"v 0 0 0\n"), ("d.obj", b"v 2 2\n")):
+        (tmp_path / name).write_bytes(contents)
+    paths = [str(tmp_path / name) for name in ("a.obj", "b.obj", "c.obj", "d.obj")]
+
+    hashedPaths = []
+    fileDigest = sequence_files.fileDigest
+    monkeypatch.setattr(sequence_files, 'fileDigest', lambda path: hashedPaths.append(path) or fileDigest(path))
+    # a.obj and b.obj were loaded before, and only b.obj was hashed then
+    digests = sequence_files.duplicateCandidateDigests(paths, paths[2:], {paths[1]: 'known'})
+
+    # a.obj matches the new c.obj's size, so it's hashed now; b.obj's size only matches d.obj, and its digest is known
+    assert sorted(hashedPaths) == [paths[0], paths[2], paths[3]]
+    assert digests[paths[0]] == digests[paths[2]]
+    assert digests[paths[1]] == 'known'
@@ -0,0 +1,46 @@
+import array
+import os
+
+import mesh_readers
+import shared_cache
+
+
+def triangleMeshData():
+    meshData = mesh_readers.MeshData('triangle')
+    meshData.positions = array.array('f', [0, 0, 0, 1, 0, 0, 0, 1, 0])
+    meshData.faceSizes = array.array('i', [3])
+    meshData.faceVertices = array.array('i', [0, 1, 2])
+    return meshData
+
+
+def test_only_the_first_lookup_decodes(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_cache, 'sharedCacheDir', lambda: str(tmp_path))
+    path = shared_cache.entryPath('/shots/a/frame_001.obj', '100:5', 'obj')
+    assert path != shared_cache.entryPath('/shots/a/frame_001.obj', '100:6', 'obj')
+
+    numDecodes = []
+
+    def decode():
+        numDecodes.append(1)
+        return triangleMeshData()
+
+    first = shared_cache.getOrDecode(path, decode)
+    second = shared_cache.getOrDecode(path, decode)
+    assert len(numDecodes) == 1
+    assert list(second.positions) == list(first.positions)
+    assert list(second.faceVertices) == [0, 1, 2]
+    assert list(second.loopStarts()) == [0]
+
+
+def test_trimming_removes_the_oldest_entries(tmp_path):
+    for i in range(3):
+        path = str(tmp_path / ('entry%d' % i + mesh_readers.FRAME_CACHE_EXTENSION))
+        mesh_readers.writeFrameCache(path, triangleMeshData())
+        os.utime(path, (i, i))
+
+    numEntries, totalBytes = shared_cache.sharedCacheUsage(str(tmp_path))
+    assert numEntries == 3
+
+    assert shared_cache.trimSharedCache(totalBytes * 2 // 3, str(tmp_path)) == 1
+    assert shared_cache.lastUsage[0] == 2
+    assert not (tmp_path / ('entry0' + mesh_readers.FRAME_CACHE_EXTENSION)).exists()